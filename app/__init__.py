@@ -7,6 +7,8 @@ Blueprint 등록, 확장 초기화
 from flask import Flask, render_template
 from flask_cors import CORS
 from app.config import get_config
+from app.serialization import FastJSONProvider
+from app.services.rules import get_rules, rule_versions
 
 
 def create_app():
@@ -17,6 +19,12 @@ def create_app():
     config = get_config()
     app.config.from_object(config)
 
+    # JSON 직렬화 (orjson 사용 가능 시 orjson, jsonify/get_json 공통)
+    app.json = FastJSONProvider(app)
+
+    # 서비스 rule_version 확인 (정의되지 않은 버전이면 시작 시 ValueError)
+    get_rules(app.config['RULE_VERSION'])
+
     # CORS 설정 (개발 환경)
     CORS(app)
 
@@ -34,13 +42,26 @@ def create_app():
     def index():
         return {
             'service': 'Medical AI Risk Factor Profiling API',
-            'version': 'guideline-v1',
+            'version': app.config['RULE_VERSION'],
+            'rule_versions': rule_versions(),
             'status': 'healthy'
         }
 
+    # /stats/whatif 인구 snapshot background 적재 (worker 프로세스별 메모리, 첫 요청 대기 방지)
+    if app.config['WHATIF_SNAPSHOT_PRELOAD']:
+        from app.services.population import refresh_snapshot
+        refresh_snapshot()
+
     @app.route('/health')
     def health():
-        return {'status': 'ok'}
+        from app.cache import redis_health
+
+        # Redis 장애는 degraded (DB로 응답 가능) → status는 ok 유지
+        redis_status = redis_health()
+        return {
+            'status': 'ok',
+            'redis': redis_status['breaker']['state'] if redis_status['enabled'] else 'disabled'
+        }
 
     @app.route('/demo')
     def demo():
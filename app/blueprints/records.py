@@ -4,7 +4,7 @@ Records Blueprint
 검진 데이터 조회 API
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.middleware.auth import require_api_key
 from app.database import SessionLocal
 from app.models.health_check import RawHealthCheck, CleanRiskResult
@@ -41,8 +41,10 @@ def get_records():
     db = SessionLocal()
 
     try:
-        # 쿼리 빌드 (모든 레코드가 유효함)
-        query = db.query(CleanRiskResult).join(RawHealthCheck)
+        # 쿼리 빌드 (모든 레코드가 유효함, 서비스 rule_version 결과만)
+        query = db.query(CleanRiskResult).join(RawHealthCheck).filter(
+            CleanRiskResult.rule_version == current_app.config['RULE_VERSION']
+        )
 
         # 필터 적용
         if age_group:
@@ -67,7 +69,7 @@ def get_records():
                 'id': clean.id,
                 'age_group': raw.age_group_code,
                 'gender': raw.gender_code,
-                'bmi': float(clean.bmi) if clean.bmi else None,
+                'bmi': clean.bmi,  # Decimal (직렬화 시 float)
                 'risk_factor_count': clean.risk_factor_count,
                 'risk_group': clean.risk_group,
                 'flags': {
@@ -79,7 +81,7 @@ def get_records():
                     'obesity': clean.flag_obesity,
                     'smoking': clean.flag_smoking
                 },
-                'created_at': clean.created_at.isoformat()
+                'created_at': clean.created_at  # datetime (직렬화 시 ISO 8601)
             })
 
         return jsonify({
@@ -133,7 +135,7 @@ def get_record(record_id):
             'gender_display': '남성' if raw.gender_code == 1 else '여성',
             'height': raw.height,
             'weight': raw.weight,
-            'bmi': float(clean.bmi) if clean.bmi else None,
+            'bmi': clean.bmi,  # Decimal (직렬화 시 float)
             'systolic_bp': raw.systolic_bp,
             'diastolic_bp': raw.diastolic_bp,
             'fasting_glucose': raw.fasting_glucose,
@@ -154,7 +156,7 @@ def get_record(record_id):
             },
             'rule_version': clean.rule_version,
             'inference_time_ms': clean.inference_time_ms,
-            'created_at': clean.created_at.isoformat()
+            'created_at': clean.created_at  # datetime (직렬화 시 ISO 8601)
         })
 
     finally:
@@ -2,98 +2,233 @@
 Simulate Blueprint
 
 위험요인 계산 API (Inference)
+- POST /simulate: 단일 환자
+- POST /simulate/batch: 여러 환자 일괄 계산 (numpy 배열 연산)
+- POST /simulate/stream: NDJSON 스트리밍 일괄 계산 (micro-batch 단위)
+- GET /simulate/memo: 단일 계산 memo 사용 현황 (hit/miss)
 """
 
 import time
-from flask import Blueprint, request, jsonify
+import numpy as np
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from app.middleware.auth import require_api_key
+from app.serialization import dumps, loads
+from app.services.memo import LRUMemo
+from app.services.rules import DEFAULT_RULE_VERSION, get_rules, rule_versions
+from app.services.validation import SMOKING_CODES, get_validator
 
 simulate_bp = Blueprint('simulate', __name__)
 
+# 기본 판정 규칙 (요청별 버전은 ?rule_version=, 서비스 기본값은 config RULE_VERSION)
+RULE_VERSION = DEFAULT_RULE_VERSION
+RULES = get_rules(RULE_VERSION)
 
-def calculate_bmi(height, weight):
+# 입력 검증기 (기본 버전은 import 시 compile, 다른 버전은 첫 사용 시)
+VALIDATOR = get_validator(RULES)
+
+DISCLAIMER = 'This is NOT a diagnostic tool. Consult medical professionals for any health concerns.'
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# NDJSON 한 줄 최대 크기 (초과 줄은 버리고 오류 항목으로 응답)
+MAX_NDJSON_LINE_BYTES = 64 * 1024
+
+
+def calculate_bmi(height, weight, rules=RULES):
     """BMI 계산"""
-    if not height or not weight or height < 140 or height > 200 or weight < 30 or weight > 150:
-        return None
-    height_m = height / 100.0
-    return round(weight / (height_m ** 2), 1)
+    return rules.calculate_bmi(height, weight)
 
 
-def calculate_risk_factors(data):
+def to_rule_values(data):
+    """입력 dict → 판정 규칙 입력 (smoking_status 문자열 → 코드)"""
+    return {**data, 'smoking_status': SMOKING_CODES.get(data['smoking_status'], 1)}
+
+
+def calculate_risk_factors(data, rules=RULES):
     """
-    위험요인 계산 (ETL 로직과 동일)
+    위험요인 계산 (ETL과 같은 규칙: app/services/rules.py)
 
     Args:
         data: 입력 데이터 dict
+        rules: 판정 규칙 (get_rules(rule_version))
 
     Returns:
         dict: flags, count, group, explanations
     """
-    flags = {}
-    explanations = []
+    result = rules.evaluate(to_rule_values(data))
+
+    return {
+        'flags': result['flags'],
+        'count': result['count'],
+        'group': result['group'],
+        'explanations': rules.explain(data, result['flags'], result['bmi']),
+        'bmi': result['bmi']
+    }
+
+
+def memo_key(data, rules=RULES):
+    """
+    판정 memo 키: (rule_version, 판정 입력 값, 값 타입)
 
-    # BMI 계산
-    bmi = calculate_bmi(data['height'], data['weight'])
+    - age_group/gender는 판정에 쓰이지 않으므로 제외 (다른 연령/성별 요청도 같은 키)
+    - 설명 문구에 입력 값이 그대로 표시되므로 152와 152.0은 다른 키
+    """
+    values = tuple(data[column] for column in rules.input_columns)
+    return rules.version, values, tuple(map(type, values))
 
-    # 1. 고혈압
-    flags['hypertension'] = data['systolic_bp'] >= 140 or data['diastolic_bp'] >= 90
-    if flags['hypertension']:
-        explanations.append(
-            f"Hypertension: SBP≥140 or DBP≥90 ({data['systolic_bp']}/{data['diastolic_bp']})"
+
+def get_score_memo():
+    """
+    app별 판정 memo (SIMULATE_MEMO_SIZE = 0이면 비활성화)
+
+    Returns:
+        LRUMemo
+    """
+    memo = current_app.extensions.get('simulate_memo')
+    if memo is None:
+        memo = LRUMemo(
+            current_app.config['SIMULATE_MEMO_SIZE'],
+            current_app.config['SIMULATE_MEMO_TTL']
         )
+        current_app.extensions['simulate_memo'] = memo
+    return memo
+
+
+def calculate_risk_factors_memo(data, memo, rules=RULES):
+    """
+    위험요인 계산 (같은 입력이면 memo 결과 재사용 → 판정/설명 문구 생성 생략)
+
+    Args:
+        data: 검증된 입력 dict
+        memo: LRUMemo (반환 결과는 memo와 공유되므로 수정 금지)
+        rules: 판정 규칙 (get_rules(rule_version))
+
+    Returns:
+        tuple: (calculate_risk_factors() 결과, memo hit 여부)
+    """
+    if not memo.enabled:
+        return calculate_risk_factors(data, rules), False
 
-    # 2. 당뇨
-    flags['diabetes'] = data['fasting_glucose'] >= 126
-    if flags['diabetes']:
-        explanations.append(f"Diabetes: fasting glucose≥126 ({data['fasting_glucose']})")
-
-    # 3. 고콜레스테롤
-    flags['high_total_cholesterol'] = data['total_cholesterol'] >= 240
-    if flags['high_total_cholesterol']:
-        explanations.append(f"High TC: total cholesterol≥240 ({data['total_cholesterol']})")
-
-    # 4. 고중성지방
-    flags['high_triglycerides'] = data['triglycerides'] >= 200
-    if flags['high_triglycerides']:
-        explanations.append(f"High TG: triglycerides≥200 ({data['triglycerides']})")
-
-    # 5. 저HDL
-    flags['low_hdl'] = data['hdl_cholesterol'] < 40
-    if flags['low_hdl']:
-        explanations.append(f"Low HDL: hdl<40 ({data['hdl_cholesterol']})")
-
-    # 6. 비만
-    flags['obesity_asia'] = bmi >= 25 if bmi else False
-    if flags['obesity_asia']:
-        explanations.append(f"Obesity(Asia): BMI≥25 ({bmi})")
-
-    # 7. 흡연
-    smoking_map = {'never': 1, 'former': 2, 'current': 3}
-    smoking_code = smoking_map.get(data['smoking_status'], 1)
-    flags['smoking'] = smoking_code == 3
-    if flags['smoking']:
-        explanations.append("Smoking: current smoker")
-
-    # 위험요인 개수
-    count = sum(flags.values())
-
-    # Risk Group
-    if flags['diabetes']:
-        group = 'CHD_RISK_EQUIVALENT'
-    elif count >= 2:
-        group = 'MULTIPLE_RISK_FACTORS'
+    key = memo_key(data, rules)
+    result = memo.get(key)
+    if result is not None:
+        return result, True
+
+    result = calculate_risk_factors(data, rules)
+    memo.set(key, result)
+    return result, False
+
+
+def calculate_risk_factors_batch(items, rules=RULES, columns=None):
+    """
+    위험요인 일괄 계산 (calculate_risk_factors와 동일 결과)
+
+    Args:
+        items: 검증된 입력 dict 리스트
+        rules: 판정 규칙 (get_rules(rule_version))
+        columns: 검증 시 만든 {필드: float64 배열} (InputValidator.validate_many, None이면 items로 생성)
+
+    Returns:
+        list[dict]: calculate_risk_factors() 결과와 같은 구조
+    """
+    if not items:
+        return []
+
+    if columns is None:
+        rows = [to_rule_values(item) for item in items]
+        columns = {
+            column: np.array([row[column] for row in rows], dtype=np.float64)
+            for column in rules.input_columns
+        }
+    scored = rules.evaluate_batch(columns)
+
+    # 배열 → Python 값 (item 단위 결과 조립)
+    bmis = [None if np.isnan(b) else b for b in scored['bmi'].tolist()]
+    flag_lists = {name: values.tolist() for name, values in scored['flags'].items()}
+    counts = scored['count'].tolist()
+    groups = scored['group'].tolist()
+
+    results = []
+    for i, item in enumerate(items):
+        flags = {name: values[i] for name, values in flag_lists.items()}
+        results.append({
+            'flags': flags,
+            'count': counts[i],
+            'group': groups[i],
+            'explanations': rules.explain(item, flags, bmis[i]),
+            'bmi': bmis[i]
+        })
+
+    return results
+
+
+def validate_input(data, rules=RULES):
+    """
+    /simulate 입력 검증 + 타입 변환 (app/services/validation.py)
+
+    Args:
+        data: 요청 JSON
+        rules: 판정 규칙 (검증 범위 공유)
+
+    Returns:
+        tuple: (변환된 입력 dict, None) 또는 (None, {'message', 'details', 'errors'})
+    """
+    return get_validator(rules).validate(data)
+
+
+def validation_error(invalid):
+    """검증 오류 → 응답 본문"""
+    return {'error': 'Validation Error', **invalid}
+
+
+def format_input(data, bmi):
+    """응답 input 섹션 (age/gender 표시값 포함)"""
+    # Age display 포맷팅 (age_group 5-18: 25-29세 ~ 90세 초과)
+    if data['age_group'] == 18:
+        age_display = '90세 초과'
     else:
-        group = 'ZERO_TO_ONE_RISK_FACTOR'
+        age_start = data['age_group'] * 5
+        age_display = f'{age_start}-{age_start + 4}세'
 
     return {
-        'flags': flags,
-        'count': count,
-        'group': group,
-        'explanations': explanations,
+        'age_group': data['age_group'],
+        'age_display': age_display,
+        'gender': data['gender'],
+        'gender_display': '남성' if data['gender'] == 1 else '여성',
         'bmi': bmi
     }
 
 
+def format_result(result, inference_time_ms, rule_version=RULE_VERSION):
+    """응답 result 섹션"""
+    return {
+        'risk_factor_count': result['count'],
+        'risk_group': result['group'],
+        'flags': result['flags'],
+        'explanations': result['explanations'],
+        'rule_version': rule_version,
+        'inference_time_ms': inference_time_ms
+    }
+
+
+def resolve_rules():
+    """
+    요청의 판정 규칙 (?rule_version=, 없으면 서비스 버전 RULE_VERSION)
+
+    Returns:
+        tuple: (CompiledRules, None) 또는 (None, 400 에러 응답)
+    """
+    rule_version = request.args.get('rule_version') or current_app.config['RULE_VERSION']
+    try:
+        return get_rules(rule_version), None
+    except ValueError:
+        return None, (jsonify({
+            'error': 'Validation Error',
+            'message': f'Unknown rule_version: {rule_version}',
+            'details': {'available': rule_versions()}
+        }), 400)
+
+
 @simulate_bp.route('/simulate', methods=['POST'])
 @require_api_key
 def simulate():
@@ -116,88 +251,269 @@ def simulate():
             "hdl_cholesterol": 38,
             "smoking_status": "current"
         }
+
+    Query Parameters:
+        - rule_version: 판정 규칙 버전 (default: RULE_VERSION 설정값)
     """
     start_time = time.time()
 
+    rules, error = resolve_rules()
+    if error:
+        return error
+
     # 요청 데이터
     data = request.get_json()
 
-    # 검증
-    required_fields = [
-        'age_group', 'gender', 'height', 'weight',
-        'systolic_bp', 'diastolic_bp', 'fasting_glucose',
-        'total_cholesterol', 'triglycerides', 'hdl_cholesterol',
-        'smoking_status'
-    ]
+    # 검증 (숫자 문자열 등은 변환된 값으로 계산)
+    data, invalid = validate_input(data, rules)
+    if invalid:
+        return jsonify(validation_error(invalid)), 400
 
-    missing_fields = [f for f in required_fields if f not in data]
-    if missing_fields:
-        return jsonify({
-            'error': 'Validation Error',
-            'message': 'Missing required fields',
-            'details': {'missing': missing_fields}
-        }), 400
+    # 위험요인 계산 (반복 입력은 memo)
+    memo = get_score_memo()
+    result, memo_hit = calculate_risk_factors_memo(data, memo, rules)
 
-    # 범위 검증
-    # age_group 5-18: 국민건강보험공단 CSV 데이터에서 실제 존재하는 범위
-    # - 5 = 25-29세, 6 = 30-34세, ..., 18 = 90세 초과
-    validations = {
-        'age_group': (5, 18),
-        'gender': (1, 2),
-        'height': (140, 200),
-        'weight': (30, 150),
-        'systolic_bp': (70, 250),
-        'diastolic_bp': (40, 150),
-        'fasting_glucose': (50, 400),
-        'total_cholesterol': (100, 400),
-        'triglycerides': (30, 500),
-        'hdl_cholesterol': (20, 100),
-    }
+    # Inference 시간
+    inference_time_ms = int((time.time() - start_time) * 1000)
+
+    # 응답
+    response = jsonify({
+        'input': format_input(data, result['bmi']),
+        'result': format_result(result, inference_time_ms, rules.version),
+        'disclaimer': DISCLAIMER
+    })
+    if memo.enabled:
+        response.headers['X-Memo'] = 'HIT' if memo_hit else 'MISS'
+    return response
 
-    errors = {}
-    for field, (min_val, max_val) in validations.items():
-        if field in data and not (min_val <= data[field] <= max_val):
-            errors[field] = f"Must be between {min_val} and {max_val}"
 
-    if data['smoking_status'] not in ['never', 'former', 'current']:
-        errors['smoking_status'] = "Must be 'never', 'former', or 'current'"
+@simulate_bp.route('/simulate/memo', methods=['GET'])
+@require_api_key
+def simulate_memo():
+    """
+    GET /simulate/memo
+
+    POST /simulate 판정 memo 사용 현황
+    """
+    return jsonify(get_score_memo().stats())
 
-    if errors:
+
+def score_payloads(items, first_index=0, start_time=None, rules=RULES):
+    """
+    요청 항목 리스트 검증 + 일괄 계산 (/simulate/batch, /simulate/stream 공용)
+
+    Args:
+        items: /simulate 요청 형식 객체 리스트 (JSON 파싱 실패 항목은 ValueError)
+        first_index: 첫 항목의 요청 내 순번
+        start_time: 시간 측정 시작 (perf_counter, None이면 지금)
+        rules: 판정 규칙 (get_rules(rule_version))
+
+    Returns:
+        tuple: (항목별 결과 리스트, 성공 수, 소요 시간 ms)
+    """
+    if start_time is None:
+        start_time = time.perf_counter()
+
+    results = [None] * len(items)
+
+    # JSON 파싱 실패 항목 (/simulate/stream)
+    parsed_positions = []
+    for position, item in enumerate(items):
+        if isinstance(item, ValueError):
+            results[position] = {
+                'index': first_index + position,
+                'error': 'Validation Error',
+                'message': 'Invalid JSON',
+                'details': {'line': str(item)},
+                'errors': [{'field': None, 'code': 'json', 'message': str(item)}]
+            }
+        else:
+            parsed_positions.append(position)
+
+    # 컬럼 단위 검증 + 타입 변환
+    valid, valid_items, columns, invalid = get_validator(rules).validate_many(
+        [items[position] for position in parsed_positions]
+    )
+    for j, error in invalid.items():
+        position = parsed_positions[j]
+        results[position] = {'index': first_index + position, **validation_error(error)}
+    valid_positions = [parsed_positions[j] for j in valid]
+
+    # 유효 항목 일괄 계산 (검증 시 만든 배열 그대로 사용)
+    scored = calculate_risk_factors_batch(valid_items, rules, columns)
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    per_item_ms = round(elapsed_ms / len(items), 4) if items else 0.0
+
+    for position, item, result in zip(valid_positions, valid_items, scored):
+        results[position] = {
+            'index': first_index + position,
+            'input': format_input(item, result['bmi']),
+            'result': format_result(result, per_item_ms, rules.version)
+        }
+
+    return results, len(valid_positions), elapsed_ms
+
+
+@simulate_bp.route('/simulate/batch', methods=['POST'])
+@require_api_key
+def simulate_batch():
+    """
+    POST /simulate/batch
+
+    여러 환자 위험요인 일괄 계산
+    - 인증/JSON 파싱/dispatch는 요청당 한 번, 판정은 배열 연산 한 번
+    - 항목별 검증 오류는 해당 항목에만 표시 (나머지는 정상 계산)
+    - ?rule_version=: /simulate와 동일 (요청 전체에 적용)
+
+    Request Body:
+        [ {/simulate 요청과 같은 형식}, ... ]  (최대 SIMULATE_BATCH_MAX_ITEMS개)
+
+    Returns:
+        {
+            "results": [{"index": 0, "input": {...}, "result": {...}},
+                        {"index": 1, "error": "Validation Error", "message": ..., "details": {...}}],
+            "summary": {"total", "succeeded", "failed",
+                        "inference_time_ms", "avg_inference_time_ms"},
+            "disclaimer": ...
+        }
+    """
+    start_time = time.perf_counter()
+
+    rules, error = resolve_rules()
+    if error:
+        return error
+
+    items = request.get_json()
+
+    if not isinstance(items, list):
         return jsonify({
             'error': 'Validation Error',
-            'message': 'Invalid input data',
-            'details': errors
+            'message': 'Request body must be a JSON array of /simulate payloads'
         }), 400
 
-    # 위험요인 계산
-    result = calculate_risk_factors(data)
+    max_items = current_app.config['SIMULATE_BATCH_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({
+            'error': 'Payload Too Large',
+            'message': f'Batch contains {len(items)} items (limit {max_items})',
+            'details': {'max_items': max_items}
+        }), 413
 
-    # Inference 시간
-    inference_time_ms = int((time.time() - start_time) * 1000)
+    results, succeeded, inference_time_ms = score_payloads(items, start_time=start_time, rules=rules)
+    per_item_ms = inference_time_ms / len(items) if items else 0.0
 
-    # Age display 포맷팅 (age_group 5-18: 25-29세 ~ 90세 초과)
-    if data['age_group'] == 18:
-        age_display = '90세 초과'
-    else:
-        age_start = data['age_group'] * 5
-        age_display = f'{age_start}-{age_start + 4}세'
-
-    # 응답
     return jsonify({
-        'input': {
-            'age_group': data['age_group'],
-            'age_display': age_display,
-            'gender': data['gender'],
-            'gender_display': '남성' if data['gender'] == 1 else '여성',
-            'bmi': result['bmi']
-        },
-        'result': {
-            'risk_factor_count': result['count'],
-            'risk_group': result['group'],
-            'flags': result['flags'],
-            'explanations': result['explanations'],
-            'rule_version': 'guideline-v1',
-            'inference_time_ms': inference_time_ms
+        'results': results,
+        'summary': {
+            'total': len(items),
+            'succeeded': succeeded,
+            'failed': len(items) - succeeded,
+            'inference_time_ms': round(inference_time_ms, 3),
+            'avg_inference_time_ms': round(per_item_ms, 4)
         },
-        'disclaimer': 'This is NOT a diagnostic tool. Consult medical professionals for any health concerns.'
+        'disclaimer': DISCLAIMER
     })
+
+
+def iter_ndjson(stream, max_line_bytes=MAX_NDJSON_LINE_BYTES):
+    """
+    NDJSON 입력 → 항목 단위 반환 (한 줄씩 읽음, 빈 줄 무시)
+
+    Args:
+        stream: 요청 body 스트림 (readline 지원)
+        max_line_bytes: 한 줄 최대 크기
+
+    Yields:
+        dict/list/...: 파싱된 JSON 값 (파싱 실패/크기 초과 시 ValueError)
+    """
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # 나머지 부분은 버림 (메모리 사용량 제한)
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes)
+            yield ValueError(f'Line exceeds {max_line_bytes} bytes')
+            continue
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield loads(line)
+        except ValueError as e:
+            yield ValueError(str(e))
+
+
+@simulate_bp.route('/simulate/stream', methods=['POST'])
+@require_api_key
+def simulate_stream():
+    """
+    POST /simulate/stream
+
+    NDJSON 스트리밍 일괄 계산
+    - 요청 body를 한 줄씩 읽어 SIMULATE_STREAM_BATCH_SIZE개마다 계산 후 바로 응답
+    - 메모리 사용량은 micro-batch 크기로 고정 (전체 요청 크기와 무관)
+    - ?rule_version=: /simulate와 동일 (요청 전체에 적용)
+
+    Request Body (Content-Type: application/x-ndjson):
+        {/simulate 요청과 같은 형식}\n
+        {/simulate 요청과 같은 형식}\n
+        ...
+
+    Response (application/x-ndjson):
+        항목별 한 줄 ({"index", "input", "result"} 또는 {"index", "error", ...}),
+        마지막 줄은 {"summary": {...}, "disclaimer": ...}
+    """
+    if request.mimetype != NDJSON_MIMETYPE:
+        return jsonify({
+            'error': 'Unsupported Media Type',
+            'message': f'Content-Type must be {NDJSON_MIMETYPE}'
+        }), 415
+
+    rules, error = resolve_rules()
+    if error:
+        return error
+
+    batch_size = current_app.config['SIMULATE_STREAM_BATCH_SIZE']
+    stream = request.stream
+
+    def generate():
+        start_time = time.perf_counter()
+        total = succeeded = 0
+        inference_time_ms = 0.0
+
+        def flush(batch):
+            nonlocal total, succeeded, inference_time_ms
+            results, batch_succeeded, elapsed_ms = score_payloads(batch, first_index=total, rules=rules)
+            total += len(batch)
+            succeeded += batch_succeeded
+            inference_time_ms += elapsed_ms
+            return b''.join(dumps(item) + b'\n' for item in results)
+
+        batch = []
+        for item in iter_ndjson(stream):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield flush(batch)
+                batch = []
+        if batch:
+            yield flush(batch)
+
+        yield dumps({
+            'summary': {
+                'total': total,
+                'succeeded': succeeded,
+                'failed': total - succeeded,
+                'inference_time_ms': round(inference_time_ms, 3),
+                'avg_inference_time_ms': round(inference_time_ms / total, 4) if total else 0.0,
+                'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 3)
+            },
+            'disclaimer': DISCLAIMER
+        }) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
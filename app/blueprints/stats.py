@@ -4,19 +4,24 @@ Stats Blueprint
 통계 API (캐싱 대상)
 """
 
-from flask import Blueprint, jsonify
+import time
+from datetime import datetime, timezone
+
+from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy import func, case
 from app.middleware.auth import require_api_key
 from app.database import SessionLocal
 from app.models.health_check import RawHealthCheck, CleanRiskResult
-from app.cache import cached
+from app.cache import cache_stats, cached, redis_health
+from app.services.population import get_snapshot
+from app.services.rules import CompiledRules, derive_definition, get_rules, rule_versions
 
 stats_bp = Blueprint('stats', __name__)
 
 
 @stats_bp.route('/risk', methods=['GET'])
 @require_api_key
-@cached(ttl=60)
+@cached(ttl=60, tags=('stats',))
 def get_risk_stats():
     """
     GET /stats/risk
@@ -26,10 +31,12 @@ def get_risk_stats():
     db = SessionLocal()
 
     try:
-        # 위험군별 집계 (모든 레코드가 유효함)
+        # 위험군별 집계 (모든 레코드가 유효함, 서비스 rule_version 결과만)
         query = db.query(
             CleanRiskResult.risk_group,
             func.count(CleanRiskResult.id).label('count')
+        ).filter(
+            CleanRiskResult.rule_version == current_app.config['RULE_VERSION']
         ).group_by(
             CleanRiskResult.risk_group
         ).all()
@@ -49,6 +56,7 @@ def get_risk_stats():
             }
 
         return {
+            'rule_version': current_app.config['RULE_VERSION'],
             'risk_distribution': risk_distribution,
             'total_records': total_raw,  # Raw 테이블 원본
             'valid_records': valid_count,  # Clean 테이블 (유효한 레코드만)
@@ -61,7 +69,7 @@ def get_risk_stats():
 
 @stats_bp.route('/age', methods=['GET'])
 @require_api_key
-@cached(ttl=60)
+@cached(ttl=60, tags=('stats',))
 def get_age_stats():
     """
     GET /stats/age
@@ -71,7 +79,7 @@ def get_age_stats():
     db = SessionLocal()
 
     try:
-        # 연령대별 집계 (모든 레코드가 유효함)
+        # 연령대별 집계 (모든 레코드가 유효함, 서비스 rule_version 결과만)
         query = db.query(
             RawHealthCheck.age_group_code,
             func.count(CleanRiskResult.id).label('count'),
@@ -81,6 +89,8 @@ def get_age_stats():
             ).label('high_risk_count')
         ).join(
             CleanRiskResult, RawHealthCheck.id == CleanRiskResult.raw_id
+        ).filter(
+            CleanRiskResult.rule_version == current_app.config['RULE_VERSION']
         ).group_by(
             RawHealthCheck.age_group_code
         ).order_by(
@@ -110,9 +120,133 @@ def get_age_stats():
             })
 
         return {
+            'rule_version': current_app.config['RULE_VERSION'],
             'age_distribution': age_distribution,
             'total_records': total
         }
 
     finally:
         db.close()
+
+
+def validate_thresholds(thresholds):
+    """
+    what-if 기준값 형식 검증 ({flag 이름: {컬럼: 숫자}})
+
+    flag/컬럼 이름은 derive_definition()에서 확인
+
+    Returns:
+        dict: 필드별 에러 메시지 (없으면 빈 dict)
+    """
+    if not isinstance(thresholds, dict) or not thresholds:
+        return {'thresholds': 'Must be a non-empty object of {rule: {column: value}}'}
+
+    errors = {}
+    for name, columns in thresholds.items():
+        if not isinstance(columns, dict) or not columns:
+            errors[name] = 'Must be an object of {column: value}'
+            continue
+        for column, value in columns.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors[f'{name}.{column}'] = 'Must be a number'
+    return errors
+
+
+@stats_bp.route('/whatif', methods=['POST'])
+@require_api_key
+def get_whatif_stats():
+    """
+    POST /stats/whatif
+
+    기준값을 바꿨을 때의 전체 인구 위험군 분포 (ETL 재실행 없음)
+
+    raw_health_check 측정값 in-memory snapshot(numpy 컬럼 배열)을
+    기준값만 바꾼 규칙으로 vectorized 재판정 (1M행 기준 수십~100ms)
+
+    Request Body:
+        {
+            "thresholds": {"diabetes": {"fasting_glucose": 110}},
+            "rule_version": "guideline-v1"    (선택, 기준 버전, default: RULE_VERSION 설정값)
+        }
+    """
+    start_time = time.perf_counter()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'Invalid JSON format'
+        }), 400
+
+    rule_version = data.get('rule_version') or current_app.config['RULE_VERSION']
+    try:
+        base_rules = get_rules(rule_version)
+    except ValueError:
+        return jsonify({
+            'error': 'Validation Error',
+            'message': f'Unknown rule_version: {rule_version}',
+            'details': {'available': rule_versions()}
+        }), 400
+
+    thresholds = data.get('thresholds')
+    errors = validate_thresholds(thresholds)
+    if errors:
+        return jsonify({
+            'error': 'Validation Error',
+            'message': 'Invalid thresholds',
+            'details': errors
+        }), 400
+
+    try:
+        definition = derive_definition(rule_version, thresholds)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Validation Error',
+            'message': str(e),
+            'details': {
+                name: [column for column, _, _ in spec['any']]
+                for name, spec in base_rules.definition['flags'].items()
+            }
+        }), 400
+
+    # 요청 전용 규칙 (registry에 등록하지 않음)
+    rules = CompiledRules(f'{rule_version}+whatif', definition)
+
+    try:
+        snapshot = get_snapshot(current_app.config['WHATIF_SNAPSHOT_TTL'])
+    except RuntimeError as e:
+        return jsonify({
+            'error': 'Service Unavailable',
+            'message': str(e)
+        }), 503
+    result = snapshot.whatif(base_rules, rules)
+
+    return jsonify({
+        'rule_version': rule_version,
+        'thresholds': thresholds,
+        **result,
+        'snapshot_loaded_at': datetime.fromtimestamp(snapshot.loaded_at, timezone.utc).isoformat(),
+        'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 1)
+    })
+
+
+@stats_bp.route('/cache', methods=['GET'])
+@require_api_key
+def get_cache_stats():
+    """
+    GET /stats/cache
+
+    현재 worker의 캐시 엔드포인트별 L1(메모리) / L2(Redis) 사용 현황
+    """
+    return jsonify(cache_stats())
+
+
+@stats_bp.route('/redis', methods=['GET'])
+@require_api_key
+def get_redis_health():
+    """
+    GET /stats/redis
+
+    현재 worker의 Redis circuit breaker 상태 + connection pool 사용량
+    """
+    return jsonify(redis_health())
@@ -2,151 +2,1013 @@
 Redis 캐싱 유틸리티
 
 Stats API 응답 캐싱 (TTL 60초)
+- Redis에는 최종 응답 body(JSON bytes)와 ETag를 함께 저장 → 히트 시 그대로 응답
+- ETag(W/"body 해시") + If-None-Match → 304 (body 전송 없음)
+- 캐시 미스 시 Redis 락으로 재계산 1회 (single-flight)
+- soft TTL 이후 stale 응답 + background 재계산 (stale-while-revalidate)
+- pre-warming은 별도 프로세스 하나에서 실행 (scripts/prewarm_cache.py, worker마다 실행하지 않음)
+- worker 메모리 L1(LRU, 짧은 TTL) → Redis(L2) 순서로 조회 (tier별 hit 카운터)
+- 캐시 키 = endpoint + rule_version + data generation + 정규화된 인자/query string
+  (ETL 완료 시 generation 증가 → 이전 캐시 전체 무효화, 이전 항목은 'stats' tag로 삭제)
+- 항목별 tag set 등록 → tag 단위 무효화 (SSCAN + chunk 단위 pipeline UNLINK, KEYS 미사용)
+- Redis 장애 시 circuit breaker (연속 실패 → 일정 시간 Redis 호출 생략, DB로 바로 응답)
 """
 
+import hashlib
 import json
+import threading
+import time
+import uuid
 import redis
 from decimal import Decimal
 from functools import wraps
-from flask import current_app, jsonify
+from urllib.parse import urlencode
+from flask import current_app, request
+from werkzeug.test import EnvironBuilder
+from app.serialization import dumps
+from app.services.memo import LRUMemo
 
 
 class DecimalEncoder(json.JSONEncoder):
-    """Decimal 타입을 JSON으로 변환하는 인코더"""
+    """
+    Decimal 타입을 JSON으로 변환하는 인코더 (stdlib json.dumps용)
+
+    캐시/응답 직렬화는 app.serialization.dumps() 사용 (Decimal 기본 지원)
+    """
     def default(self, obj):
         if isinstance(obj, Decimal):
             return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
 
-# Redis 클라이언트 (전역)
+# Redis 클라이언트 (전역, 프로세스 내 thread 공유 ConnectionPool)
 _redis_client = None
 
+# Redis circuit breaker (전역, 최초 get_redis_client() 호출 시 설정값으로 생성)
+_breaker = None
+
+# data generation 카운터 (cache:* 패턴 삭제 대상이 아니도록 별도 prefix)
+GENERATION_KEY = 'meta:cache_generation'
+
+
+def connect_redis(redis_url):
+    """
+    Redis 연결 + 연결 확인 (실패 시 예외)
+
+    Returns:
+        redis.Redis
+    """
+    client = redis.from_url(
+        redis_url,
+        decode_responses=False,  # 응답은 bytes (캐시 body를 디코딩 없이 그대로 사용)
+        socket_connect_timeout=2,
+        socket_timeout=2
+    )
+    # 연결 테스트
+    client.ping()
+    return client
+
+
+def create_redis_client(redis_url, max_connections, socket_timeout):
+    """
+    ConnectionPool 기반 Redis 클라이언트 (연결은 첫 명령 실행 시 생성)
+
+    Args:
+        max_connections: pool 최대 연결 수 (gunicorn worker당, thread 수 이상)
+        socket_timeout: 연결/명령 timeout (초)
+
+    Returns:
+        redis.Redis
+    """
+    pool = redis.ConnectionPool.from_url(
+        redis_url,
+        decode_responses=False,  # 응답은 bytes (캐시 body를 디코딩/재인코딩 없이 그대로 응답)
+        max_connections=max_connections,
+        socket_connect_timeout=socket_timeout,
+        socket_timeout=socket_timeout
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+class CircuitBreaker:
+    """
+    Redis circuit breaker
+
+    - closed: 정상 (연속 실패 failure_threshold회 → open)
+    - open: Redis 호출 없이 바로 None (요청은 DB로 응답, 지연 없음)
+    - half_open: 재시도 시각이 지나면 background thread에서 PING 1회
+      (성공 → closed, 실패 → 대기 시간 2배로 다시 open, 최대 max_delay)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, base_delay=1, max_delay=60):
+        """
+        Args:
+            failure_threshold: open으로 전환할 연속 실패 횟수
+            base_delay: 첫 open 유지 시간 (초)
+            max_delay: open 유지 시간 상한 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = self.CLOSED
+        self.failures = 0  # 연속 실패 횟수
+        self.consecutive_trips = 0  # closed로 복구되기 전 open 횟수 (backoff 지수)
+        self.trips = 0
+        self.short_circuited = 0
+        self.retry_at = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def allow(self, probe=None):
+        """
+        Redis 호출 허용 여부
+
+        Args:
+            probe: half_open 전환 시 background에서 실행할 연결 확인 함수 (예: client.ping)
+
+        Returns:
+            bool
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() >= self.retry_at and probe is not None:
+                self.state = self.HALF_OPEN
+                threading.Thread(
+                    target=self._probe, args=(probe,), name='redis-probe', daemon=True
+                ).start()
+            self.short_circuited += 1
+            return False
+
+    def _probe(self, probe):
+        try:
+            probe()
+        except Exception as e:
+            self.record_failure(e)
+        else:
+            self.record_success()
+
+    def record_success(self):
+        """Redis 호출 성공 (연속 실패/backoff 초기화)"""
+        if self.state == self.CLOSED and self.failures == 0:
+            return
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.consecutive_trips = 0
+
+    def record_failure(self, error):
+        """Redis 연결/timeout 실패 (임계치 도달 또는 half_open 실패 → open)"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                delay = min(self.base_delay * 2 ** self.consecutive_trips, self.max_delay)
+                self.state = self.OPEN
+                self.retry_at = time.monotonic() + delay
+                self.consecutive_trips += 1
+                self.trips += 1
+
+    def stats(self):
+        """
+        breaker 상태
+
+        Returns:
+            dict: {'state', 'failures', 'trips', 'short_circuited', 'retry_in', 'last_error'}
+        """
+        with self._lock:
+            retry_in = max(self.retry_at - time.monotonic(), 0) if self.state == self.OPEN else 0
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'trips': self.trips,
+                'short_circuited': self.short_circuited,
+                'retry_in': round(retry_in, 1),
+                'last_error': self.last_error,
+            }
+
+
+def get_breaker():
+    """
+    Redis circuit breaker 싱글톤 반환
+
+    Returns:
+        CircuitBreaker
+    """
+    global _breaker
+
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            current_app.config['REDIS_BREAKER_THRESHOLD'],
+            current_app.config['REDIS_BREAKER_BASE_DELAY'],
+            current_app.config['REDIS_BREAKER_MAX_DELAY'],
+        )
+    return _breaker
+
+
+def record_redis_error(error):
+    """Redis 연결/timeout 오류면 breaker 실패로 기록 (그 외 예외는 무시)"""
+    if _breaker is not None and isinstance(
+        error, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+    ):
+        _breaker.record_failure(error)
+
 
 def get_redis_client():
     """
     Redis 클라이언트 싱글톤 반환
 
+    breaker가 open이면 None (Redis 연결 시도 없이 원본 함수 실행)
+
     Returns:
         redis.Redis: Redis 클라이언트 또는 None
     """
     global _redis_client
 
+    redis_url = current_app.config.get('REDIS_URL')
     if _redis_client is None:
-        redis_url = current_app.config.get('REDIS_URL')
         if not redis_url:
             return None
+        _redis_client = create_redis_client(
+            redis_url,
+            current_app.config['REDIS_MAX_CONNECTIONS'],
+            current_app.config['REDIS_SOCKET_TIMEOUT']
+        )
+
+    if not get_breaker().allow(probe=_redis_client.ping):
+        return None
+    return _redis_client
 
-        try:
-            _redis_client = redis.from_url(
-                redis_url,
-                decode_responses=True,  # 자동 UTF-8 디코딩
-                socket_connect_timeout=2,
-                socket_timeout=2
-            )
-            # 연결 테스트
-            _redis_client.ping()
-        except Exception as e:
-            current_app.logger.warning(f"Redis connection failed: {e}")
-            _redis_client = None
 
-    return _redis_client
+def redis_health():
+    """
+    Redis 연결 상태 (breaker + connection pool)
+
+    Returns:
+        dict: {'enabled', 'breaker': CircuitBreaker.stats(), 'pool': {...} 또는 None}
+    """
+    if _redis_client is None and not current_app.config.get('REDIS_URL'):
+        return {'enabled': False, 'breaker': None, 'pool': None}
+
+    pool = getattr(_redis_client, 'connection_pool', None)
+    pool_stats = None
+    if pool is not None:
+        pool_stats = {
+            'max_connections': pool.max_connections,
+            'created': getattr(pool, '_created_connections', None),
+            'in_use': len(getattr(pool, '_in_use_connections', ())),
+            'available': len(getattr(pool, '_available_connections', ())),
+        }
+
+    return {'enabled': True, 'breaker': get_breaker().stats(), 'pool': pool_stats}
+
+
+def known_generation():
+    """
+    worker가 마지막으로 확인한 data generation (Redis 호출 없음, L1 조회 키용)
+
+    L1 항목은 CACHE_L1_TTL초 뒤 만료되므로, 이전 generation 키의 L1 항목도 그 안에 사라짐
+    (ETL 반영 지연 = 최대 CACHE_L1_TTL × 2)
+
+    Returns:
+        int or None: 아직 확인한 적 없으면 None
+    """
+    cached_generation = current_app.extensions.get('cache_generation')
+    return None if cached_generation is None else cached_generation[0]
+
+
+def current_generation(client):
+    """
+    현재 data generation (worker별로 CACHE_L1_TTL초 동안 재사용)
+
+    generation 조회마다 Redis 왕복이 생기지 않도록 worker 메모리에 보관
+    - ETL 완료 후 다른 worker 반영 지연 = 최대 CACHE_L1_TTL초 (L1 항목과 같음)
+
+    Returns:
+        int: 한 번도 증가하지 않았으면 0
+    """
+    cached_generation = current_app.extensions.get('cache_generation')
+    now = time.monotonic()
+    if cached_generation is not None and cached_generation[1] > now:
+        return cached_generation[0]
+
+    generation = int(client.get(GENERATION_KEY) or 0)
+    current_app.extensions['cache_generation'] = (
+        generation, now + current_app.config['CACHE_L1_TTL']
+    )
+    return generation
+
+
+def bump_generation(client):
+    """
+    data generation 증가 → 이전 generation의 캐시 키 전부 무효 (O(1), 이전 키는 TTL로 만료)
+
+    Returns:
+        int: 새 generation
+    """
+    return client.incr(GENERATION_KEY)
+
+
+def invalidate_data(redis_url, tags, chunk_size):
+    """
+    ETL 스크립트용 캐시 무효화 (Flask 앱 밖에서 호출)
+
+    generation 증가로 새 요청을 새 키로 보낸 뒤, tag에 등록된 이전 항목을 삭제
+    (TTL 만료까지 메모리에 남지 않음)
+
+    Args:
+        redis_url: REDIS_URL 설정값
+        tags: 삭제할 tag 이름 목록
+        chunk_size: UNLINK 1회당 키 수
+
+    Returns:
+        tuple or None: (새 generation, 삭제된 키 개수) (REDIS_URL 미설정 시 None)
+    """
+    if not redis_url:
+        return None
+    client = connect_redis(redis_url)
+    generation = bump_generation(client)
+    deleted = sum(delete_tagged(client, tag, chunk_size) for tag in tags)
+    return generation, deleted
+
+
+def normalize_params(params):
+    """
+    (이름, 값) 목록 → 정렬된 query string (앞뒤 공백 제거, 빈 값 제외)
+
+    urlencode로 이스케이프하므로 서로 다른 인자 조합은 다른 문자열
+    """
+    pairs = sorted(
+        (str(name), str(value).strip()) for name, value in params
+        if value is not None and str(value).strip() != ''
+    )
+    return urlencode(pairs)
+
+
+def make_cache_key(endpoint, rule_version, generation, args=(), kwargs=None, query=()):
+    """
+    정규화된 캐시 키
+
+    cache:{endpoint}:{rule_version}:g{generation}:{view 인자}?{query string}
+    - view 인자: 위치 인자(순번) + 키워드 인자, 이름순 정렬 (kwargs 순서 무관)
+    - query string: 이름/값 정렬 (파라미터 순서 무관)
+
+    Args:
+        endpoint: Flask endpoint (예: 'stats.get_risk_stats')
+        rule_version: 서비스 판정 규칙 버전
+        generation: data generation (current_generation())
+        args, kwargs: view 함수 인자
+        query: (이름, 값) 목록 (request.args.items(multi=True))
+
+    Returns:
+        str
+    """
+    view_args = [(f'_{i}', value) for i, value in enumerate(args)]
+    view_args += list((kwargs or {}).items())
+    return (
+        f"cache:{endpoint}:{rule_version}:g{generation}:"
+        f"{normalize_params(view_args)}?{normalize_params(query)}"
+    )
+
+
+class CacheTier:
+    """
+    엔드포인트별 캐시 계층 상태
+
+    - l1: worker 메모리 LRU (key → (ETag, fresh_until, body))
+    - L2(Redis) hit/miss 카운터
+    """
+
+    def __init__(self, l1_size, l1_ttl):
+        self.l1 = LRUMemo(l1_size, l1_ttl)
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self._lock = threading.Lock()
+
+    def record_l2(self, hit):
+        """Redis 조회 결과 기록"""
+        with self._lock:
+            if hit:
+                self.l2_hits += 1
+            else:
+                self.l2_misses += 1
+
+    def stats(self):
+        """
+        tier별 사용 현황
+
+        Returns:
+            dict: {'l1': LRUMemo.stats(), 'l2': {'hits', 'misses', 'hit_rate'}}
+        """
+        with self._lock:
+            hits, misses = self.l2_hits, self.l2_misses
+
+        total = hits + misses
+        return {
+            'l1': self.l1.stats(),
+            'l2': {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total, 3) if total else 0,
+            },
+        }
+
+
+def get_cache_tier(name, l1_size=None, l1_ttl=None):
+    """
+    app별 엔드포인트 캐시 계층 (최초 호출 시 생성)
+
+    Args:
+        name: 데코레이트된 함수 이름
+        l1_size: L1 최대 항목 수 (None이면 CACHE_L1_SIZE, 0이면 L1 비활성화)
+        l1_ttl: L1 유지 시간 (초, None이면 CACHE_L1_TTL)
+
+    Returns:
+        CacheTier
+    """
+    tiers = current_app.extensions.setdefault('cache_tiers', {})
+    tier = tiers.get(name)
+    if tier is None:
+        tier = CacheTier(
+            current_app.config['CACHE_L1_SIZE'] if l1_size is None else l1_size,
+            current_app.config['CACHE_L1_TTL'] if l1_ttl is None else l1_ttl,
+        )
+        tiers[name] = tier
+    return tier
+
+
+def cache_stats():
+    """
+    현재 worker의 엔드포인트별 캐시 사용 현황
+
+    Returns:
+        dict: {함수 이름: CacheTier.stats()}
+    """
+    tiers = current_app.extensions.get('cache_tiers', {})
+    return {name: tier.stats() for name, tier in sorted(tiers.items())}
+
+
+def json_response(body):
+    """직렬화된 JSON → Flask 응답"""
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def make_etag(body):
+    """
+    응답 body 해시 (ETag 값)
+
+    Returns:
+        str: 32자리 hex
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def encode_entry(etag, fresh_until, body):
+    """
+    캐시 항목 = 'ETag fresh_until\nbody' (GET 한 번으로 모두 조회)
+
+    Args:
+        fresh_until: 이 시각(time.time())까지 fresh, 이후 Redis 만료까지 stale
+    """
+    return f"{etag} {fresh_until:.3f}\n".encode('ascii') + body
+
+
+def decode_entry(value):
+    """
+    캐시 항목 → (ETag, fresh_until, body)
+
+    Args:
+        value: Redis GET 결과 (bytes, decode_responses=False)
+
+    Returns:
+        tuple: (str, float, bytes) - body는 저장된 bytes 그대로
+    """
+    header, _, body = value.partition(b'\n')
+    etag, _, fresh_until = header.decode('ascii').partition(' ')
+    return etag, float(fresh_until), body
+
+
+def entry_response(value):
+    """캐시 항목 → 응답 (저장된 body 그대로)"""
+    etag, _, body = decode_entry(value)
+    return etag_response(body, etag)
+
+
+def etag_response(body, etag):
+    """
+    ETag 응답 (If-None-Match 일치 시 304, body 없음)
+
+    ETag는 weak: 캐시 미스 응답(cached=false)과 히트 응답(cached=true)은
+    cached 필드만 다르고 같은 데이터이므로 같은 ETag 사용
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = json_response(body)
+
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'  # 매번 재검증 (304면 body 전송 없음)
+    return response
+
+
+# 락 해제: 내 토큰일 때만 삭제 (만료 후 다른 worker가 잡은 락은 유지)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_lock(client, cache_key, lock_ttl):
+    """
+    캐시 재계산 락 (SET NX PX, worker/프로세스 간 공유)
+
+    Args:
+        lock_ttl: 락 자동 만료 (초, 재계산 중 worker가 죽어도 풀림)
+
+    Returns:
+        str or None: 락 토큰 (획득 실패 시 None)
+    """
+    token = uuid.uuid4().hex
+    if client.set(f"lock:{cache_key}", token, nx=True, px=int(lock_ttl * 1000)):
+        return token
+    return None
+
+
+def release_lock(client, cache_key, token):
+    """재계산 락 해제 (내 토큰일 때만)"""
+    try:
+        client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{cache_key}", token)
+    except Exception as e:
+        record_redis_error(e)
+        current_app.logger.warning(f"Cache lock release error: {e}")
+
+
+def wait_for_entry(client, cache_key, timeout, interval=0.05):
+    """
+    다른 worker의 재계산 결과 대기
+
+    Returns:
+        캐시 값, timeout 안에 채워지지 않으면 None
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        cached_data = client.get(cache_key)
+        if cached_data:
+            return cached_data
+    return None
+
+
+def tag_key(tag):
+    """tag → Redis set 키 (해당 tag 캐시 키 목록)"""
+    return f"tag:{tag}"
+
 
+def unlink_keys(client, keys, chunk_size, chunks_per_pipeline=16):
+    """
+    키 iterator 삭제 (chunk_size개씩 UNLINK, chunks_per_pipeline개 명령마다 pipeline 전송)
+
+    UNLINK: 메모리 해제는 Redis background thread → 큰 값도 서버를 멈추지 않음
+    명령 1개의 키 수/pipeline 크기를 제한해 한 번에 오래 점유하지 않음
 
-def cached(ttl=60):
+    Returns:
+        int: 삭제된 키 개수
+    """
+    deleted = 0
+    pipe = client.pipeline(transaction=False)
+    queued = 0
+    chunk = []
+
+    def flush():
+        return sum(pipe.execute())
+
+    for key in keys:
+        chunk.append(key)
+        if len(chunk) >= chunk_size:
+            pipe.unlink(*chunk)
+            chunk = []
+            queued += 1
+            if queued >= chunks_per_pipeline:
+                deleted += flush()
+                queued = 0
+
+    if chunk:
+        pipe.unlink(*chunk)
+        queued += 1
+    if queued:
+        deleted += flush()
+    return deleted
+
+
+def clear_local_tiers():
+    """현재 worker의 L1 전부 비움 (다른 worker L1은 CACHE_L1_TTL 안에 만료)"""
+    for tier in current_app.extensions.get('cache_tiers', {}).values():
+        tier.l1.clear()
+
+
+def cached(ttl=60, stale_ttl=None, l1_size=None, l1_ttl=None, tags=()):
     """
     응답 캐싱 데코레이터
 
+    2단계 조회: worker 메모리 L1 (fresh 항목만, Redis 왕복 없음) → Redis(L2)
+    - L1은 worker별 사본이므로 l1_ttl을 짧게 유지 (다른 worker의 갱신 반영 지연 = 최대 l1_ttl)
+
+    stale-while-revalidate: ttl(soft) 지난 항목은 stale_ttl 동안 그대로 응답하고
+    background thread에서 재계산 (요청은 DB 집계를 기다리지 않음)
+
+    캐시 미스 시 single-flight: 락을 잡은 요청 하나만 원본 함수를 실행하고
+    나머지는 CACHE_LOCK_WAIT초까지 결과를 기다림 (TTL 만료 순간 DB 집계 중복 방지)
+    - 대기 시간 안에 채워지지 않으면 직접 실행 (락 보유 worker 장애 대비)
+
     Args:
-        ttl (int): Time-to-live (초)
+        ttl (int): fresh 유지 시간 (초, soft TTL)
+        stale_ttl (int): ttl 이후 stale 응답 허용 시간 (초, None이면 CACHE_STALE_TTL 설정값,
+            0이면 ttl에 바로 만료). Redis 키 만료(hard TTL) = ttl + stale_ttl
+        l1_size (int): L1 최대 항목 수 (None이면 CACHE_L1_SIZE 설정값, 0이면 L1 미사용)
+        l1_ttl (int): L1 유지 시간 (초, None이면 CACHE_L1_TTL 설정값)
+        tags (tuple): 항목을 등록할 tag (endpoint 이름은 항상 포함, invalidate_tags()로 삭제)
 
     Usage:
         @cached(ttl=60)
         def my_endpoint():
             return jsonify({...})
+
+    데코레이트된 함수의 cache_warm(*args, margin=0, **kwargs):
+        항목이 없거나 margin초 안에 stale이 되면 재계산해 저장 (pre-warming용, 요청 context 필요)
     """
     def decorator(f):
+        def tier():
+            return get_cache_tier(f.__name__, l1_size, l1_ttl)
+
+        def store(client, cache_key, data):
+            """cached=True 버전 body + ETag 저장 (Redis + L1) → (ETag, cached=False 응답 body)"""
+            if stale_ttl is None:
+                stale = current_app.config['CACHE_STALE_TTL']
+            else:
+                stale = stale_ttl
+
+            body = dumps({**data, 'cached': True})
+            etag = make_etag(body)
+            fresh_until = time.time() + ttl
+
+            # 항목 저장 + tag set 등록 (왕복 1회, tag set은 항목보다 먼저 만료되지 않도록 TTL 연장)
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(cache_key, ttl + stale, encode_entry(etag, fresh_until, body))
+            for tag in (request.endpoint or f.__name__, *tags):
+                pipe.sadd(tag_key(tag), cache_key)
+                pipe.expire(tag_key(tag), ttl + stale)
+            pipe.execute()
+
+            tier().l1.set(cache_key, (etag, fresh_until, body))
+            return etag, dumps({**data, 'cached': False})
+
+        def fill(client, cache_key, args, kwargs):
+            """원본 함수 실행 → 캐시 저장 → 응답"""
+            response = f(*args, **kwargs)
+
+            # dict 반환 시 직접 처리
+            if isinstance(response, dict):
+                data = response
+
+            # Flask Response 객체인 경우
+            elif hasattr(response, 'is_json') and response.is_json:
+                data = response.get_json()
+
+            else:
+                return response
+
+            # Redis에는 cached=True 버전 저장 (히트 시 그대로 응답)
+            # 저장 실패 시 이미 계산한 결과 그대로 응답 (원본 함수 재실행 없음)
+            try:
+                etag, body = store(client, cache_key, data)
+            except redis.exceptions.RedisError as e:
+                record_redis_error(e)
+                current_app.logger.warning(f"Cache store error: {e}")
+                return response
+            return etag_response(body, etag)
+
+        def refresh_in_background(client, cache_key, token, args, kwargs):
+            """
+            stale 항목 재계산 (background thread)
+
+            view 함수가 request.endpoint / request.args로 캐시 키와 결과를 정하므로
+            원래 요청의 경로, query, 헤더, host를 지금 캡처해 둔 뒤
+            thread에서 app context + 같은 내용의 request context를 새로 만들어 실행
+            (f는 require_api_key 안쪽 view라 인증은 다시 거치지 않음)
+            """
+            app = current_app._get_current_object()
+            environ = request_environ(
+                request.path,
+                query_string=request.query_string.decode(),
+                headers=list(request.headers.items()),
+                base_url=request.root_url,
+            )
+
+            def run():
+                try:
+                    with app.app_context(), app.request_context(environ):
+                        fill(client, cache_key, args, kwargs)
+                except Exception as e:
+                    record_redis_error(e)
+                    app.logger.warning(f"Cache refresh error: {e}")
+                finally:
+                    with app.app_context():
+                        release_lock(client, cache_key, token)
+
+            threading.Thread(target=run, name='cache-refresh', daemon=True).start()
+
+        def cache_key_for(generation, args, kwargs):
+            """현재 요청 기준 캐시 키 (endpoint + rule_version + generation + 인자/query)"""
+            return make_cache_key(
+                request.endpoint or f.__name__,
+                current_app.config['RULE_VERSION'],
+                generation,
+                args, kwargs,
+                request.args.items(multi=True)
+            )
+
+        def l1_response(endpoint_tier, cache_key):
+            """L1 fresh 항목 → 응답 (없거나 stale이면 None → Redis에서 재검증)"""
+            entry = endpoint_tier.l1.get(cache_key)
+            if entry is not None and time.time() < entry[1]:
+                return etag_response(entry[2], entry[0])
+            return None
+
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            endpoint_tier = tier()
+
+            # L1 조회: Redis 호출 없음 (worker가 알고 있는 generation 기준)
+            # → breaker open/Redis 장애 중에도 L1 항목은 그대로 응답
+            generation = known_generation()
+            if generation is not None:
+                response = l1_response(endpoint_tier, cache_key_for(generation, args, kwargs))
+                if response is not None:
+                    return response
+
             client = get_redis_client()
 
             # Redis 미사용 시 원본 함수 실행
             if client is None:
                 return f(*args, **kwargs)
 
-            # 캐시 키 생성 (함수명 + 파라미터)
-            cache_key = f"cache:{f.__name__}:{str(args)}:{str(kwargs)}"
-
+            # Redis 조회 단계 (원본 함수 실행 전): Redis 오류면 원본 함수로 응답
+            token = None
             try:
-                # 캐시 조회
+                latest = current_generation(client)
+                cache_key = cache_key_for(latest, args, kwargs)
+
+                # generation이 바뀌었으면 새 키로 L1 다시 조회
+                if latest != generation:
+                    response = l1_response(endpoint_tier, cache_key)
+                    if response is not None:
+                        return response
+
+                # 캐시 조회 (저장된 body 그대로 응답, 파싱/재직렬화 없음)
                 cached_data = client.get(cache_key)
+                get_breaker().record_success()
+                endpoint_tier.record_l2(bool(cached_data))
                 if cached_data:
-                    # 캐시 히트
-                    data = json.loads(cached_data)
-                    data['cached'] = True
-                    return jsonify(data)
-
-                # 캐시 미스 - 원본 함수 실행
-                response = f(*args, **kwargs)
-
-                # dict 반환 시 직접 처리
-                if isinstance(response, dict):
-                    data = response
-                    data['cached'] = False
-
-                    # Redis에 저장
-                    client.setex(
-                        cache_key,
-                        ttl,
-                        json.dumps(data, cls=DecimalEncoder)
+                    etag, fresh_until, body = decode_entry(cached_data)
+
+                    # stale → 그대로 응답 + 재계산은 락을 잡은 요청 하나가 background로
+                    if time.time() >= fresh_until:
+                        token = acquire_lock(client, cache_key, current_app.config['CACHE_LOCK_TTL'])
+                        if token is not None:
+                            refresh_in_background(client, cache_key, token, args, kwargs)
+                    else:
+                        endpoint_tier.l1.set(cache_key, (etag, fresh_until, body))
+
+                    return etag_response(body, etag)
+
+                # 캐시 미스 - 재계산 락
+                token = acquire_lock(client, cache_key, current_app.config['CACHE_LOCK_TTL'])
+                if token is None:
+                    # 다른 요청이 재계산 중 → 결과 대기 (시간 초과 시 직접 실행)
+                    cached_data = wait_for_entry(
+                        client, cache_key, current_app.config['CACHE_LOCK_WAIT']
                     )
+                else:
+                    # 락 획득 직전에 다른 요청이 채웠을 수 있음
+                    cached_data = client.get(cache_key)
 
-                    return jsonify(data)
-
-                # Flask Response 객체인 경우
-                if hasattr(response, 'is_json') and response.is_json:
-                    data = response.get_json()
-                    data['cached'] = False
+                if cached_data:
+                    if token is not None:
+                        release_lock(client, cache_key, token)
+                    return entry_response(cached_data)
 
-                    # Redis에 저장
-                    client.setex(
-                        cache_key,
-                        ttl,
-                        json.dumps(data, cls=DecimalEncoder)
-                    )
+            except (redis.exceptions.RedisError, ValueError) as e:  # ValueError: 손상된 캐시 항목
+                record_redis_error(e)
+                current_app.logger.warning(f"Cache error: {e}")
+                if token is not None:
+                    release_lock(client, cache_key, token)
+                return f(*args, **kwargs)
 
-                    return jsonify(data)
+            # 재계산 (원본 함수 예외는 그대로 전달, 저장 실패는 fill()에서 처리)
+            try:
+                return fill(client, cache_key, args, kwargs)
+            finally:
+                if token is not None:
+                    release_lock(client, cache_key, token)
+
+        def cache_warm(*args, margin=0, **kwargs):
+            """
+            pre-warming: 항목이 없거나 margin초 안에 stale이 되면 재계산
+
+            Returns:
+                bool: 재계산했으면 True
+            """
+            client = get_redis_client()
+            if client is None:
+                return False
 
-                return response
+            cache_key = cache_key_for(current_generation(client), args, kwargs)
+            cached_data = client.get(cache_key)
+            if cached_data and decode_entry(cached_data)[1] - time.time() > margin:
+                return False
 
-            except Exception as e:
-                current_app.logger.warning(f"Cache error: {e}")
-                # 에러 시 원본 함수 실행
-                return f(*args, **kwargs)
+            # 다른 worker가 재계산 중이면 생략
+            token = acquire_lock(client, cache_key, current_app.config['CACHE_LOCK_TTL'])
+            if token is None:
+                return False
+            try:
+                fill(client, cache_key, args, kwargs)
+                return True
+            finally:
+                release_lock(client, cache_key, token)
 
+        decorated_function.cache_warm = cache_warm
         return decorated_function
     return decorator
 
 
+def request_environ(path, query_string='', headers=None, base_url=None):
+    """
+    요청 밖(background thread, pre-warming)에서 view를 실행할 GET 요청 WSGI environ 생성
+
+    Args:
+        path: 요청 경로
+        query_string: query 문자열
+        headers: 헤더 (key, value) 리스트
+        base_url: scheme + host + script root (None이면 SERVER_NAME 없이 localhost)
+
+    Returns:
+        dict: app.request_context()에 넘길 environ
+    """
+    builder = EnvironBuilder(
+        path=path, query_string=query_string, headers=headers,
+        base_url=base_url, method='GET',
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def warm_paths(app, paths, margin=0):
+    """
+    캐시 pre-warming 1회 실행
+
+    각 경로의 view 함수(cache_warm)를 app context + 해당 경로 request context에서 실행
+    - 캐시 키가 request.endpoint / request.args 기준이라 실제 요청과 같은 경로로 context 구성
+    - base_url은 SERVER_NAME / APPLICATION_ROOT / PREFERRED_URL_SCHEME 설정을 따름
+    - cache_warm은 require_api_key 안쪽 view를 직접 호출 (인증 헤더 불필요)
+    - fresh 항목이 margin초 안에 stale이 될 때만 재계산
+
+    Args:
+        app: Flask 앱
+        paths: 경로 리스트 (예: ['/stats/risk', '/stats/age'])
+        margin: 재계산 기준 (초, 보통 pre-warming 주기)
+
+    Returns:
+        int: 재계산한 경로 수
+    """
+    config = app.config
+    base_url = None
+    if config.get('SERVER_NAME'):
+        base_url = (
+            f"{config['PREFERRED_URL_SCHEME']}://{config['SERVER_NAME']}"
+            f"{(config.get('APPLICATION_ROOT') or '/').rstrip('/')}/"
+        )
+
+    warmed = 0
+    for path in paths:
+        path, _, query_string = path.partition('?')
+        environ = request_environ(path, query_string=query_string, base_url=base_url)
+        with app.app_context(), app.request_context(environ):
+            try:
+                endpoint, view_args = request.url_rule.endpoint, request.view_args
+                view = app.view_functions[endpoint]
+                warmed += bool(view.cache_warm(**view_args, margin=margin))
+            except Exception as e:
+                record_redis_error(e)
+                app.logger.warning(f"Cache prewarm error ({path}): {e}")
+    return warmed
+
+
+def run_prewarm(app, paths, interval):
+    """
+    캐시 pre-warming 반복 실행 (시작 시 + interval초마다, 호출한 thread를 점유)
+
+    gunicorn worker마다 실행하지 않도록 별도 프로세스 하나에서만 호출
+    (scripts/prewarm_cache.py)
+
+    Args:
+        app: Flask 앱
+        paths: 경로 리스트
+        interval: 주기 (초, 0이면 한 번만)
+    """
+    warm_paths(app, paths, margin=interval)
+    while interval > 0:
+        time.sleep(interval)
+        warm_paths(app, paths, margin=interval)
+
+
+def delete_tagged(client, tag, chunk_size):
+    """
+    tag 하나에 등록된 캐시 항목 삭제 (Flask 앱 밖에서도 사용, Redis 오류는 호출자에게 전달)
+
+    tag set을 임시 키로 RENAME한 뒤 SSCAN으로 나눠 읽고 chunk 단위 UNLINK
+    - RENAME 이후 저장되는 항목은 새 tag set에 등록 (삭제 대상과 섞이지 않음)
+
+    Returns:
+        int: 삭제된 캐시 키 개수
+    """
+    pending = f"{tag_key(tag)}:invalidating:{uuid.uuid4().hex}"
+    try:
+        client.rename(tag_key(tag), pending)
+    except redis.exceptions.ResponseError:
+        return 0  # 등록된 항목 없음
+
+    members = client.sscan_iter(pending, count=chunk_size)
+    deleted = unlink_keys(client, members, chunk_size)
+    client.unlink(pending)
+    return deleted
+
+
+def invalidate_tags(*tags):
+    """
+    tag에 등록된 캐시 항목 삭제
+
+    tag별로 delete_tagged 실행, 현재 worker의 L1은 전부 비움
+
+    Args:
+        tags: tag 이름 (endpoint 이름 또는 cached(tags=...)로 지정한 값)
+
+    Returns:
+        int: 삭제된 캐시 키 개수
+    """
+    clear_local_tiers()
+
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    chunk_size = current_app.config['CACHE_INVALIDATE_CHUNK']
+    deleted = 0
+    for tag in tags:
+        try:
+            deleted += delete_tagged(client, tag, chunk_size)
+        except Exception as e:
+            record_redis_error(e)
+            current_app.logger.warning(f"Cache invalidate error: {e}")
+
+    return deleted
+
+
 def clear_cache_pattern(pattern):
     """
-    패턴에 매칭되는 캐시 삭제
+    패턴에 매칭되는 캐시 삭제 (tag가 없는 키용)
+
+    KEYS 대신 SCAN으로 나눠 조회 → 키 공간 전체를 한 번에 훑으며 Redis를 멈추지 않음
+    현재 worker의 L1은 전부 비움 (다른 worker L1은 CACHE_L1_TTL 안에 만료)
 
     Args:
-        pattern (str): Redis key 패턴 (예: 'cache:get_risk_stats:*')
+        pattern (str): Redis key 패턴 (예: 'cache:stats.get_risk_stats:*')
 
     Returns:
         int: 삭제된 키 개수
     """
+    clear_local_tiers()
+
     client = get_redis_client()
     if client is None:
         return 0
 
+    chunk_size = current_app.config['CACHE_INVALIDATE_CHUNK']
     try:
-        keys = client.keys(pattern)
-        if keys:
-            return client.delete(*keys)
-        return 0
+        keys = client.scan_iter(match=pattern, count=chunk_size)
+        return unlink_keys(client, keys, chunk_size)
     except Exception as e:
+        record_redis_error(e)
         current_app.logger.warning(f"Cache clear error: {e}")
         return 0
@@ -21,6 +21,18 @@ class Config:
 
     # Redis
     REDIS_URL = os.getenv('REDIS_URL')
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))  # worker당 connection pool 크기
+    REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', 2))  # 연결/명령 timeout (초)
+    REDIS_BREAKER_THRESHOLD = int(os.getenv('REDIS_BREAKER_THRESHOLD', 3))  # circuit open 연속 실패 횟수
+    REDIS_BREAKER_BASE_DELAY = float(os.getenv('REDIS_BREAKER_BASE_DELAY', 1))  # 첫 open 유지 시간 (초, 실패마다 2배)
+    REDIS_BREAKER_MAX_DELAY = float(os.getenv('REDIS_BREAKER_MAX_DELAY', 60))  # open 유지 시간 상한 (초)
+    CACHE_LOCK_TTL = float(os.getenv('CACHE_LOCK_TTL', 30))  # 캐시 재계산 락 자동 만료 (초)
+    CACHE_LOCK_WAIT = float(os.getenv('CACHE_LOCK_WAIT', 5))  # 재계산 결과 대기 최대 시간 (초)
+    CACHE_STALE_TTL = int(os.getenv('CACHE_STALE_TTL', 300))  # soft TTL 이후 stale 응답 허용 시간 (초, 0 = 비활성화)
+    CACHE_L1_SIZE = int(os.getenv('CACHE_L1_SIZE', 256))  # 엔드포인트별 worker 메모리 캐시 항목 수 (0 = 비활성화)
+    CACHE_L1_TTL = int(os.getenv('CACHE_L1_TTL', 5))  # worker 메모리 캐시 유지 시간 (초)
+    CACHE_INVALIDATE_CHUNK = int(os.getenv('CACHE_INVALIDATE_CHUNK', 500))  # 무효화 시 SCAN/UNLINK 1회당 키 수
+    CACHE_PREWARM_INTERVAL = int(os.getenv('CACHE_PREWARM_INTERVAL', 50))  # scripts/prewarm_cache.py 주기 (초, 0 = 1회)
 
     # API Key
     API_KEY = os.getenv('API_KEY', 'default-secret-key-change-me')
@@ -34,6 +46,19 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # 성능 개선 (보통 꺼두는 설정)
     SQLALCHEMY_ECHO = DEBUG  # 개발 환경에서만 SQL 로그 출력
 
+    # 판정 규칙 (app/services/rules.py)
+    RULE_VERSION = os.getenv('RULE_VERSION', 'guideline-v1')  # 서비스 버전 (/records, /stats, /simulate 기본값)
+
+    # Simulate
+    SIMULATE_BATCH_MAX_ITEMS = int(os.getenv('SIMULATE_BATCH_MAX_ITEMS', 10000))  # /simulate/batch 최대 항목 수
+    SIMULATE_STREAM_BATCH_SIZE = int(os.getenv('SIMULATE_STREAM_BATCH_SIZE', 500))  # /simulate/stream micro-batch 크기
+    SIMULATE_MEMO_SIZE = int(os.getenv('SIMULATE_MEMO_SIZE', 4096))  # /simulate 판정 memo 항목 수 (0 = 비활성화)
+    SIMULATE_MEMO_TTL = int(os.getenv('SIMULATE_MEMO_TTL', 3600))  # /simulate 판정 memo 유지 시간 (초, 0 = 만료 없음)
+
+    # Stats
+    WHATIF_SNAPSHOT_TTL = int(os.getenv('WHATIF_SNAPSHOT_TTL', 3600))  # /stats/whatif 인구 snapshot 유지 시간 (초)
+    WHATIF_SNAPSHOT_PRELOAD = os.getenv('WHATIF_SNAPSHOT_PRELOAD', 'true').lower() == 'true'  # 앱 시작 시 snapshot 적재
+
     # ETL
     ETL_CHUNK_SIZE = int(os.getenv('ETL_CHUNK_SIZE', 10000))  # pandas chunk 크기
 
@@ -11,13 +11,28 @@ from app.config import get_config
 # 설정 로드
 config = get_config()
 
+
+def create_db_engine(**kwargs):
+    """
+    Engine 생성 (DB 연결 풀)
+
+    ETL worker 프로세스처럼 전역 engine을 공유하면 안 되는 경우
+    별도 engine을 만들 때 사용
+
+    Args:
+        **kwargs: create_engine 추가 옵션 (기본값 덮어쓰기)
+    """
+    options = {
+        'echo': config.SQLALCHEMY_ECHO,  # SQL 로그 (개발 환경에서만)
+        'pool_pre_ping': True,  # 연결 유효성 체크
+        'pool_recycle': 3600,  # 1시간마다 연결 재생성
+    }
+    options.update(kwargs)
+    return create_engine(config.SQLALCHEMY_DATABASE_URI, **options)
+
+
 # Engine 생성 (DB 연결 풀)
-engine = create_engine(
-    config.SQLALCHEMY_DATABASE_URI,
-    echo=config.SQLALCHEMY_ECHO,  # SQL 로그 (개발 환경에서만)
-    pool_pre_ping=True,  # 연결 유효성 체크
-    pool_recycle=3600,  # 1시간마다 연결 재생성
-)
+engine = create_db_engine()
 
 # Session Factory
 SessionLocal = sessionmaker(
@@ -48,17 +63,87 @@ def get_db():
         db.close()
 
 
-def init_db():
+def init_db(db_engine=None):
     """
-    테이블 생성
+    테이블 생성 + 이전 스키마 전환
 
-    models의 Base.metadata를 사용하여 모든 테이블 생성
+    models의 Base.metadata를 사용하여 모든 테이블 생성 (이미 있으면 유지)
+    기존 테이블은 upgrade_clean_unique_key()로 버전별 유일성 제약 전환
     """
     from app.models.health_check import Base
-    Base.metadata.create_all(bind=engine)
+    import app.models.etl_checkpoint  # noqa: F401 (Base.metadata 등록)
+    db_engine = db_engine or engine
+    Base.metadata.create_all(bind=db_engine)
+    upgrade_clean_unique_key(db_engine)
     print("✅ Database tables created successfully")
 
 
+def legacy_clean_unique_keys(db_engine=None):
+    """
+    clean_risk_result의 이전 raw_id 단독 UNIQUE 인덱스/제약 이름
+
+    rule_version 추가 이전에 생성된 DB에만 존재 (버전별 결과를 함께 저장할 수 없음)
+
+    Returns:
+        tuple: (unique 인덱스 이름 리스트, unique 제약 이름 리스트)
+    """
+    from sqlalchemy import inspect
+    from app.models.health_check import CleanRiskResult
+
+    inspector = inspect(db_engine or engine)
+    table_name = CleanRiskResult.__table__.name
+    if not inspector.has_table(table_name):
+        return [], []
+
+    def legacy(items, unique_only):
+        return list(dict.fromkeys(
+            item['name'] for item in items
+            if item['name'] and item['column_names'] == ['raw_id']
+            and (item.get('unique') or not unique_only)
+        ))
+
+    constraints = legacy(inspector.get_unique_constraints(table_name), unique_only=False)
+    indexes = [
+        name for name in legacy(inspector.get_indexes(table_name), unique_only=True)
+        if name not in constraints
+    ]
+    return indexes, constraints
+
+
+def upgrade_clean_unique_key(db_engine=None):
+    """
+    clean_risk_result 유일성 제약을 (raw_id) → (raw_id, rule_version)으로 전환 (1회성 migration)
+
+    DDL은 SQLAlchemy가 dialect별로 생성
+    - unique 인덱스: DROP INDEX (MySQL은 ... ON table)
+    - unique 제약: ALTER TABLE ... DROP CONSTRAINT (MySQL은 제약 = 인덱스이므로 DROP INDEX)
+    """
+    from sqlalchemy import Column, Index, Integer, MetaData, Table, UniqueConstraint
+    from sqlalchemy.schema import DropConstraint
+    from app.models.health_check import CleanRiskResult
+
+    db_engine = db_engine or engine
+    table = CleanRiskResult.__table__
+    indexes, constraints = legacy_clean_unique_keys(db_engine)
+    if db_engine.dialect.name == 'mysql':
+        indexes, constraints = indexes + constraints, []
+
+    # DDL 생성용 테이블 (모델 metadata에 이전 인덱스가 추가되지 않도록 분리)
+    legacy_table = Table(table.name, MetaData(), Column('raw_id', Integer))
+
+    with db_engine.begin() as conn:
+        for name in indexes:
+            print(f"   🔧 Dropping legacy unique index {name} (raw_id)")
+            Index(name, legacy_table.c.raw_id).drop(conn)
+        for name in constraints:
+            print(f"   🔧 Dropping legacy unique constraint {name} (raw_id)")
+            conn.execute(DropConstraint(UniqueConstraint(legacy_table.c.raw_id, name=name)))
+
+        for index in table.indexes:
+            if index.name in ('uq_clean_raw_version', 'idx_version_group'):
+                index.create(conn, checkfirst=True)
+
+
 def drop_db():
     """
     모든 테이블 삭제 (주의!)
@@ -66,5 +151,6 @@ def drop_db():
     개발 중에만 사용
     """
     from app.models.health_check import Base
+    import app.models.etl_checkpoint  # noqa: F401 (Base.metadata 등록)
     Base.metadata.drop_all(bind=engine)
     print("⚠️  All database tables dropped")
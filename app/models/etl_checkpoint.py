@@ -0,0 +1,38 @@
+"""
+SQLAlchemy 모델: etl_checkpoint
+
+ETL 단계별 진행 위치 저장 (중단 후 --resume 재개용)
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, TIMESTAMP, func
+from app.models.health_check import Base
+
+
+class EtlCheckpoint(Base):
+    """
+    ETL 체크포인트 테이블
+
+    데이터와 같은 트랜잭션에서 갱신 → 커밋된 위치까지만 기록됨
+    - load_raw: 적재 완료된 CSV 행 수 (rows_done), 마지막 chunk 번호
+    - process_clean: 처리 완료된 마지막 raw id (shard별 stage)
+    """
+    __tablename__ = 'etl_checkpoint'
+
+    # 단계 이름 (예: 'load_raw', 'process_clean', 'process_clean:0-250000')
+    stage = Column(String(50), primary_key=True)
+
+    # 진행 위치
+    last_chunk = Column(Integer, nullable=False, default=0)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    rows_done = Column(BigInteger, nullable=False, default=0)
+
+    # 메타데이터
+    updated_at = Column(
+        TIMESTAMP,
+        nullable=False,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
+
+    def __repr__(self):
+        return f"<EtlCheckpoint(stage={self.stage}, last_id={self.last_id}, rows={self.rows_done})>"
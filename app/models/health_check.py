@@ -24,8 +24,8 @@ class RawHealthCheck(Base):
     """
     __tablename__ = 'raw_health_check'
 
-    # Primary Key
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # Primary Key (SQLite는 INTEGER PK만 자동 증가 → 테스트용 variant)
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
 
     # 기본 정보
     reference_year = Column(SmallInteger, nullable=False, default=2024)
@@ -58,11 +58,10 @@ class RawHealthCheck(Base):
     # 메타데이터
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
 
-    # Relationship (1:1)
-    clean_result = relationship(
+    # Relationship (1:N - rule_version별 판정 결과)
+    clean_results = relationship(
         'CleanRiskResult',
         back_populates='raw_record',
-        uselist=False,  # 1:1 관계
         cascade='all, delete-orphan'
     )
 
@@ -71,6 +70,8 @@ class RawHealthCheck(Base):
         Index('idx_age_group', 'age_group_code'),
         Index('idx_gender', 'gender_code'),
         Index('idx_systolic_bp', 'systolic_bp'),
+        # 자연키 (같은 기준년도의 같은 가입자 = 같은 검진 기록, upsert 적재 기준)
+        Index('uq_raw_natural_key', 'reference_year', 'subscriber_id', unique=True),
     )
 
     def __repr__(self):
@@ -85,15 +86,14 @@ class CleanRiskResult(Base):
     """
     __tablename__ = 'clean_risk_result'
 
-    # Primary Key
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # Primary Key (SQLite는 INTEGER PK만 자동 증가 → 테스트용 variant)
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
 
     # Foreign Key
     raw_id = Column(
         BigInteger,
         ForeignKey('raw_health_check.id', ondelete='CASCADE', onupdate='CASCADE'),
-        nullable=False,
-        unique=True  # 1:1 관계 보장
+        nullable=False
     )
 
     # 계산 필드
@@ -127,15 +127,18 @@ class CleanRiskResult(Base):
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
 
     # Relationship
-    raw_record = relationship('RawHealthCheck', back_populates='clean_result')
+    raw_record = relationship('RawHealthCheck', back_populates='clean_results')
 
     # 인덱스 (통계 쿼리 최적화)
     __table_args__ = (
         Index('idx_raw_id', 'raw_id'),
+        # raw 레코드당 rule_version별 결과 1개 (버전별 결과 병행 저장)
+        Index('uq_clean_raw_version', 'raw_id', 'rule_version', unique=True),
         Index('idx_risk_group', 'risk_group'),
         Index('idx_risk_count', 'risk_factor_count'),
         Index('idx_invalid', 'invalid_flag'),
         Index('idx_composite_stats', 'risk_group', 'invalid_flag'),  # 복합 인덱스
+        Index('idx_version_group', 'rule_version', 'risk_group'),  # 서비스 버전별 통계
     )
 
     def __repr__(self):
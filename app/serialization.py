@@ -0,0 +1,87 @@
+"""
+JSON 직렬화 (API 응답 + Redis 캐시 공용)
+
+orjson이 설치되어 있으면 사용, 없으면 stdlib json (같은 출력 형식)
+- Decimal → float, datetime/date → ISO 8601 문자열 (변환 코드 없이 그대로 전달 가능)
+- numpy scalar/배열 → Python 값
+- 응답은 bytes로 바로 생성 (str → bytes 인코딩 단계 없음)
+- 키 정렬 없음 (dict 순서 그대로)
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+
+def _default(obj):
+    """기본 인코더가 처리하지 못하는 타입 변환"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    BACKEND = 'orjson'
+
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        """
+        객체 → JSON bytes
+
+        Returns:
+            bytes: UTF-8 JSON
+        """
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+
+else:
+    BACKEND = 'json'
+
+    def dumps(obj):
+        """
+        객체 → JSON bytes
+
+        Returns:
+            bytes: UTF-8 JSON
+        """
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+
+    loads = json.loads
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider (jsonify, request.get_json()이 사용)
+
+    create_app()에서 app.json으로 등록
+    """
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
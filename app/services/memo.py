@@ -0,0 +1,93 @@
+"""
+In-process LRU + TTL memo
+
+같은 입력이 반복되는 계산 결과를 프로세스 메모리에 보관 (예: /simulate 판정 결과)
+- maxsize개 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- ttl초가 지난 항목은 조회 시 제거 (0이면 만료 없음)
+- hit/miss 카운터 (stats())
+- gunicorn --threads 환경에서 사용하므로 lock으로 보호
+- 저장한 값은 호출 측이 공유하므로 수정하지 않고 읽기만 할 것
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUMemo:
+    """크기 제한 + TTL memo (maxsize가 0이면 비활성화)"""
+
+    def __init__(self, maxsize, ttl=0):
+        """
+        Args:
+            maxsize: 최대 항목 수 (0 이하면 저장하지 않음)
+            ttl: 항목 유지 시간 (초, 0이면 만료 없음)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key):
+        """
+        저장된 값 조회
+
+        Returns:
+            저장된 값, 없거나 만료됐으면 None
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if not expires_at or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """값 저장 (maxsize 초과 시 LRU 항목 제거)"""
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """전체 삭제 (카운터 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        사용 현황
+
+        Returns:
+            dict: {'size', 'maxsize', 'ttl', 'hits', 'misses', 'hit_rate'}
+        """
+        with self._lock:
+            size = len(self._data)
+            hits, misses = self.hits, self.misses
+
+        total = hits + misses
+        return {
+            'size': size,
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else 0,
+        }
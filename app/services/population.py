@@ -0,0 +1,258 @@
+"""
+인구 집단 what-if 분석 (in-memory 컬럼형 snapshot)
+
+raw_health_check 측정값을 컬럼별 numpy 배열로 메모리에 보관하고,
+기준값만 바꾼 규칙으로 전체 인구의 위험군 분포를 다시 계산 (/stats/whatif, ETL 재실행 없음)
+- snapshot은 프로세스당 1개, background thread에서 적재
+    - 앱 시작 시 적재 시작 (WHATIF_SNAPSHOT_PRELOAD), 첫 적재가 끝나기 전 요청만 완료를 기다림
+    - max_age(WHATIF_SNAPSHOT_TTL)가 지나면 이전 snapshot을 계속 응답하면서 background 재적재
+- id 범위 chunk 단위로 조회해 컬럼별 배열로 변환 (행마다 ORM Row/배열을 만들지 않음)
+- 측정값은 float32로 보관 (SmallInteger 값은 정확히 표현, 1M행 × 9컬럼 ≈ 36MB)
+- 유효성/BMI는 기준값과 무관 → rule_version별로 한 번만 계산해 두고
+  what-if 요청마다 유효 레코드의 flag/위험군만 다시 판정
+"""
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.health_check import RawHealthCheck
+from app.services.rules import DEFAULT_RULE_VERSION, RISK_GROUPS, get_rules
+
+# snapshot에 담을 측정값 (판정 입력 컬럼)
+SNAPSHOT_COLUMNS = get_rules(DEFAULT_RULE_VERSION).input_columns
+
+# DB에서 한 번에 가져올 행 수
+SNAPSHOT_CHUNK_SIZE = 100000
+
+logger = logging.getLogger(__name__)
+
+
+def group_distribution(group_code):
+    """
+    위험군 코드 배열 → 분포 (/stats/risk의 risk_distribution과 같은 형식)
+
+    Returns:
+        dict: {위험군: {'count', 'percentage'}}
+    """
+    counts = np.bincount(group_code, minlength=len(RISK_GROUPS))
+    total = int(counts.sum())
+
+    return {
+        group: {
+            'count': int(count),
+            'percentage': round(int(count) / total * 100, 1) if total > 0 else 0
+        }
+        for group, count in zip(RISK_GROUPS, counts)
+    }
+
+
+class PopulationSnapshot:
+    """raw_health_check 측정값 컬럼 배열 (적재 시점 기준, 읽기 전용)"""
+
+    def __init__(self, columns, loaded_at=None):
+        """
+        Args:
+            columns: {컬럼명: float 배열 (NULL → NaN)}, 길이 동일
+            loaded_at: 적재 시각 (time.time(), None이면 지금)
+        """
+        self.columns = columns
+        self.size = len(columns[SNAPSHOT_COLUMNS[0]])
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        self._baselines = {}
+
+    def baseline(self, rules):
+        """
+        rule_version 기준 유효 레코드 + 판정 결과 (버전별 1회 계산)
+
+        Returns:
+            dict: {
+                'columns': 유효 레코드 float64 배열 (bmi 포함),
+                'group_code': 위험군 코드 배열
+            }
+        """
+        baseline = self._baselines.get(rules.version)
+        if baseline is None:
+            valid = rules.is_valid_batch(self.columns)
+            columns = {
+                column: values[valid].astype(np.float64)
+                for column, values in self.columns.items()
+            }
+            columns['bmi'] = rules.calculate_bmi_batch(columns['height'], columns['weight'])
+
+            baseline = {
+                'columns': columns,
+                'group_code': rules.evaluate_batch(columns)['group_code'],
+            }
+            self._baselines[rules.version] = baseline
+        return baseline
+
+    def whatif(self, base_rules, rules):
+        """
+        기준값을 바꾼 규칙으로 전체 인구 재판정
+
+        Args:
+            base_rules: 비교 기준 규칙 (유효 레코드 판정에도 사용)
+            rules: what-if 규칙 (derive_definition()으로 기준값만 바꾼 정의)
+
+        Returns:
+            dict: {
+                'total_records', 'valid_records',
+                'baseline': 기준 위험군 분포,
+                'whatif': what-if 위험군 분포,
+                'changed_records': 위험군이 바뀐 레코드 수,
+                'flag_counts': {위험요인: what-if 해당 레코드 수}
+            }
+        """
+        baseline = self.baseline(base_rules)
+        scored = rules.evaluate_batch(baseline['columns'])
+
+        return {
+            'total_records': self.size,
+            'valid_records': len(baseline['group_code']),
+            'baseline': group_distribution(baseline['group_code']),
+            'whatif': group_distribution(scored['group_code']),
+            'changed_records': int(np.count_nonzero(scored['group_code'] != baseline['group_code'])),
+            'flag_counts': {
+                name: int(np.count_nonzero(flag))
+                for name, flag in scored['flags'].items()
+            },
+        }
+
+
+def column_array(values):
+    """
+    DB 값 tuple → float32 배열 (NULL → NaN)
+
+    NULL이 없는 chunk는 numpy가 바로 변환 (값 단위 Python 처리 없음)
+    """
+    if None in values:
+        values = [np.nan if value is None else value for value in values]
+    return np.array(values, dtype=np.float32)
+
+
+def load_snapshot(db, chunk_size=SNAPSHOT_CHUNK_SIZE):
+    """
+    raw_health_check 측정값 → PopulationSnapshot
+
+    id keyset 범위(`WHERE id > last_id ORDER BY id LIMIT n`)로 chunk_size행씩 조회하고
+    DBAPI cursor 결과 tuple을 컬럼별 배열로 변환 (ORM Row/행별 배열 변환 없음,
+    chunk 단위 조회라 전체 결과를 한 번에 버퍼링하지 않음)
+
+    Args:
+        db: SQLAlchemy 세션
+        chunk_size: 한 번에 가져올 행 수
+
+    Returns:
+        PopulationSnapshot
+    """
+    stmt = select(
+        RawHealthCheck.id,
+        *(getattr(RawHealthCheck, column) for column in SNAPSHOT_COLUMNS)
+    ).order_by(RawHealthCheck.id).limit(chunk_size)
+
+    chunks = {column: [] for column in SNAPSHOT_COLUMNS}
+    connection = db.connection()
+    last_id = 0
+    while True:
+        result = connection.execute(stmt.where(RawHealthCheck.id > last_id))
+        rows = result.cursor.fetchall()
+        result.close()
+        if not rows:
+            break
+
+        ids, *columns = zip(*rows)
+        for column, values in zip(SNAPSHOT_COLUMNS, columns):
+            chunks[column].append(column_array(values))
+        last_id = ids[-1]
+
+    return PopulationSnapshot({
+        column: np.concatenate(arrays) if arrays else np.empty(0, dtype=np.float32)
+        for column, arrays in chunks.items()
+    })
+
+
+# 프로세스 전역 snapshot + 진행 중인 적재 thread
+_snapshot = None
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def _load():
+    """snapshot 적재 (background thread, 실패 시 이전 snapshot 유지)"""
+    global _snapshot
+
+    db = SessionLocal()
+    try:
+        _snapshot = load_snapshot(db)
+    except Exception:
+        logger.exception("Population snapshot load failed")
+    finally:
+        db.close()
+
+
+def refresh_snapshot():
+    """
+    background 적재 시작 (이미 적재 중이면 그 thread 반환)
+
+    Returns:
+        threading.Thread
+    """
+    global _loader
+
+    with _loader_lock:
+        if _loader is None or not _loader.is_alive():
+            _loader = threading.Thread(target=_load, name='whatif-snapshot', daemon=True)
+            _loader.start()
+        return _loader
+
+
+def get_snapshot(max_age):
+    """
+    현재 snapshot 조회
+
+    - 적재된 snapshot이 없으면 진행 중인 적재 완료를 기다림 (동시 요청은 같은 적재를 대기)
+    - max_age초가 지났으면 background 재적재를 시작하고 이전 snapshot을 그대로 반환
+
+    Args:
+        max_age: snapshot 유지 시간 (초)
+
+    Returns:
+        PopulationSnapshot
+
+    Raises:
+        RuntimeError: 첫 적재 실패
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        refresh_snapshot().join()
+        snapshot = _snapshot
+        if snapshot is None:
+            raise RuntimeError("Population snapshot is not available")
+        return snapshot
+
+    if time.time() - snapshot.loaded_at >= max_age:
+        refresh_snapshot()
+    return snapshot
+
+
+def clear_snapshot():
+    """snapshot 폐기 (다음 요청에서 다시 적재)"""
+    global _snapshot
+    _snapshot = None
+
+
+def _reset_loader_after_fork():
+    """fork된 자식에는 부모의 적재 thread가 없음 (gunicorn --preload 대비)"""
+    global _loader, _loader_lock
+    _loader = None
+    _loader_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_loader_after_fork)
@@ -0,0 +1,453 @@
+"""
+위험요인 판정 규칙 (rule_version별 선언적 정의)
+
+/simulate(API)와 ETL(process_clean.py)이 같은 규칙 정의를 사용
+- RULE_DEFINITIONS: rule_version → 기준값/조건 (데이터만)
+    - 새 버전은 여기에 추가하거나 register_rules()로 등록
+      (clean_risk_result에는 버전별 결과를 함께 저장 가능: process_clean.py --side-by-side)
+    - 등록 순서 = 버전 순서 (새 버전은 항상 뒤에 추가, older_rule_versions() 기준)
+- compile_rules(): 정의 → CompiledRules
+    - evaluate(): 단일 입력 판정 (API, ETL row 엔진)
+    - evaluate_batch(): numpy 배열 판정 (API batch, ETL vectorized 엔진)
+- NULL(None/NaN) 비교는 항상 False
+- BMI는 (BMI × 10)을 round-half-even 후 / 10 (numpy.round, SQL pushdown과 동일)
+"""
+
+import copy
+import operator
+import string
+
+import numpy as np
+
+DEFAULT_RULE_VERSION = 'guideline-v1'
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<': operator.lt,
+    '==': operator.eq,
+}
+
+# risk_group 코드 순서 (0, 1, 2)
+RISK_GROUPS = (
+    'ZERO_TO_ONE_RISK_FACTOR',
+    'MULTIPLE_RISK_FACTORS',
+    'CHD_RISK_EQUIVALENT',
+)
+
+RULE_DEFINITIONS = {
+    'guideline-v1': {
+        # 필수 값 (NULL 또는 0이면 무효)
+        'required': [
+            'height', 'weight', 'systolic_bp', 'diastolic_bp',
+            'fasting_glucose', 'total_cholesterol', 'hdl_cholesterol'
+        ],
+        # 생물학적 범위 (벗어나면 무효)
+        'valid_ranges': {
+            'systolic_bp': (70, 250),
+            'diastolic_bp': (40, 150),
+            'fasting_glucose': (50, 400),
+            'total_cholesterol': (100, 400),
+        },
+        # BMI 계산 가능 범위 (벗어나면 BMI = NULL)
+        'bmi_ranges': {
+            'height': (140, 200),
+            'weight': (30, 150),
+        },
+        # 위험요인: 이름 → clean_risk_result 컬럼, 조건 (OR), 설명 문구
+        'flags': {
+            'hypertension': {
+                'column': 'flag_hypertension',
+                'any': [('systolic_bp', '>=', 140), ('diastolic_bp', '>=', 90)],
+                'explanation': 'Hypertension: SBP≥140 or DBP≥90 ({systolic_bp}/{diastolic_bp})',
+            },
+            'diabetes': {
+                'column': 'flag_diabetes',
+                'any': [('fasting_glucose', '>=', 126)],
+                'explanation': 'Diabetes: fasting glucose≥126 ({fasting_glucose})',
+            },
+            'high_total_cholesterol': {
+                'column': 'flag_tc_high',
+                'any': [('total_cholesterol', '>=', 240)],
+                'explanation': 'High TC: total cholesterol≥240 ({total_cholesterol})',
+            },
+            'high_triglycerides': {
+                'column': 'flag_tg_high',
+                'any': [('triglycerides', '>=', 200)],
+                'explanation': 'High TG: triglycerides≥200 ({triglycerides})',
+            },
+            'low_hdl': {
+                'column': 'flag_hdl_low',
+                'any': [('hdl_cholesterol', '<', 40)],
+                'explanation': 'Low HDL: hdl<40 ({hdl_cholesterol})',
+            },
+            'obesity_asia': {
+                'column': 'flag_obesity',
+                'any': [('bmi', '>=', 25)],
+                'explanation': 'Obesity(Asia): BMI≥25 ({bmi})',
+            },
+            'smoking': {
+                'column': 'flag_smoking',
+                'any': [('smoking_status', '==', 3)],  # 현재흡연자=3
+                'explanation': 'Smoking: current smoker',
+            },
+        },
+        # Risk Group (ATP III): CHD 동등 위험요인 → CHD_RISK_EQUIVALENT,
+        # 위험요인 multiple_risk_count개 이상 → MULTIPLE_RISK_FACTORS
+        'chd_equivalent': ['diabetes'],
+        'multiple_risk_count': 2,
+    },
+}
+
+
+class CompiledRules:
+    """
+    규칙 정의 1개를 판정 함수로 변환한 결과
+
+    - 단일 입력: 정의에서 Python 함수 소스를 생성해 compile
+      (조건/기준값이 상수로 들어간 if/비교문 → 판정 시 규칙 dict 순회 없음)
+    - 배열: (컬럼, 연산자 함수, 기준값) tuple로 미리 풀어 numpy 연산
+    """
+
+    def __init__(self, version, definition):
+        self.version = version
+        self.definition = definition
+
+        self.required = tuple(definition['required'])
+        self.valid_ranges = tuple(definition['valid_ranges'].items())
+        self.height_min, self.height_max = definition['bmi_ranges']['height']
+        self.weight_min, self.weight_max = definition['bmi_ranges']['weight']
+
+        flags = definition['flags']
+        self.flag_names = tuple(flags)
+        self.flag_columns = {name: spec['column'] for name, spec in flags.items()}
+        self.flag_conditions = tuple(
+            (name, tuple((column, OPERATORS[op], threshold) for column, op, threshold in spec['any']))
+            for name, spec in flags.items()
+        )
+
+        self.chd_equivalent = tuple(definition['chd_equivalent'])
+        self.multiple_risk_count = definition['multiple_risk_count']
+
+        # 판정에 필요한 입력 컬럼 (bmi는 계산값)
+        columns = dict.fromkeys([*self.required, *definition['valid_ranges'], *definition['bmi_ranges']])
+        for _, conditions in self.flag_conditions:
+            columns.update(dict.fromkeys(column for column, _, _ in conditions))
+        columns.pop('bmi', None)
+        self.input_columns = tuple(columns)
+
+        self.scalar_source = build_scalar_source(definition)
+        namespace = {'calculate_bmi': self.calculate_bmi}
+        exec(compile(self.scalar_source, f'<rules {version}>', 'exec'), namespace)
+        self.evaluate = namespace['evaluate']
+        self.explain = namespace['explain']
+
+    # ---------- 단일 입력 ----------
+    # evaluate(values) → {'bmi', 'flags': {이름: bool}, 'count', 'group'}
+    #     values: {컬럼명: 값} (smoking_status는 코드, None = NULL)
+    # explain(values, flags, bmi) → 판정된 위험요인 설명 문구 리스트
+    #     values: 입력 값 (문구에 원래 입력 그대로 표시)
+
+    def calculate_bmi(self, height, weight):
+        """
+        BMI 계산
+
+        Returns:
+            float or None: BMI (소수 첫째 자리, 계산 불가 시 None)
+        """
+        if not height or not weight:
+            return None
+        if not (self.height_min <= height <= self.height_max):
+            return None
+        if not (self.weight_min <= weight <= self.weight_max):
+            return None
+
+        height_m = height / 100.0
+        return round(weight / (height_m ** 2) * 10) / 10
+
+    def is_valid(self, values):
+        """
+        데이터 유효성 (필수 값 + 생물학적 범위)
+
+        Args:
+            values: {컬럼명: 값} (None = NULL)
+        """
+        for column in self.required:
+            if not values.get(column):
+                return False
+        for column, (low, high) in self.valid_ranges:
+            if not (low <= values[column] <= high):
+                return False
+        return True
+
+    # ---------- numpy 배열 ----------
+
+    def calculate_bmi_batch(self, height, weight):
+        """
+        BMI 계산 (배열)
+
+        Returns:
+            np.ndarray: BMI (소수 첫째 자리, 계산 불가 시 NaN)
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bmi = np.round(weight / ((height / 100.0) ** 2), 1)
+
+        in_range = (
+            (height >= self.height_min) & (height <= self.height_max)
+            & (weight >= self.weight_min) & (weight <= self.weight_max)
+        )
+        return np.where(in_range, bmi, np.nan)
+
+    def is_valid_batch(self, columns):
+        """
+        데이터 유효성 마스크
+
+        Args:
+            columns: {컬럼명: float64 배열 (NULL → NaN)}
+
+        Returns:
+            np.ndarray: bool 배열 (유효하면 True)
+        """
+        valid = np.ones(len(columns[self.required[0]]), dtype=bool)
+
+        for column in self.required:
+            values = columns[column]
+            valid &= ~np.isnan(values) & (values != 0)
+
+        for column, (low, high) in self.valid_ranges:
+            values = columns[column]
+            valid &= (values >= low) & (values <= high)
+
+        return valid
+
+    def evaluate_batch(self, columns):
+        """
+        배열 위험요인 판정 (evaluate()와 동일 결과)
+
+        Args:
+            columns: {컬럼명: float64 배열 (NULL → NaN)}
+                'bmi' 배열이 있으면 다시 계산하지 않고 사용
+
+        Returns:
+            dict: {
+                'bmi': float 배열 (NaN = NULL),
+                'flags': {이름: bool 배열},
+                'count': int16 배열,
+                'group_code': int8 배열 (RISK_GROUPS 순서),
+                'group': str 배열
+            }
+        """
+        values = dict(columns)
+        if 'bmi' not in values:
+            values['bmi'] = self.calculate_bmi_batch(columns['height'], columns['weight'])
+        n = len(values['bmi'])
+
+        # NaN 비교는 False
+        flags = {}
+        count = np.zeros(n, dtype=np.int16)
+        for name, conditions in self.flag_conditions:
+            flag = np.zeros(n, dtype=bool)
+            for column, op, threshold in conditions:
+                flag |= op(values[column], threshold)
+            flags[name] = flag
+            count += flag
+
+        chd = np.zeros(n, dtype=bool)
+        for name in self.chd_equivalent:
+            chd |= flags[name]
+
+        group_code = np.where(chd, 2, np.where(count >= self.multiple_risk_count, 1, 0)).astype(np.int8)
+
+        return {
+            'bmi': values['bmi'],
+            'flags': flags,
+            'count': count,
+            'group_code': group_code,
+            'group': np.array(RISK_GROUPS)[group_code],
+        }
+
+
+def build_scalar_source(definition):
+    """
+    규칙 정의 → 단일 입력 판정 함수 소스 (evaluate, explain)
+
+    예: hypertension → `f0 = (v0 is not None and v0 >= 140) or (v1 is not None and v1 >= 90)`
+
+    Returns:
+        str: Python 소스
+    """
+    flags = definition['flags']
+    flag_vars = {name: f'f{i}' for i, name in enumerate(flags)}
+
+    columns = {}
+    for spec in flags.values():
+        for column, op, _ in spec['any']:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            if column != 'bmi':
+                columns.setdefault(column, f'v{len(columns)}')
+    column_vars = {**columns, 'bmi': 'bmi'}
+
+    lines = [
+        'def evaluate(values):',
+        '    get = values.get',
+        "    bmi = calculate_bmi(get('height'), get('weight'))",
+    ]
+    lines += [f'    {var} = get({column!r})' for column, var in columns.items()]
+
+    for name, spec in flags.items():
+        conditions = ' or '.join(
+            f'({column_vars[column]} is not None and {column_vars[column]} {op} {threshold!r})'
+            for column, op, threshold in spec['any']
+        )
+        lines.append(f'    {flag_vars[name]} = {conditions}')
+
+    lines.append(f"    count = 0 + {' + '.join(flag_vars.values())}")
+    chd = ' or '.join(flag_vars[name] for name in definition['chd_equivalent'])
+    lines += [
+        f'    if {chd}:',
+        f'        group = {RISK_GROUPS[2]!r}',
+        f"    elif count >= {definition['multiple_risk_count']!r}:",
+        f'        group = {RISK_GROUPS[1]!r}',
+        '    else:',
+        f'        group = {RISK_GROUPS[0]!r}',
+        '    return {',
+        "        'bmi': bmi,",
+        "        'flags': {" + ', '.join(f'{name!r}: {var}' for name, var in flag_vars.items()) + '},',
+        "        'count': count,",
+        "        'group': group,",
+        '    }',
+        '',
+        'def explain(values, flags, bmi):',
+        '    explanations = []',
+    ]
+
+    # 설명 문구: '{컬럼}' 자리에 입력 값 (f-string과 같은 format(값))
+    for name, spec in flags.items():
+        parts = []
+        for literal, field, _, _ in string.Formatter().parse(spec['explanation']):
+            if literal:
+                parts.append(repr(literal))
+            if field is not None:
+                parts.append('format(bmi)' if field == 'bmi' else f'format(values[{field!r}])')
+        lines += [
+            f'    if flags[{name!r}]:',
+            f"        explanations.append({' + '.join(parts) or repr('')})",
+        ]
+    lines.append('    return explanations')
+
+    return '\n'.join(lines) + '\n'
+
+
+def compile_rules(rule_version):
+    """
+    rule_version 정의 → CompiledRules
+
+    Raises:
+        ValueError: 정의되지 않은 rule_version
+    """
+    if rule_version not in RULE_DEFINITIONS:
+        raise ValueError(f"Unknown rule_version: {rule_version}")
+    return CompiledRules(rule_version, RULE_DEFINITIONS[rule_version])
+
+
+# import 시 한 번만 컴파일
+_COMPILED = {version: compile_rules(version) for version in RULE_DEFINITIONS}
+
+
+def get_rules(rule_version=DEFAULT_RULE_VERSION):
+    """
+    컴파일된 규칙 조회
+
+    Raises:
+        ValueError: 정의되지 않은 rule_version
+    """
+    try:
+        return _COMPILED[rule_version]
+    except KeyError:
+        raise ValueError(f"Unknown rule_version: {rule_version}") from None
+
+
+def rule_versions():
+    """등록된 rule_version 목록 (등록 순서)"""
+    return list(_COMPILED)
+
+
+def older_rule_versions(rule_version):
+    """
+    rule_version보다 먼저 등록된 버전 목록 (증분 처리 시 이 버전 결과로 교체되는 대상)
+
+    나중에 등록된 버전(검토용 후보 등)과 등록되지 않은 버전은 포함하지 않음
+
+    Raises:
+        ValueError: 정의되지 않은 rule_version
+    """
+    versions = rule_versions()
+    if rule_version not in versions:
+        raise ValueError(f"Unknown rule_version: {rule_version}")
+    return versions[:versions.index(rule_version)]
+
+
+def derive_definition(base_version, thresholds):
+    """
+    기존 버전 정의에서 기준값만 바꾼 새 정의 생성 (기준값 변경 검토용)
+
+    Args:
+        base_version: 기준 rule_version
+        thresholds: {flag 이름: {컬럼: 새 기준값}}
+            예: {'diabetes': {'fasting_glucose': 110}}
+
+    Returns:
+        dict: register_rules()에 넘길 정의
+
+    Raises:
+        ValueError: 없는 버전/flag/컬럼
+    """
+    base = get_rules(base_version).definition
+    definition = copy.deepcopy(base)
+
+    for name, columns in thresholds.items():
+        if name not in definition['flags']:
+            raise ValueError(f"Unknown flag: {name}")
+        conditions = definition['flags'][name]['any']
+        known = {column for column, _, _ in conditions}
+        unknown = set(columns) - known
+        if unknown:
+            raise ValueError(f"Unknown column for {name}: {sorted(unknown)}")
+        definition['flags'][name]['any'] = [
+            (column, op, columns.get(column, threshold))
+            for column, op, threshold in conditions
+        ]
+
+    return definition
+
+
+def register_rules(rule_version, definition):
+    """
+    새 rule_version 등록 (API/ETL에서 get_rules()로 바로 사용 가능)
+
+    이미 저장된 판정 결과와 어긋나지 않도록 기존 버전은 덮어쓰지 않음
+
+    Args:
+        rule_version: clean_risk_result.rule_version에 저장될 이름 (20자 이하)
+        definition: RULE_DEFINITIONS 항목과 같은 구조 (flag 이름/컬럼은 기본 버전과 동일해야 함)
+
+    Returns:
+        CompiledRules
+
+    Raises:
+        ValueError: 이미 있는 버전, 이름 길이 초과, flag 구성이 다른 정의
+    """
+    if rule_version in _COMPILED:
+        raise ValueError(f"rule_version already registered: {rule_version}")
+    if not rule_version or len(rule_version) > 20:
+        raise ValueError("rule_version must be 1-20 characters")
+
+    default_columns = get_rules(DEFAULT_RULE_VERSION).flag_columns
+    flag_columns = {name: spec['column'] for name, spec in definition['flags'].items()}
+    if flag_columns != default_columns:
+        raise ValueError("Rule flags must match clean_risk_result flag columns")
+
+    compiled = CompiledRules(rule_version, definition)
+    RULE_DEFINITIONS[rule_version] = definition
+    _COMPILED[rule_version] = compiled
+    return compiled
@@ -0,0 +1,299 @@
+"""
+/simulate 입력 검증 (요청 전에 한 번 compile)
+
+검증 범위는 판정 규칙(app/services/rules.py)과 같은 정의를 사용
+- 생물학적 범위: rules.valid_ranges (ETL 유효성 판정과 동일)
+- 신장/체중: rules.bmi_ranges (BMI 계산 범위와 동일)
+- API 전용 필드/범위: API_RANGES (age_group, gender 등 판정 규칙에 없는 범위)
+
+타입 변환
+- 숫자: int/float 그대로, 숫자 문자열("170", "36.5")은 숫자로 변환, bool은 오류
+- smoking_status: 앞뒤 공백 제거 + 소문자 ("Current" → "current")
+
+오류 형식
+- message + details ({필드: 메시지}, 기존 응답과 동일)
+- errors: [{'field', 'code', 'message'}] (code: body, missing, type, range, choice)
+
+validate(): 단일 요청 / validate_many(): 배치 요청 (컬럼 단위 타입/범위 검사, numpy)
+"""
+
+import numpy as np
+
+# 필수 필드 (응답 input 섹션 포함 순서)
+REQUIRED_FIELDS = (
+    'age_group', 'gender', 'height', 'weight',
+    'systolic_bp', 'diastolic_bp', 'fasting_glucose',
+    'total_cholesterol', 'triglycerides', 'hdl_cholesterol',
+    'smoking_status'
+)
+
+# 판정 규칙에 없는 API 입력 범위
+# age_group 5-18: 국민건강보험공단 CSV 데이터에서 실제 존재하는 범위
+# - 5 = 25-29세, 6 = 30-34세, ..., 18 = 90세 초과
+API_RANGES = {
+    'age_group': (5, 18),
+    'gender': (1, 2),
+    'triglycerides': (30, 500),
+    'hdl_cholesterol': (20, 100),
+}
+
+# 흡연 상태 → raw_health_check.smoking_status 코드
+SMOKING_CODES = {'never': 1, 'former': 2, 'current': 3}
+
+_NUMBER_TYPES = {int, float}
+
+
+def input_ranges(rules):
+    """
+    숫자 필드 → (최소, 최대) (판정 규칙 범위 + API 전용 범위)
+
+    Returns:
+        dict: REQUIRED_FIELDS 순서
+    """
+    ranges = {
+        **API_RANGES,
+        **dict(rules.valid_ranges),
+        'height': (rules.height_min, rules.height_max),
+        'weight': (rules.weight_min, rules.weight_max),
+    }
+    return {field: ranges[field] for field in REQUIRED_FIELDS if field in ranges}
+
+
+def coerce_number(value):
+    """
+    숫자 변환
+
+    Returns:
+        int/float, 변환할 수 없으면 None
+    """
+    if type(value) in _NUMBER_TYPES:
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+def to_float(value):
+    """float 변환 (float 범위를 넘는 정수는 inf → 범위 오류)"""
+    try:
+        return float(value)
+    except OverflowError:
+        return float('inf') if value > 0 else float('-inf')
+
+
+def coerce_smoking(value):
+    """흡연 상태 정규화 (허용 값이 아니면 None)"""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in SMOKING_CODES:
+            return value
+    return None
+
+
+def error(field, code, message):
+    """구조화된 오류 항목"""
+    return {'field': field, 'code': code, 'message': message}
+
+
+def error_response(message, errors):
+    """
+    오류 항목 → 응답 형식
+
+    Returns:
+        dict: {'message', 'details': {필드: 메시지}, 'errors': [...]}
+    """
+    return {
+        'message': message,
+        'details': {item['field']: item['message'] for item in errors},
+        'errors': errors,
+    }
+
+
+class InputValidator:
+    """판정 규칙 1개 기준 /simulate 입력 검증기 (필드/범위/메시지를 미리 계산)"""
+
+    def __init__(self, rules):
+        self.rule_version = rules.version
+        self.required = frozenset(REQUIRED_FIELDS)
+        self.numeric = tuple(
+            (field, low, high, f"Must be between {low} and {high}")
+            for field, (low, high) in input_ranges(rules).items()
+        )
+        self.smoking_message = "Must be 'never', 'former', or 'current'"
+
+    def check_structure(self, data):
+        """
+        객체 여부 + 필수 필드
+
+        Returns:
+            dict or None: error_response() 형식 (정상이면 None)
+        """
+        if not isinstance(data, dict):
+            return {
+                'message': 'Request body must be a JSON object',
+                'details': {},
+                'errors': [error(None, 'body', 'Request body must be a JSON object')],
+            }
+
+        if self.required.issubset(data.keys()):
+            return None
+
+        missing = [field for field in REQUIRED_FIELDS if field not in data]
+        return {
+            'message': 'Missing required fields',
+            'details': {'missing': missing},
+            'errors': [error(field, 'missing', 'Field is required') for field in missing],
+        }
+
+    def validate(self, data):
+        """
+        단일 입력 검증 + 타입 변환
+
+        Args:
+            data: 요청 JSON
+
+        Returns:
+            tuple: (변환된 입력 dict, None) 또는 (None, error_response() 형식)
+        """
+        invalid = self.check_structure(data)
+        if invalid:
+            return None, invalid
+
+        values = dict(data)
+        errors = []
+        for field, low, high, range_message in self.numeric:
+            value = coerce_number(data[field])
+            if value is None:
+                errors.append(error(field, 'type', 'Must be a number'))
+            elif not (low <= value <= high):
+                errors.append(error(field, 'range', range_message))
+            else:
+                values[field] = value
+
+        smoking = coerce_smoking(data['smoking_status'])
+        if smoking is None:
+            errors.append(error('smoking_status', 'choice', self.smoking_message))
+        else:
+            values['smoking_status'] = smoking
+
+        if errors:
+            return None, error_response('Invalid input data', errors)
+        return values, None
+
+    def validate_many(self, items):
+        """
+        배치 입력 검증 + 타입 변환 (필드별 컬럼 단위)
+
+        - 컬럼 값이 모두 int/float이면 numpy로 범위 검사 (항목별 Python 비교 없음)
+        - 문자열 등이 섞인 컬럼만 값 단위 변환
+
+        Args:
+            items: 요청 JSON 항목 리스트
+
+        Returns:
+            tuple: (
+                유효 항목 위치 리스트,
+                유효 항목 변환된 입력 dict 리스트,
+                유효 항목 컬럼 {필드: float64 배열} (smoking_status는 코드),
+                {위치: error_response() 형식}
+            )
+        """
+        required = self.required
+        invalid = {}
+        positions = []
+        for position, item in enumerate(items):
+            structure_error = None
+            if not (type(item) is dict and required.issubset(item.keys())):
+                structure_error = self.check_structure(item)
+            if structure_error:
+                invalid[position] = structure_error
+            else:
+                positions.append(position)
+
+        field_errors = {}
+        converted = {}
+        columns = {}
+
+        for field, low, high, range_message in self.numeric:
+            raw = [items[position][field] for position in positions]
+
+            if set(map(type, raw)) <= _NUMBER_TYPES:
+                try:
+                    values = np.array(raw, dtype=np.float64)
+                except OverflowError:
+                    values = np.array([to_float(value) for value in raw], dtype=np.float64)
+                failed = np.zeros(len(raw), dtype=bool)
+            else:
+                coerced = [coerce_number(value) for value in raw]
+                failed = np.array([value is None for value in coerced], dtype=bool)
+                values = np.array(
+                    [np.nan if value is None else to_float(value) for value in coerced],
+                    dtype=np.float64
+                )
+                for j in np.flatnonzero(failed).tolist():
+                    field_errors.setdefault(j, []).append(error(field, 'type', 'Must be a number'))
+                for j, (before, after) in enumerate(zip(raw, coerced)):
+                    if after is not None and before is not after:
+                        converted.setdefault(j, {})[field] = after
+
+            with np.errstate(invalid='ignore'):
+                out_of_range = ~((values >= low) & (values <= high)) & ~failed
+            for j in np.flatnonzero(out_of_range).tolist():
+                field_errors.setdefault(j, []).append(error(field, 'range', range_message))
+
+            columns[field] = values
+
+        # 흡연 상태: 정확히 일치하는 값은 dict 조회, 나머지만 정규화
+        raw = [items[position]['smoking_status'] for position in positions]
+        codes = [SMOKING_CODES.get(value) if type(value) is str else None for value in raw]
+        for j in [j for j, code in enumerate(codes) if code is None]:
+            smoking = coerce_smoking(raw[j])
+            if smoking is None:
+                field_errors.setdefault(j, []).append(
+                    error('smoking_status', 'choice', self.smoking_message)
+                )
+                continue
+            converted.setdefault(j, {})['smoking_status'] = smoking
+            codes[j] = SMOKING_CODES[smoking]
+        smoking_codes = np.array(codes, dtype=np.float64)  # 오류 항목은 NaN
+        columns['smoking_status'] = smoking_codes
+
+        # 유효 항목만 남기기
+        keep = [j for j in range(len(positions)) if j not in field_errors]
+        for j, errors in field_errors.items():
+            invalid[positions[j]] = error_response('Invalid input data', errors)
+
+        valid_positions = [positions[j] for j in keep]
+        values_list = [
+            {**items[positions[j]], **converted[j]} if j in converted else items[positions[j]]
+            for j in keep
+        ]
+        if len(keep) < len(positions):
+            columns = {field: values[keep] for field, values in columns.items()}
+
+        return valid_positions, values_list, columns, invalid
+
+
+_VALIDATORS = {}
+
+
+def get_validator(rules):
+    """
+    판정 규칙별 검증기 (rule_version별 1회 생성)
+
+    Returns:
+        InputValidator
+    """
+    validator = _VALIDATORS.get(rules.version)
+    if validator is None:
+        validator = InputValidator(rules)
+        _VALIDATORS[rules.version] = validator
+    return validator
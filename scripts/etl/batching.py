@@ -0,0 +1,47 @@
+"""
+Keyset(id 범위) 기반 batch 조회
+
+OFFSET 페이징 대신 `WHERE id > last_id ORDER BY id LIMIT n`으로 조회
+- PK 인덱스 range scan → batch마다 앞쪽 행을 다시 읽지 않음 (O(n))
+- id 순서로 조회 → batch 순서 고정
+"""
+
+
+def iter_keyset_batches(db, key_column, columns, batch_size, start_id=0, end_id=None,
+                        base_query=None):
+    """
+    id 범위 단위로 batch 조회 (streaming)
+
+    Args:
+        db: SQLAlchemy Session
+        key_column: 정렬/범위 기준 컬럼 (예: RawHealthCheck.id)
+        columns: 조회 대상 (컬럼 리스트 또는 [모델]), key_column 포함
+        batch_size: batch당 최대 행 수
+        start_id: 이 값 초과부터 조회 (exclusive)
+        end_id: 이 값 이하까지 조회 (inclusive, None이면 끝까지)
+        base_query: join/filter가 적용된 Query (None이면 db.query(*columns))
+
+    Yields:
+        list: batch 행 리스트 (key_column 오름차순)
+
+    Usage:
+        for batch in iter_keyset_batches(db, RawHealthCheck.id, [RawHealthCheck], 1000):
+            ...
+    """
+    if base_query is None:
+        base_query = db.query(*columns)
+
+    last_id = start_id
+
+    while True:
+        query = base_query.filter(key_column > last_id)
+        if end_id is not None:
+            query = query.filter(key_column <= end_id)
+
+        batch = query.order_by(key_column).limit(batch_size).all()
+        if not batch:
+            return
+
+        yield batch
+
+        last_id = getattr(batch[-1], key_column.key)
@@ -0,0 +1,36 @@
+"""
+ETL 완료 후 API 캐시 무효화
+
+Redis data generation 증가 → /stats 캐시 키가 모두 바뀜
+- 이전 generation 항목은 'stats' tag set으로 찾아 chunk 단위 UNLINK (TTL 만료까지 남지 않음)
+- REDIS_URL 미설정/연결 실패 시 생략 (ETL 결과에는 영향 없음)
+"""
+
+from app.cache import invalidate_data
+
+STATS_CACHE_TAG = 'stats'
+
+
+def invalidate_api_cache(redis_url, chunk_size):
+    """
+    data generation 증가 + 'stats' tag 항목 삭제
+
+    Args:
+        redis_url: REDIS_URL 설정값 (None이면 생략)
+        chunk_size: CACHE_INVALIDATE_CHUNK 설정값 (UNLINK 1회당 키 수)
+
+    Returns:
+        int or None: 새 generation (생략 시 None)
+    """
+    try:
+        result = invalidate_data(redis_url, (STATS_CACHE_TAG,), chunk_size)
+    except Exception as e:
+        print(f"   ⚠️  API cache invalidation skipped: {e}")
+        return None
+
+    if result is None:
+        return None
+
+    generation, deleted = result
+    print(f"   🔄 API cache generation → {generation} ({deleted:,} stale keys removed)")
+    return generation
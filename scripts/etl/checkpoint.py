@@ -0,0 +1,106 @@
+"""
+ETL 체크포인트
+
+etl_checkpoint 테이블에 단계별 마지막 커밋 위치 저장/조회
+- 호출자의 트랜잭션(Connection/Session) 안에서 실행 → 데이터와 원자적으로 커밋
+"""
+
+from sqlalchemy import select, insert, update, delete, or_
+
+from app.models.etl_checkpoint import EtlCheckpoint
+
+checkpoint_table = EtlCheckpoint.__table__
+
+
+def get_checkpoint(conn, stage):
+    """
+    체크포인트 조회
+
+    Args:
+        conn: SQLAlchemy Connection 또는 Session
+        stage: 단계 이름
+
+    Returns:
+        dict or None: {'last_chunk', 'last_id', 'rows_done'}
+    """
+    row = conn.execute(
+        select(
+            checkpoint_table.c.last_chunk,
+            checkpoint_table.c.last_id,
+            checkpoint_table.c.rows_done,
+        ).where(checkpoint_table.c.stage == stage)
+    ).first()
+
+    return dict(row._mapping) if row else None
+
+
+def save_checkpoint(conn, stage, **values):
+    """
+    체크포인트 저장 (없으면 생성)
+
+    커밋은 호출자가 데이터와 함께 수행
+
+    Args:
+        conn: SQLAlchemy Connection 또는 Session
+        stage: 단계 이름
+        **values: last_chunk, last_id, rows_done
+    """
+    result = conn.execute(
+        update(checkpoint_table)
+        .where(checkpoint_table.c.stage == stage)
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(checkpoint_table).values(stage=stage, **values))
+
+
+def list_checkpoint_stages(conn, stage, all_versions=False):
+    """
+    stage 및 하위 stage('{stage}:...') 체크포인트 이름 목록
+
+    Args:
+        conn: SQLAlchemy Connection 또는 Session
+        stage: 단계 이름
+        all_versions: True면 버전별 stage('{stage}@{버전}', '{stage}@{버전}:...')도 포함
+
+    Returns:
+        list[str]: stage 이름 리스트
+    """
+    return list(conn.execute(
+        select(checkpoint_table.c.stage).where(_stage_condition(stage, all_versions))
+    ).scalars())
+
+
+def clear_checkpoints(conn, stage, all_versions=False):
+    """
+    stage 및 하위 stage('{stage}:...') 체크포인트 삭제 (새 실행 시작 시)
+
+    Args:
+        conn: SQLAlchemy Connection 또는 Session
+        stage: 단계 이름
+        all_versions: True면 버전별 stage('{stage}@{버전}', '{stage}@{버전}:...')도 삭제
+            (raw id가 바뀌는 재적재 후 모든 판정 체크포인트 무효화용)
+
+    Returns:
+        int: 삭제된 체크포인트 수
+    """
+    return conn.execute(
+        delete(checkpoint_table).where(_stage_condition(stage, all_versions))
+    ).rowcount
+
+
+def _escape_like(value):
+    """LIKE 패턴 문자(%, _) escape (escape 문자 '\\')"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _stage_condition(stage, all_versions=False):
+    """stage 이름 매칭 조건 (stage 이름의 '_'/'%'는 문자 그대로 비교)"""
+    prefix = _escape_like(stage)
+    conditions = [
+        checkpoint_table.c.stage == stage,
+        checkpoint_table.c.stage.like(f'{prefix}:%', escape='\\'),
+    ]
+    if all_versions:
+        conditions.append(checkpoint_table.c.stage.like(f'{prefix}@%', escape='\\'))
+    return or_(*conditions)
@@ -3,30 +3,96 @@ ETL Step 1: CSV → raw_health_check
 
 국민건강보험공단 건강검진 CSV를 MySQL raw 테이블에 적재
 - Chunk 기반 처리 (메모리 제어)
+- 모델 기준 명시적 dtype (nullable Int16, 코드 컬럼은 category) → float64/object 변환 없음
+- pyarrow 설치 시 pyarrow CSV reader로 파싱
 - 처리속도 측정
+- 적재 방식 선택 (--loader)
+  - to_sql: chunk마다 다중 INSERT
+  - bulk: UTF-8 TSV staging 파일 → DB bulk load (MySQL LOAD DATA LOCAL INFILE)
+  - upsert: 자연키(reference_year, subscriber_id) 기준 INSERT/UPDATE (TRUNCATE 없이 재적재)
+- 적재 행 수 체크포인트 저장 → --resume으로 중단 지점부터 재개
+- reader thread가 다음 chunk를 파싱/변환하는 동안 DB 기록 (pipeline.py)
 """
 
 import sys
 import os
+import csv
 import time
+import argparse
+import tempfile
 from pathlib import Path
 
 # 프로젝트 루트 경로를 sys.path에 추가
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import text
-from app.database import engine, init_db
+from sqlalchemy import text, insert, update, delete, select, bindparam, SmallInteger, String
+from sqlalchemy.exc import IntegrityError
+from app.database import engine, init_db, create_db_engine
+from app.models.health_check import RawHealthCheck, CleanRiskResult
 from app.config import get_config
+from scripts.etl.cache import invalidate_api_cache
+from scripts.etl.checkpoint import get_checkpoint, save_checkpoint, clear_checkpoints
+from scripts.etl.pipeline import iter_pipelined, print_stage_report
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # 선택 의존성 (없으면 pandas C parser 사용)
+    pa = None
 
 # 설정
 config = get_config()
 CHUNK_SIZE = config.ETL_CHUNK_SIZE  # 10,000 rows
+PIPELINE_DEPTH = 2  # reader가 미리 읽어 둘 최대 chunk 수 (0이면 순차 실행)
 
 # CSV 파일 경로 (프로젝트 루트)
 CSV_FILE = project_root / "국민건강보험공단_건강검진정보_2024.CSV"
 
+# 컬럼 매핑 (CSV → DB)
+COLUMN_MAPPING = {
+    '기준년도': 'reference_year',
+    '가입자일련번호': 'subscriber_id',
+    '시도코드': 'province_code',
+    '성별코드': 'gender_code',
+    '연령대코드(5세단위)': 'age_group_code',
+    '신장(5cm단위)': 'height',
+    '체중(5kg단위)': 'weight',
+    '허리둘레': 'waist_circumference',
+    '수축기혈압': 'systolic_bp',
+    '이완기혈압': 'diastolic_bp',
+    '식전혈당(공복혈당)': 'fasting_glucose',
+    '총콜레스테롤': 'total_cholesterol',
+    '트리글리세라이드': 'triglycerides',
+    'HDL콜레스테롤': 'hdl_cholesterol',
+    'LDL콜레스테롤': 'ldl_cholesterol',
+    '흡연상태': 'smoking_status',
+}
+
+# DB 컬럼 순서 (staging 파일 컬럼 순서)
+RAW_COLUMNS = list(COLUMN_MAPPING.values())
+
+# 자연키 (같은 기준년도의 같은 가입자 = 같은 검진 기록)
+NATURAL_KEY = ['reference_year', 'subscriber_id']
+NATURAL_KEY_INDEX = 'uq_raw_natural_key'
+
+# 코드 컬럼 (값 종류가 적음 → category, 1 byte 코드로 저장)
+CATEGORY_COLUMNS = ['province_code', 'gender_code', 'age_group_code', 'smoking_status']
+
+# CSV 파서 ('pyarrow': 설치 시 기본, 'c': pandas C parser)
+CSV_ENGINE = 'pyarrow' if pa is not None else 'c'
+
+# 문자열 컬럼 dtype (pyarrow 설치 시 Python 객체 대신 Arrow 버퍼에 저장)
+STRING_DTYPE = pd.StringDtype('pyarrow' if pa is not None else 'python')
+
+# MySQL LOAD DATA의 NULL 표기
+NULL_MARKER = '\\N'
+
+# 체크포인트 stage (rows_done = 적재 완료된 CSV 행 수)
+CHECKPOINT_STAGE = 'load_raw'
+
 
 def validate_csv():
     """CSV 파일 존재 확인"""
@@ -36,75 +102,560 @@ def validate_csv():
     print(f"✅ CSV file found: {CSV_FILE}")
 
 
-def load_csv_to_raw():
+def build_raw_schema(model=RawHealthCheck):
     """
-    CSV → raw_health_check 테이블 적재
+    모델 컬럼 타입 → DataFrame dtype
+
+    - SmallInteger → Int16 (nullable: NaN이 있어도 float64로 바뀌지 않음, 2 byte + mask)
+    - String → string (STRING_DTYPE)
+
+    Args:
+        model: 적재 대상 모델
 
     Returns:
-        tuple: (총 처리 행 수, 처리 시간(초))
+        dict: {DB 컬럼명: pandas dtype} (RAW_COLUMNS 순서)
     """
-    start_time = time.time()
-    total_rows = 0
+    table = model.__table__
+    schema = {}
 
-    print(f"\n📊 Starting ETL: CSV → raw_health_check")
-    print(f"   🔥 Chunk size: {CHUNK_SIZE:,} rows")
-    print(f"   Encoding: cp949\n")
-
-    # 컬럼 매핑 (CSV → DB)
-    column_mapping = {
-        '기준년도': 'reference_year',
-        '가입자일련번호': 'subscriber_id',
-        '시도코드': 'province_code',
-        '성별코드': 'gender_code',
-        '연령대코드(5세단위)': 'age_group_code',
-        '신장(5cm단위)': 'height',
-        '체중(5kg단위)': 'weight',
-        '허리둘레': 'waist_circumference',
-        '수축기혈압': 'systolic_bp',
-        '이완기혈압': 'diastolic_bp',
-        '식전혈당(공복혈당)': 'fasting_glucose',
-        '총콜레스테롤': 'total_cholesterol',
-        '트리글리세라이드': 'triglycerides',
-        'HDL콜레스테롤': 'hdl_cholesterol',
-        'LDL콜레스테롤': 'ldl_cholesterol',
-        '흡연상태': 'smoking_status',
+    for column in RAW_COLUMNS:
+        column_type = table.c[column].type
+        if isinstance(column_type, SmallInteger):
+            schema[column] = pd.Int16Dtype()
+        elif isinstance(column_type, String):
+            schema[column] = STRING_DTYPE
+        else:
+            raise TypeError(f"Unsupported column type for {column}: {column_type}")
+
+    return schema
+
+
+RAW_SCHEMA = build_raw_schema()
+
+
+def read_csv_chunks(csv_path=CSV_FILE, skip_rows=0, csv_engine=None):
+    """
+    CSV를 chunk 단위로 파싱 (필요한 컬럼만)
+
+    Args:
+        csv_path: CSV 파일 경로
+        skip_rows: 건너뛸 데이터 행 수 (재개 시 이미 적재된 행, 헤더 제외)
+        csv_engine: 'pyarrow' 또는 'c' (None이면 CSV_ENGINE)
+
+    Yields:
+        DataFrame: CSV 컬럼명 그대로인 chunk (prepare_chunk()로 변환)
+    """
+    if (csv_engine or CSV_ENGINE) == 'pyarrow':
+        yield from _read_csv_chunks_pyarrow(csv_path, skip_rows)
+        return
+
+    # C parser: 문자열 컬럼만 dtype 지정
+    # (정수 컬럼에 Int16을 지정하면 문자열 → 객체 변환 경로로 파싱되어 수 배 느림
+    #  → 기본 숫자 파싱 후 prepare_chunk()에서 Int16으로 변환)
+    string_columns = {
+        csv_column: dtype
+        for csv_column, column in COLUMN_MAPPING.items()
+        if isinstance(dtype := RAW_SCHEMA[column], pd.StringDtype)
     }
 
-    # Chunk 단위로 CSV 읽기
-    chunk_num = 0
-    for chunk in pd.read_csv(
-        CSV_FILE,
+    yield from pd.read_csv(
+        csv_path,
         encoding='cp949',
         chunksize=CHUNK_SIZE,
-        usecols=column_mapping.keys()  # 필요한 컬럼만 읽기
-    ):
-        chunk_num += 1
-        chunk_start = time.time()
+        usecols=COLUMN_MAPPING.keys(),  # 필요한 컬럼만 읽기
+        dtype=string_columns,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None  # 헤더(0행)는 유지
+    )
+
+
+def _read_csv_chunks_pyarrow(csv_path, skip_rows=0):
+    """
+    pyarrow streaming CSV reader로 파싱 (multi-thread, CHUNK_SIZE 행 단위로 재분할)
+
+    - pandas의 pyarrow engine은 chunksize를 지원하지 않아 pyarrow.csv를 직접 사용
+    - 정수 컬럼은 float32로 파싱 ('81.0' 같은 표기 허용) → prepare_chunk()에서 Int16 변환
+    """
+    pandas_types = {pa.string(): STRING_DTYPE}
+
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(encoding='cp949', skip_rows_after_names=skip_rows),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(COLUMN_MAPPING),
+            column_types={
+                csv_column: pa.float32() if isinstance(RAW_SCHEMA[column], pd.Int16Dtype)
+                else pa.string()
+                for csv_column, column in COLUMN_MAPPING.items()
+            },
+        ),
+    )
+
+    def to_pandas(table):
+        return table.to_pandas(types_mapper=pandas_types.get)
+
+    pending = []
+    pending_rows = 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+
+        while pending_rows >= CHUNK_SIZE:
+            table = pa.Table.from_batches(pending)
+            yield to_pandas(table.slice(0, CHUNK_SIZE))
+
+            rest = table.slice(CHUNK_SIZE)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+
+    if pending_rows:
+        yield to_pandas(pa.Table.from_batches(pending))
+
+
+def to_nullable_int16(values):
+    """
+    숫자 Series → Int16 배열 (NaN → NA, 소수는 반올림)
+
+    astype('Int16')의 값별 검사 대신 numpy 배열 연산으로 변환
+    - int16 범위를 벗어난 값은 cast 전에 검사 (astype(np.int16)은 조용히 wrap-around)
+
+    Returns:
+        IntegerArray: Int16 배열
+
+    Raises:
+        ValueError: int16 범위를 벗어난 값이 있을 때
+    """
+    if values.dtype == pd.Int16Dtype():
+        return values.array
+
+    array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    mask = np.isnan(array)
+    rounded = np.floor(np.where(mask, 0, array) + 0.5)  # DB와 같은 half-up
+
+    limits = np.iinfo(np.int16)
+    out_of_range = (rounded < limits.min) | (rounded > limits.max)
+    if out_of_range.any():
+        positions = np.flatnonzero(out_of_range)
+        raise ValueError(
+            f"{values.name}: {len(positions):,} value(s) outside int16 range "
+            f"[{limits.min}, {limits.max}] (first at row {values.index[positions[0]]}: "
+            f"{array[positions[0]]})"
+        )
+
+    return pd.arrays.IntegerArray(rounded.astype(np.int16), mask)
+
+
+def prepare_chunk(chunk):
+    """
+    파싱된 chunk → DB 컬럼명/순서, RAW_SCHEMA dtype, 코드 컬럼 category
+
+    - 컬럼 배열을 모아 DataFrame을 한 번에 생성 (컬럼별 대입/복사 비용 회피)
+    - NULL은 pd.NA 유지 (to_sql, to_csv(na_rep)가 직접 처리 → object 변환 불필요)
+
+    Returns:
+        DataFrame: 컬럼명이 DB 컬럼명(RAW_COLUMNS 순서)인 chunk
+    """
+    columns = {}
+
+    for csv_column, column in COLUMN_MAPPING.items():
+        dtype = RAW_SCHEMA[column]
+        if isinstance(dtype, pd.Int16Dtype):
+            values = to_nullable_int16(chunk[csv_column])
+        else:
+            values = chunk[csv_column].astype(dtype).array
+
+        if column in CATEGORY_COLUMNS:
+            values = pd.Categorical(values)
+
+        columns[column] = values
+
+    return pd.DataFrame(columns, index=chunk.index, copy=False)
 
-        # 컬럼명 변경
-        chunk = chunk.rename(columns=column_mapping)
 
-        # NULL 처리 (pandas NaN → None)
-        chunk = chunk.where(pd.notnull(chunk), None)
+def get_resume_rows(db_engine=engine):
+    """
+    체크포인트 기준 이미 적재된 CSV 행 수
+
+    Returns:
+        int: 적재 완료 행 수 (체크포인트 없으면 0)
+    """
+    with db_engine.connect() as conn:
+        checkpoint = get_checkpoint(conn, CHECKPOINT_STAGE)
+
+    if checkpoint is None:
+        return 0
+
+    print(f"   ⏩ Resuming after {checkpoint['rows_done']:,} rows "
+          f"(chunk {checkpoint['last_chunk']})")
+    return checkpoint['rows_done']
+
+
+def save_load_checkpoint(conn, rows_done):
+    """
+    적재 체크포인트 저장 (데이터와 같은 트랜잭션)
+
+    Args:
+        conn: 적재에 사용 중인 Connection
+        rows_done: 적재 완료된 CSV 행 수 (누적)
+    """
+    save_checkpoint(
+        conn, CHECKPOINT_STAGE,
+        last_chunk=-(-rows_done // CHUNK_SIZE),  # 올림 나눗셈
+        rows_done=rows_done
+    )
+
+
+def ensure_natural_key_index(db_engine=engine):
+    """
+    자연키 unique index 생성 (없을 때만)
 
-        # MySQL에 삽입
-        chunk.to_sql(
-            'raw_health_check',
-            con=engine,
-            if_exists='append',  # 기존 데이터에 추가
-            index=False,  # DataFrame 인덱스 제외
-            method='multi'  # 다중 INSERT (성능 개선)
+    create_all()은 기존 테이블에 index를 추가하지 않으므로 적재 전에 확인
+
+    Returns:
+        bool: index 사용 가능하면 True (기존 중복 데이터로 생성 실패 시 False)
+    """
+    index = next(
+        index for index in RawHealthCheck.__table__.indexes
+        if index.name == NATURAL_KEY_INDEX
+    )
+    try:
+        index.create(db_engine, checkfirst=True)
+    except IntegrityError:
+        return False
+    return True
+
+
+def chunk_to_records(chunk):
+    """
+    chunk → INSERT/비교용 dict 리스트 (NA → None, Python 기본 타입)
+
+    Returns:
+        list[dict]: {DB 컬럼명: 값}
+    """
+    frame = chunk.astype(object)
+    return frame.where(frame.notna(), None).to_dict('records')
+
+
+def upsert_chunk(conn, chunk):
+    """
+    자연키(reference_year, subscriber_id) 기준 upsert (호출자 트랜잭션)
+
+    - 신규 키 → INSERT
+    - 기존 키 + 값 변경 → UPDATE (id 유지) + 기존 판정 결과 삭제
+      (process_clean.py --incremental이 해당 레코드만 재판정)
+    - 기존 키 + 값 동일 → 건너뜀
+    - chunk 내 같은 키 → 마지막 행 사용
+    - subscriber_id가 없는 행 → 키가 없으므로 INSERT
+
+    Args:
+        conn: SQLAlchemy Connection
+        chunk: prepare_chunk() 결과
+
+    Returns:
+        dict: {'inserted', 'updated', 'unchanged', 'duplicates'} 행 수
+    """
+    table = RawHealthCheck.__table__
+
+    keyed = {}
+    unkeyed = []
+    records = chunk_to_records(chunk)
+    for record in records:
+        if record['subscriber_id'] is None:
+            unkeyed.append(record)
+        else:
+            keyed[tuple(record[column] for column in NATURAL_KEY)] = record
+
+    # 기존 행 조회 (자연키 index prefix 사용, 정확한 키 일치는 dict로 확인)
+    existing = {}
+    if keyed:
+        years = {year for year, _ in keyed}
+        subscriber_ids = [subscriber_id for _, subscriber_id in keyed]
+        rows = conn.execute(
+            select(table.c.id, *[table.c[column] for column in RAW_COLUMNS]).where(
+                table.c.reference_year.in_(years),
+                table.c.subscriber_id.in_(subscriber_ids)
+            )
+        )
+        for row in rows:
+            key = (row.reference_year, row.subscriber_id)
+            if key in keyed:
+                existing[key] = row
+
+    inserts = unkeyed + [record for key, record in keyed.items() if key not in existing]
+    updates = []
+    unchanged = 0
+    for key, row in existing.items():
+        record = keyed[key]
+        if tuple(row)[1:] == tuple(record[column] for column in RAW_COLUMNS):
+            unchanged += 1
+        else:
+            updates.append({**record, 'target_id': row.id})
+
+    if inserts:
+        conn.execute(insert(table), inserts)
+
+    if updates:
+        # SET 절은 파라미터 키(컬럼명)로 생성
+        conn.execute(update(table).where(table.c.id == bindparam('target_id')), updates)
+        conn.execute(
+            delete(CleanRiskResult.__table__).where(
+                CleanRiskResult.raw_id.in_([record['target_id'] for record in updates])
+            )
         )
 
+    return {
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'unchanged': unchanged,
+        'duplicates': len(records) - len(keyed) - len(unkeyed),
+    }
+
+
+def load_csv_to_raw(csv_path=CSV_FILE, db_engine=engine, resume=False,
+                    pipeline_depth=PIPELINE_DEPTH, upsert=False):
+    """
+    CSV → raw_health_check 테이블 적재 (to_sql 다중 INSERT 또는 자연키 upsert)
+
+    - reader thread: CSV 파싱 + 컬럼 변환 (최대 pipeline_depth chunk 선행)
+    - writer (현재 thread): chunk마다 적재 + 체크포인트를 한 트랜잭션으로 커밋
+
+    Args:
+        csv_path: CSV 파일 경로
+        db_engine: 적재 대상 engine
+        resume: True면 체크포인트 이후 행부터 적재
+        pipeline_depth: 미리 읽어 둘 chunk 수 (0이면 순차 실행)
+        upsert: True면 upsert_chunk()로 기록 (기존 데이터 유지, 재실행 안전)
+
+    Returns:
+        tuple: (이번 실행의 처리 행 수, 처리 시간(초))
+    """
+    start_time = time.time()
+    total_rows = 0
+    stage_times = {'read': 0.0, 'transform': 0.0, 'write': 0.0, 'wait': 0.0}
+    upsert_counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0}
+
+    print(f"\n📊 Starting ETL: CSV → raw_health_check{' (upsert)' if upsert else ''}")
+    print(f"   🔥 Chunk size: {CHUNK_SIZE:,} rows | Pipeline depth: {pipeline_depth}")
+    print(f"   Encoding: cp949 | Parser: {CSV_ENGINE}\n")
+
+    rows_before = get_resume_rows(db_engine) if resume else 0
+
+    # Chunk 단위로 CSV 읽기 (reader thread에서 선행)
+    chunk_num = -(-rows_before // CHUNK_SIZE)
+    chunks = iter_pipelined(
+        read_csv_chunks(csv_path, skip_rows=rows_before), prepare_chunk, pipeline_depth
+    )
+    for chunk, timing in chunks:
+        chunk_num += 1
+        write_start = time.perf_counter()
+
         chunk_rows = len(chunk)
         total_rows += chunk_rows
-        chunk_time = time.time() - chunk_start
 
-        print(f"   Chunk {chunk_num}: {chunk_rows:,} rows | {chunk_time:.2f}s | {chunk_rows/chunk_time:.0f} rows/s")
+        # MySQL에 삽입 (체크포인트와 같은 트랜잭션)
+        with db_engine.begin() as conn:
+            if upsert:
+                for name, count in upsert_chunk(conn, chunk).items():
+                    upsert_counts[name] += count
+            else:
+                chunk.to_sql(
+                    'raw_health_check',
+                    con=conn,
+                    if_exists='append',  # 기존 데이터에 추가
+                    index=False,  # DataFrame 인덱스 제외
+                    method='multi'  # 다중 INSERT (성능 개선)
+                )
+            save_load_checkpoint(conn, rows_before + total_rows)
+
+        write_time = time.perf_counter() - write_start
+        timing['write'] = write_time
+        for stage, seconds in timing.items():
+            stage_times[stage] += seconds
+
+        # chunk 처리 시간 = reader 대기 + 기록 (파싱/변환은 기록과 겹쳐 실행)
+        chunk_time = timing['wait'] + write_time
+
+        print(f"   Chunk {chunk_num}: {chunk_rows:,} rows | {chunk_time:.2f}s | "
+              f"{chunk_rows/chunk_time if chunk_time > 0 else 0:.0f} rows/s | "
+              f"read {timing['read']:.2f}s, transform {timing['transform']:.2f}s, "
+              f"write {write_time:.2f}s")
+
+    elapsed_time = time.time() - start_time
+    throughput = total_rows / elapsed_time if elapsed_time > 0 else 0
+
+    print(f"\n✅ ETL Complete!")
+    print(f"   Total rows: {total_rows:,}")
+    print(f"   Total time: {elapsed_time:.2f}s")
+    print(f"   Throughput: {throughput:.0f} rows/s")
+    if upsert:
+        print(f"   Upsert: {upsert_counts['inserted']:,} inserted | "
+              f"{upsert_counts['updated']:,} updated | "
+              f"{upsert_counts['unchanged']:,} unchanged | "
+              f"{upsert_counts['duplicates']:,} duplicate keys in CSV")
+    print_stage_report(stage_times, elapsed_time)
+    print()
+
+    return total_rows, elapsed_time
+
+
+def write_staging_file(staging_path, csv_path=CSV_FILE, skip_rows=0):
+    """
+    cp949 CSV → UTF-8 TSV staging 파일 변환
+
+    - 헤더 없음, 컬럼 순서 = RAW_COLUMNS
+    - NULL = \\N (MySQL LOAD DATA 기본 표기)
+    - skip_rows: 건너뛸 데이터 행 수 (재개 시 이미 적재된 행)
+
+    Returns:
+        int: 변환 행 수
+    """
+    total_rows = 0
+    chunk_num = 0
+    chunk_start = time.time()
+
+    with open(staging_path, 'w', encoding='utf-8', newline='') as staging:
+        # 파싱/변환은 reader thread에서 선행, 파일 기록과 겹쳐 실행
+        # (Int16 dtype → 정수는 '170'으로 기록, '170.0' 변환 불필요)
+        chunks = iter_pipelined(
+            read_csv_chunks(csv_path, skip_rows=skip_rows), prepare_chunk, PIPELINE_DEPTH
+        )
+        for chunk, _ in chunks:
+            chunk_num += 1
+
+            chunk.to_csv(
+                staging,
+                sep='\t',
+                header=False,
+                index=False,
+                na_rep=NULL_MARKER,
+                lineterminator='\n'
+            )
+
+            chunk_rows = len(chunk)
+            total_rows += chunk_rows
+            chunk_time = time.time() - chunk_start
+
+            print(f"   Stage chunk {chunk_num}: {chunk_rows:,} rows | {chunk_time:.2f}s | "
+                  f"{chunk_rows/chunk_time if chunk_time > 0 else 0:.0f} rows/s")
+
+            chunk_start = time.time()
+
+    return total_rows
+
+
+def bulk_load_staging(staging_path, db_engine=engine, rows_before=0, staged_rows=0):
+    """
+    staging 파일 → raw_health_check bulk load
+
+    - MySQL: LOAD DATA LOCAL INFILE (서버가 파일을 직접 파싱, local_infile 필요)
+      - 한 문장 = 한 트랜잭션 → 전체 성공 후 체크포인트 저장
+      - 체크포인트는 staging 행 수 기준 (unique index로 건너뛴 중복 행도 CSV 위치는 진행)
+    - 그 외 (SQLite 등): CHUNK_SIZE 단위 executemany, batch마다 체크포인트 저장
+
+    Args:
+        staging_path: staging 파일 경로
+        db_engine: 적재 대상 engine
+        rows_before: 이전 실행까지 적재된 행 수 (체크포인트 누적용)
+        staged_rows: staging 파일 행 수 (write_staging_file() 결과, MySQL 체크포인트용)
+
+    Returns:
+        int: 적재 행 수
+    """
+    if db_engine.dialect.name == 'mysql':
+        columns = ', '.join(RAW_COLUMNS)
+        with db_engine.begin() as conn:
+            result = conn.execute(
+                text(
+                    "LOAD DATA LOCAL INFILE :path INTO TABLE raw_health_check "
+                    "CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                    f"({columns})"
+                ),
+                {'path': str(staging_path)}
+            )
+            save_load_checkpoint(conn, rows_before + staged_rows)
+            return result.rowcount
+
+    # 컬럼 타입 변환기 (모델 정의 기준: SmallInteger → int, String → str)
+    table = RawHealthCheck.__table__
+    converters = [table.c[column].type.python_type for column in RAW_COLUMNS]
+
+    total_rows = 0
+    statement = insert(table)
+
+    with open(staging_path, encoding='utf-8', newline='') as staging:
+        reader = csv.reader(staging, delimiter='\t', quoting=csv.QUOTE_NONE)
+        batch = []
+        for row in reader:
+            batch.append({
+                column: None if value == NULL_MARKER else convert(value)
+                for column, convert, value in zip(RAW_COLUMNS, converters, row)
+            })
+            if len(batch) >= CHUNK_SIZE:
+                total_rows += len(batch)
+                with db_engine.begin() as conn:
+                    conn.execute(statement, batch)
+                    save_load_checkpoint(conn, rows_before + total_rows)
+                batch = []
+
+        if batch:
+            total_rows += len(batch)
+            with db_engine.begin() as conn:
+                conn.execute(statement, batch)
+                save_load_checkpoint(conn, rows_before + total_rows)
+
+    return total_rows
+
+
+def load_csv_bulk(csv_path=CSV_FILE, db_engine=None, resume=False):
+    """
+    CSV → raw_health_check 테이블 적재 (staging 파일 + bulk load)
+
+    Args:
+        csv_path: CSV 파일 경로
+        db_engine: 적재 대상 engine (None이면 LOAD DATA LOCAL INFILE 허용 engine 생성)
+        resume: True면 체크포인트 이후 행만 staging/적재
+
+    Returns:
+        tuple: (이번 실행의 처리 행 수, 처리 시간(초))
+    """
+    if db_engine is None:
+        if engine.dialect.name == 'mysql':
+            db_engine = create_db_engine(connect_args={'local_infile': True})
+        else:
+            db_engine = engine
+
+    start_time = time.time()
+
+    print(f"\n📊 Starting ETL: CSV → staging TSV → raw_health_check (bulk)")
+    print(f"   🔥 Chunk size: {CHUNK_SIZE:,} rows")
+    print(f"   Encoding: cp949 → utf-8\n")
+
+    rows_before = get_resume_rows(db_engine) if resume else 0
+
+    staging_fd, staging_path = tempfile.mkstemp(prefix='raw_health_check_', suffix='.tsv')
+    os.close(staging_fd)
+
+    try:
+        # 1. CSV → staging 파일
+        stage_start = time.time()
+        staged_rows = write_staging_file(staging_path, csv_path, skip_rows=rows_before)
+        stage_time = time.time() - stage_start
+
+        # 2. staging 파일 → DB
+        load_start = time.time()
+        total_rows = bulk_load_staging(staging_path, db_engine, rows_before, staged_rows)
+        load_time = time.time() - load_start
+    finally:
+        os.remove(staging_path)
 
     elapsed_time = time.time() - start_time
     throughput = total_rows / elapsed_time if elapsed_time > 0 else 0
 
+    print(f"\n   Staging: {staged_rows:,} rows | {stage_time:.2f}s | "
+          f"{staged_rows/stage_time if stage_time > 0 else 0:.0f} rows/s")
+    print(f"   Load:    {total_rows:,} rows | {load_time:.2f}s | "
+          f"{total_rows/load_time if load_time > 0 else 0:.0f} rows/s")
+
     print(f"\n✅ ETL Complete!")
     print(f"   Total rows: {total_rows:,}")
     print(f"   Total time: {elapsed_time:.2f}s")
@@ -128,10 +679,42 @@ def verify_data():
                   f"sbp={row.systolic_bp}, glucose={row.fasting_glucose}")
 
 
+def parse_args():
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description='ETL Step 1: CSV → raw_health_check')
+    parser.add_argument(
+        '--loader',
+        choices=['to_sql', 'bulk', 'upsert'],
+        default='to_sql',
+        help='적재 방식 (to_sql: chunk 다중 INSERT, bulk: staging TSV + LOAD DATA LOCAL INFILE, '
+             'upsert: 자연키 기준 INSERT/UPDATE, 기존 데이터 유지)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='중단된 적재를 마지막 체크포인트부터 재개 (기존 데이터 유지)'
+    )
+    parser.add_argument(
+        '--pipeline-depth',
+        type=int,
+        default=PIPELINE_DEPTH,
+        help=f'to_sql/upsert: reader thread가 미리 읽어 둘 chunk 수 (0이면 순차 실행, 기본 {PIPELINE_DEPTH})'
+    )
+    args = parser.parse_args()
+
+    if args.pipeline_depth < 0:
+        parser.error('--pipeline-depth must be >= 0')
+
+    return args
+
+
 def main():
     """메인 실행"""
+    args = parse_args()
+
     print("=" * 70)
     print("ETL Script 1: Load CSV to raw_health_check")
+    print(f"   Loader: {args.loader} | Mode: {'resume' if args.resume else 'full'}")
     print("=" * 70)
 
     # 1. CSV 파일 확인
@@ -141,11 +724,18 @@ def main():
     print("\n🔧 Creating database tables...")
     init_db()
 
-    # 3. 기존 데이터 확인
+    upsert = args.loader == 'upsert'
+
+    # 3. 기존 데이터 확인 (재개/upsert 시 기존 데이터 유지)
     with engine.connect() as conn:
         result = conn.execute(text("SELECT COUNT(*) FROM raw_health_check"))
         existing_count = result.scalar()
-        if existing_count > 0:
+
+        if args.resume:
+            if get_checkpoint(conn, CHECKPOINT_STAGE) is None:
+                print("\n❌ No checkpoint found. Run without --resume to start a full load.")
+                sys.exit(1)
+        elif existing_count > 0 and not upsert:
             print(f"\n⚠️  Warning: {existing_count:,} rows already exist in raw_health_check")
             response = input("   Continue? (y/n): ")
             if response.lower() != 'y':
@@ -156,19 +746,44 @@ def main():
             conn.commit()
             print("   ✅ Existing data cleared")
 
+    # 자연키 unique index (기존 테이블에는 없을 수 있음)
+    if not ensure_natural_key_index():
+        print(f"\n❌ Duplicate (reference_year, subscriber_id) rows exist in raw_health_check; "
+              f"cannot create {NATURAL_KEY_INDEX}. Run a full load (without --loader upsert) first.")
+        sys.exit(1)
+
+    # 새 적재 → 이전 체크포인트 삭제
+    # (TRUNCATE 후에는 raw id가 바뀌므로 process_clean 체크포인트도 무효, upsert는 id 유지)
+    if not args.resume:
+        with engine.begin() as conn:
+            clear_checkpoints(conn, CHECKPOINT_STAGE)
+            if not upsert:
+                clear_checkpoints(conn, 'process_clean', all_versions=True)
+
     # 4. CSV → raw 적재
-    total_rows, elapsed_time = load_csv_to_raw()
+    if args.loader == 'bulk':
+        total_rows, elapsed_time = load_csv_bulk(resume=args.resume)
+    else:
+        total_rows, elapsed_time = load_csv_to_raw(
+            resume=args.resume, pipeline_depth=args.pipeline_depth, upsert=upsert
+        )
+
+    # raw_health_check 변경 → /stats 캐시 무효화
+    invalidate_api_cache(config.REDIS_URL, config.CACHE_INVALIDATE_CHUNK)
 
     # 5. 검증
     verify_data()
 
+    if upsert:
+        print("\n💡 Run process_clean.py --incremental to score new/updated records")
+
     # 6. 성능 리포트
     print("\n" + "=" * 70)
     print("📈 Performance Report")
     print("=" * 70)
     print(f"Total Rows:    {total_rows:,}")
     print(f"Elapsed Time:  {elapsed_time:.2f} seconds")
-    print(f"Throughput:    {total_rows/elapsed_time:.0f} rows/second")
+    print(f"Throughput:    {total_rows/elapsed_time if elapsed_time > 0 else 0:.0f} rows/second")
     print("=" * 70)
 
 
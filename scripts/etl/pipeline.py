@@ -0,0 +1,144 @@
+"""
+Reader / Writer 파이프라인
+
+reader thread가 chunk를 미리 읽고 변환(read → transform)하는 동안
+호출 측(writer)은 이전 chunk를 DB에 기록
+- bounded queue → 미리 읽는 chunk 수(메모리) 제한
+- pandas 파싱과 DB I/O는 대부분 GIL 밖에서 실행 → thread로 충분히 겹쳐짐
+- 단계별 시간 측정 (어느 단계가 병목인지 확인)
+"""
+
+import queue
+import threading
+import time
+
+# 큐 종료 표시
+_DONE = object()
+
+
+class ReaderError:
+    """reader thread 예외 전달용 wrapper"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(chunk_queue, item, stop):
+    """
+    큐에 넣기 (writer가 중단되면 포기)
+
+    Returns:
+        bool: 넣었으면 True
+    """
+    while not stop.is_set():
+        try:
+            chunk_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_stage(iterator, transform):
+    """
+    다음 chunk 읽기 + 변환
+
+    Returns:
+        tuple or None: (chunk, read 시간, transform 시간), 끝이면 None
+    """
+    read_start = time.perf_counter()
+    try:
+        chunk = next(iterator)
+    except StopIteration:
+        return None
+    read_time = time.perf_counter() - read_start
+
+    transform_start = time.perf_counter()
+    if transform is not None:
+        chunk = transform(chunk)
+    transform_time = time.perf_counter() - transform_start
+
+    return chunk, read_time, transform_time
+
+
+def iter_pipelined(source, transform=None, depth=2):
+    """
+    source를 reader thread에서 미리 읽어 변환한 chunk를 순서대로 반환
+
+    Args:
+        source: chunk iterable (예: read_csv_chunks())
+        transform: reader thread에서 적용할 변환 함수 (None이면 그대로)
+        depth: 미리 읽어 둘 최대 chunk 수 (0이면 thread 없이 순차 실행)
+
+    Yields:
+        tuple: (chunk, {'read': 초, 'transform': 초, 'wait': writer 대기 초})
+
+    Raises:
+        reader thread에서 발생한 예외 (그대로 다시 발생)
+    """
+    iterator = iter(source)
+
+    # 순차 실행 (비교/디버깅용)
+    if depth <= 0:
+        while True:
+            item = _read_stage(iterator, transform)
+            if item is None:
+                return
+            chunk, read_time, transform_time = item
+            yield chunk, {'read': read_time, 'transform': transform_time, 'wait': 0.0}
+
+    chunk_queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def reader():
+        try:
+            while True:
+                item = _read_stage(iterator, transform)
+                if item is None:
+                    break
+                if not _put(chunk_queue, item, stop):
+                    return
+            _put(chunk_queue, _DONE, stop)
+        except BaseException as e:
+            _put(chunk_queue, ReaderError(e), stop)
+
+    thread = threading.Thread(target=reader, name='etl-reader', daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            item = chunk_queue.get()
+            wait_time = time.perf_counter() - wait_start
+
+            if item is _DONE:
+                return
+            if isinstance(item, ReaderError):
+                raise item.error
+
+            chunk, read_time, transform_time = item
+            yield chunk, {'read': read_time, 'transform': transform_time, 'wait': wait_time}
+    finally:
+        # writer 중단(예외/조기 종료) 시 reader도 정리
+        stop.set()
+        thread.join()
+
+
+def print_stage_report(stage_times, elapsed_time):
+    """
+    단계별 누적 시간 + 병목 단계 출력
+
+    Args:
+        stage_times: {'read', 'transform', 'write', 'wait'} 누적 시간(초)
+        elapsed_time: 전체 소요 시간(초)
+    """
+    reader_time = stage_times['read'] + stage_times['transform']
+    bottleneck = 'write' if stage_times['write'] >= reader_time else 'read/transform'
+
+    print(f"   Stage times (reader thread ∥ writer):")
+    print(f"     read:        {stage_times['read']:.2f}s")
+    print(f"     transform:   {stage_times['transform']:.2f}s")
+    print(f"     write:       {stage_times['write']:.2f}s")
+    print(f"     writer idle: {stage_times['wait']:.2f}s (waiting for reader)")
+    print(f"   Bottleneck: {bottleneck} "
+          f"(overlap saved {max(reader_time + stage_times['write'] - elapsed_time, 0):.2f}s)")
@@ -5,24 +5,45 @@ raw_health_check 데이터로 위험요인 판정 수행
 - 7개 위험요인 flag 계산
 - risk_factor_count, risk_group 산출
 - Inference 시간 측정
+- batch마다 체크포인트 저장 → --resume으로 중단 지점부터 재개
+- --rule-version + --side-by-side: 다른 버전 결과를 유지한 채 새 규칙 버전으로 재판정
+  (기준값 변경을 적용 전에 같은 테이블에서 비교)
+- --threshold: 기존 버전에서 기준값만 바꾼 검토용 버전을 --rule-version 이름으로 등록 후 판정
 """
 
 import sys
 import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # 프로젝트 루트 경로
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy import text
-from app.database import engine, SessionLocal
+from sqlalchemy import (
+    text, select, insert, delete, func, case, and_, or_, exists
+)
+from sqlalchemy.orm import sessionmaker
+from app.database import engine, SessionLocal, create_db_engine, legacy_clean_unique_keys
 from app.models.health_check import RawHealthCheck, CleanRiskResult
 from app.config import get_config
+from app.services.rules import (
+    derive_definition, get_rules, older_rule_versions, register_rules, rule_versions
+)
+from scripts.etl import scoring
+from scripts.etl.batching import iter_keyset_batches
+from scripts.etl.cache import invalidate_api_cache
+from scripts.etl.checkpoint import (
+    get_checkpoint, save_checkpoint, clear_checkpoints, list_checkpoint_stages
+)
+from scripts.etl.pushdown import build_insert_select, build_delete_stale
 
 # 설정
 config = get_config()
 BATCH_SIZE = 1000  # 한 번에 처리할 행 수
+SQL_BATCH_SIZE = 50000  # SQL pushdown: INSERT ... SELECT 한 문장이 처리할 id 범위
+CHECKPOINT_STAGE = 'process_clean'  # 체크포인트 stage (shard는 'process_clean:{start}-{end}')
 
 
 def calculate_bmi(height, weight):
@@ -36,221 +57,293 @@ def calculate_bmi(height, weight):
     Returns:
         float or None: BMI 값 (계산 불가 시 None)
     """
-    if not height or not weight:
-        return None
-    if height < 140 or height > 200:  # 이상치
-        return None
-    if weight < 30 or weight > 150:  # 이상치
-        return None
+    return scoring.RULES.calculate_bmi(height, weight)
 
-    height_m = height / 100.0
-    bmi = weight / (height_m ** 2)
-    return round(bmi, 1)
 
-
-def is_valid_data(raw_data):
+def process_single_record(raw_data, rules=scoring.RULES):
     """
-    데이터 유효성 검증 (생물학적 범위)
+    단일 레코드 처리 (Inference 로직)
+
+    판정 규칙은 app/services/rules.py (API /simulate와 동일)
 
     Args:
         raw_data: RawHealthCheck 객체
+        rules: 판정 규칙 (CompiledRules)
 
     Returns:
-        bool: 유효하면 True, 이상치면 False
+        CleanRiskResult: 판정 결과 객체
     """
-    # 필수 값 확인
-    if not raw_data.height or not raw_data.weight:
-        return False
-    if not raw_data.systolic_bp or not raw_data.diastolic_bp:
-        return False
-    if not raw_data.fasting_glucose:
-        return False
-    if not raw_data.total_cholesterol:
-        return False
-    if not raw_data.hdl_cholesterol:
-        return False
-
-    # 생물학적 범위 검증
-    if raw_data.systolic_bp < 70 or raw_data.systolic_bp > 250:
-        return False
-    if raw_data.diastolic_bp < 40 or raw_data.diastolic_bp > 150:
-        return False
-    if raw_data.fasting_glucose < 50 or raw_data.fasting_glucose > 400:
-        return False
-    if raw_data.total_cholesterol < 100 or raw_data.total_cholesterol > 400:
-        return False
-
-    return True
-
-
-def calculate_risk_factors(raw_data, bmi):
+    inference_start = time.time()
+
+    values = {column: getattr(raw_data, column) for column in rules.input_columns}
+
+    # 1. 유효성 검증
+    if not rules.is_valid(values):
+        # 유효하지 않은 데이터 → invalid_flag=True, 기본값 저장
+        return CleanRiskResult(
+            raw_id=raw_data.id,
+            bmi=None,
+            **{column: False for column in rules.flag_columns.values()},
+            risk_factor_count=0,
+            risk_group='ZERO_TO_ONE_RISK_FACTOR',
+            rule_version=rules.version,
+            invalid_flag=True,
+            inference_time_ms=0
+        )
+
+    # 2. BMI + 위험요인 flag + Risk Group
+    result = rules.evaluate(values)
+
+    # 3. Inference 시간 측정
+    inference_time = int((time.time() - inference_start) * 1000)  # ms
+
+    # 4. 결과 객체 생성
+    return CleanRiskResult(
+        raw_id=raw_data.id,
+        bmi=result['bmi'],
+        risk_factor_count=result['count'],
+        risk_group=result['group'],
+        rule_version=rules.version,
+        invalid_flag=False,
+        inference_time_ms=inference_time,
+        **{rules.flag_columns[name]: flag for name, flag in result['flags'].items()}  # flag_* 컬럼들
+    )
+
+
+def process_batch(raw_rows, rules=scoring.RULES):
     """
-    7개 위험요인 flag 계산 (가이드라인 기반)
+    Batch 단위 처리 (Vectorized Inference 로직)
 
     Args:
-        raw_data: RawHealthCheck 객체
-        bmi: BMI 값
+        raw_rows: scoring.RAW_COLUMNS 순서의 tuple 리스트
+        rules: 판정 규칙 (CompiledRules)
 
     Returns:
-        dict: {
-            'flag_hypertension': bool,
-            'flag_diabetes': bool,
-            ...
-        }
+        tuple: (INSERT용 dict 리스트 (유효한 레코드만), 무효 행 수)
     """
-    flags = {}
-#
-    # 1. 고혈압 (SBP≥140 or DBP≥90)
-    flags['flag_hypertension'] = (
-        raw_data.systolic_bp >= 140 or raw_data.diastolic_bp >= 90
-    )
+    inference_start = time.time()
 
-    # 2. 당뇨 (공복혈당≥126)
-    flags['flag_diabetes'] = raw_data.fasting_glucose >= 126
+    columns = scoring.rows_to_columns(raw_rows)
+    scored = scoring.score_batch(columns, rules)
 
-    # 3. 고콜레스테롤 (TC≥240)
-    flags['flag_tc_high'] = raw_data.total_cholesterol >= 240
+    # Inference 시간 (row당 평균, ms)
+    inference_time = int((time.time() - inference_start) * 1000 / len(raw_rows))
 
-    # 4. 고중성지방 (TG≥200)
-    flags['flag_tg_high'] = (
-        raw_data.triglycerides >= 200 if raw_data.triglycerides else False
-    )
+    mappings = scoring.to_clean_mappings(columns['id'], scored, inference_time, rules.version)
+    return mappings, len(raw_rows) - len(mappings)
+
+
+def build_raw_query(db, query_columns, incremental=False, rule_version=scoring.RULE_VERSION,
+                    side_by_side=False):
+    """
+    처리 대상 raw 레코드 조회 Query
+
+    Args:
+        db: SQLAlchemy Session
+        query_columns: 조회 컬럼 리스트 (또는 [RawHealthCheck])
+        incremental: True면 미처리 레코드만
+            - rule_version 결과가 없거나
+            - 이전 rule_version 결과가 있는 레코드 (older_rule_versions(), side_by_side면 제외)
+              나중에 등록된 버전(검토용 후보 등) 결과는 pending 조건에 포함하지 않음
+            - 무효 레코드는 저장되지 않으므로 유효성 조건을 SQL로 먼저 적용
+              (매 실행마다 무효 레코드를 다시 읽지 않도록)
+        rule_version: 판정할 rule_version
+        side_by_side: True면 다른 버전 결과와 함께 저장 (교체하지 않음)
+
+    Returns:
+        Query
+    """
+    query = db.query(*query_columns)
 
-    # 5. 저HDL (HDL<40)
-    flags['flag_hdl_low'] = raw_data.hdl_cholesterol < 40
+    if incremental:
+        def has_result(*conditions):
+            return exists().where(CleanRiskResult.raw_id == RawHealthCheck.id, *conditions)
 
-    # 6. 비만 (BMI≥25, 아시아 기준)
-    flags['flag_obesity'] = bmi >= 25 if bmi else False
+        pending = ~has_result(CleanRiskResult.rule_version == rule_version)
+        older = older_rule_versions(rule_version)
+        if older and not side_by_side:
+            pending = or_(pending, has_result(CleanRiskResult.rule_version.in_(older)))
 
-    # 7. 흡연 (현재흡연자=3)
-    flags['flag_smoking'] = raw_data.smoking_status == 3 if raw_data.smoking_status else False
+        query = query.filter(
+            pending,
+            scoring.sql_valid_condition(RawHealthCheck, get_rules(rule_version))
+        )
 
-    return flags
+    return query
 
 
-def calculate_risk_group(flags):
+def delete_stale_results(db, raw_ids, rule_version=scoring.RULE_VERSION):
     """
-    Risk Group 계산 (ATP III 프레임워크)
+    이전 rule_version 판정 결과 삭제 (재판정 결과로 교체하기 위해)
+
+    이전 버전(older_rule_versions()) + 재판정할 버전 결과만 삭제, 다른 버전 결과는 유지
 
     Args:
-        flags: 위험요인 dict
+        db: SQLAlchemy Session
+        raw_ids: 재판정 대상 raw_health_check.id 리스트
+        rule_version: 재판정할 rule_version
+    """
+    db.query(CleanRiskResult).filter(
+        CleanRiskResult.raw_id.in_(raw_ids),
+        CleanRiskResult.rule_version.in_([*older_rule_versions(rule_version), rule_version])
+    ).delete(synchronize_session=False)
+
+
+def resume_start_id(db, checkpoint_stage, start_id):
+    """
+    체크포인트가 있으면 마지막으로 커밋된 id 이후부터 재개
+
+    Args:
+        db: SQLAlchemy Session
+        checkpoint_stage: 체크포인트 stage 이름
+        start_id: 원래 시작 id
 
     Returns:
-        tuple: (risk_factor_count, risk_group)
+        tuple: (시작 id, 이전 실행까지 처리한 행 수)
     """
-    # 위험요인 개수
-    count = sum(flags.values())
-
-    # Risk Group 분류
-    if flags['flag_diabetes']:
-        # 당뇨 있음 → CHD Risk Equivalent (최고 위험)
-        group = 'CHD_RISK_EQUIVALENT'
-    elif count >= 2:
-        # 위험요인 2개 이상 → Multiple Risk Factors
-        group = 'MULTIPLE_RISK_FACTORS'
-    else:
-        # 위험요인 0~1개 → 저위험
-        group = 'ZERO_TO_ONE_RISK_FACTOR'
+    checkpoint = get_checkpoint(db, checkpoint_stage)
+    if checkpoint is None or checkpoint['last_id'] <= start_id:
+        return start_id, 0
 
-    return count, group
+    print(f"   ⏩ {checkpoint_stage}: resuming after id {checkpoint['last_id']:,} "
+          f"({checkpoint['rows_done']:,} rows already processed)")
+    return checkpoint['last_id'], checkpoint['rows_done']
 
 
-def process_single_record(raw_data):
+def process_id_range_sql(db, start_id=0, end_id=None, label='Batch', incremental=False,
+                         checkpoint_stage=None, rows_before=0,
+                         rule_version=scoring.RULE_VERSION, side_by_side=False):
     """
-    단일 레코드 처리 (Inference 로직)
+    id 범위 (start_id, end_id] 처리 - SQL pushdown
 
-    Args:
-        raw_data: RawHealthCheck 객체
+    SQL_BATCH_SIZE 단위 id 범위마다 INSERT ... SELECT 한 문장 실행 (DB 내부에서 판정)
 
     Returns:
-        CleanRiskResult: 판정 결과 객체
+        tuple: (처리 행 수, 유효 행 수, 무효 행 수)
     """
-    inference_start = time.time()
+    total_rows = 0
+    valid_rows = 0
 
-    # 1. 유효성 검증
-    valid = is_valid_data(raw_data)
+    if end_id is None:
+        end_id = db.query(func.max(RawHealthCheck.id)).scalar() or 0
 
-    if not valid:
-        # 유효하지 않은 데이터 → invalid_flag=True, 기본값 저장
-        clean_result = CleanRiskResult(
-            raw_id=raw_data.id,
-            bmi=None,
-            flag_hypertension=False,
-            flag_diabetes=False,
-            flag_tc_high=False,
-            flag_tg_high=False,
-            flag_hdl_low=False,
-            flag_obesity=False,
-            flag_smoking=False,
-            risk_factor_count=0,
-            risk_group='ZERO_TO_ONE_RISK_FACTOR',
-            invalid_flag=True,
-            inference_time_ms=0
-        )
-    else:
-        # 2. BMI 계산
-        bmi = calculate_bmi(raw_data.height, raw_data.weight)
+    batch_num = 0
+    range_start = start_id
 
-        # 3. 위험요인 flag 계산
-        flags = calculate_risk_factors(raw_data, bmi)
+    while range_start < end_id:
+        batch_num += 1
+        batch_start = time.time()
+        range_end = min(range_start + SQL_BATCH_SIZE, end_id)
 
-        # 4. Risk Group 계산
-        count, group = calculate_risk_group(flags)
+        # 처리 대상 행 수 (리포트용, PK 범위 count)
+        batch_total = build_raw_query(
+            db, [RawHealthCheck.id], incremental, rule_version, side_by_side
+        ).filter(
+            RawHealthCheck.id > range_start,
+            RawHealthCheck.id <= range_end
+        ).count()
 
-        # 5. Inference 시간 측정
-        inference_time = int((time.time() - inference_start) * 1000)  # ms
+        delete_stale = build_delete_stale(range_start, range_end, rule_version)
+        if incremental and not side_by_side and delete_stale is not None:
+            db.execute(delete_stale)
 
-        # 6. 결과 객체 생성
-        clean_result = CleanRiskResult(
-            raw_id=raw_data.id,
-            bmi=bmi,
-            risk_factor_count=count,
-            risk_group=group,
-            invalid_flag=False,
-            inference_time_ms=inference_time,
-            **flags  # flag_* 컬럼들
-        )
+        result = db.execute(build_insert_select(range_start, range_end, incremental, rule_version))
+        total_rows += batch_total
+
+        # 체크포인트는 결과와 같은 트랜잭션에서 커밋
+        if checkpoint_stage:
+            save_checkpoint(db, checkpoint_stage,
+                            last_id=range_end, rows_done=rows_before + total_rows)
+        db.commit()
 
-    return clean_result
+        valid_rows += result.rowcount
 
+        batch_time = time.time() - batch_start
+        throughput = batch_total / batch_time if batch_time > 0 else 0
 
-def process_all_records():
+        print(f"   {label} {batch_num}: {batch_total:,} rows | "
+              f"{batch_time:.2f}s | {throughput:.0f} rows/s")
+
+        range_start = range_end
+
+    return total_rows, valid_rows, total_rows - valid_rows
+
+
+def process_id_range(db, engine_type='vectorized', start_id=0, end_id=None, label='Batch',
+                     incremental=False, checkpoint_stage=None,
+                     rule_version=scoring.RULE_VERSION, side_by_side=False):
     """
-    모든 raw 레코드 처리
+    id 범위 (start_id, end_id] 의 raw 레코드 처리
+
+    Args:
+        db: SQLAlchemy Session
+        engine_type: 'vectorized' (batch 배열 연산), 'row' (row 단위 ORM),
+            'sql' (INSERT ... SELECT pushdown)
+        start_id: 이 값 초과부터 처리
+        end_id: 이 값 이하까지 처리 (None이면 끝까지)
+        label: batch 로그 prefix
+        incremental: True면 미처리/이전 버전 레코드만 처리 (build_raw_query 참고)
+        checkpoint_stage: 체크포인트 stage 이름 (None이면 저장 안 함)
+            - 있으면 마지막으로 커밋된 id 이후부터 재개
+            - batch마다 결과와 같은 트랜잭션에서 마지막 id 저장
+        rule_version: 판정할 rule_version (app/services/rules.py)
+        side_by_side: True면 다른 rule_version 결과를 유지 (증분 처리 시 교체하지 않음)
 
     Returns:
-        tuple: (처리 행 수, 유효 행 수, 무효 행 수, 처리 시간)
+        tuple: (이번 실행의 처리 행 수, 유효 행 수, 무효 행 수)
     """
-    start_time = time.time()
+    rules = get_rules(rule_version)
+
+    rows_before = 0
+    if checkpoint_stage:
+        start_id, rows_before = resume_start_id(db, checkpoint_stage, start_id)
+
+    if engine_type == 'sql':
+        return process_id_range_sql(db, start_id, end_id, label, incremental,
+                                    checkpoint_stage, rows_before, rule_version, side_by_side)
+
     total_rows = 0
     valid_rows = 0
     invalid_rows = 0
 
-    db = SessionLocal()
-
-    try:
-        # raw 테이블 총 행 수
-        total_count = db.query(RawHealthCheck).count()
-        print(f"\n📊 Processing {total_count:,} records from raw_health_check\n")
+    # Batch 단위로 처리 (id 범위 keyset 조회)
+    if engine_type == 'vectorized':
+        # 판정에 필요한 컬럼만
+        query_columns = [getattr(RawHealthCheck, name) for name in scoring.RAW_COLUMNS]
+    else:
+        query_columns = [RawHealthCheck]
 
-        # Batch 단위로 처리
-        offset = 0
-        batch_num = 0
+    batches = iter_keyset_batches(
+        db, RawHealthCheck.id, query_columns, BATCH_SIZE,
+        start_id=start_id, end_id=end_id,
+        base_query=build_raw_query(db, query_columns, incremental, rule_version, side_by_side)
+    )
 
-        while True:
-            batch_num += 1
-            batch_start = time.time()
+    batch_num = 0
+    batch_start = time.time()
 
-            # Batch 조회
-            raw_batch = db.query(RawHealthCheck).offset(offset).limit(BATCH_SIZE).all()
+    for raw_batch in batches:
+        batch_num += 1
 
-            if not raw_batch:
-                break
+        # 증분 처리: 이전 버전(older_rule_versions) 결과는 같은 트랜잭션에서 교체 (side-by-side면 유지)
+        if incremental and not side_by_side:
+            delete_stale_results(db, [raw.id for raw in raw_batch], rule_version)
 
+        if engine_type == 'vectorized':
+            # Batch 처리 (유효한 레코드만 저장)
+            mappings, batch_invalid = process_batch(raw_batch, rules)
+            total_rows += len(raw_batch)
+            invalid_rows += batch_invalid
+            valid_rows += len(mappings)
+
+            # 단일 INSERT executemany (NULL 여부와 무관하게 한 statement)
+            if mappings:
+                db.execute(insert(CleanRiskResult.__table__), mappings)
+        else:
             # Batch 처리 (유효한 레코드만 저장)
             clean_batch = []
             for raw_data in raw_batch:
-                clean_result = process_single_record(raw_data)
+                clean_result = process_single_record(raw_data, rules)
 
                 total_rows += 1
                 if clean_result.invalid_flag:
@@ -264,21 +357,212 @@ def process_all_records():
             # DB에 저장 (유효한 레코드만)
             if clean_batch:
                 db.bulk_save_objects(clean_batch)
-                db.commit()
 
-            batch_time = time.time() - batch_start
-            throughput = len(raw_batch) / batch_time if batch_time > 0 else 0
+        # 체크포인트는 결과와 같은 트랜잭션에서 커밋
+        if checkpoint_stage:
+            save_checkpoint(db, checkpoint_stage,
+                            last_id=raw_batch[-1].id, rows_done=rows_before + total_rows)
+        db.commit()
+
+        batch_time = time.time() - batch_start
+        throughput = len(raw_batch) / batch_time if batch_time > 0 else 0
+
+        print(f"   {label} {batch_num}: {len(raw_batch):,} rows | "
+              f"{batch_time:.2f}s | {throughput:.0f} rows/s")
 
-            print(f"   Batch {batch_num}: {len(raw_batch):,} rows | "
-                  f"{batch_time:.2f}s | {throughput:.0f} rows/s")
+        batch_start = time.time()
 
-            offset += BATCH_SIZE
+    return total_rows, valid_rows, invalid_rows
+
+
+def split_id_ranges(min_id, max_id, shards):
+    """
+    id 구간 [min_id, max_id]를 shard 개수만큼 균등 분할
+
+    Args:
+        min_id: 최소 id (None이면 빈 테이블)
+        max_id: 최대 id
+        shards: shard 개수
+
+    Returns:
+        list[tuple]: [(start_id, end_id), ...] - 각 shard는 start_id 초과 ~ end_id 이하
+    """
+    if min_id is None:
+        return []
 
+    size = -(-(max_id - min_id + 1) // shards)  # 올림 나눗셈
+
+    ranges = []
+    start_id = min_id - 1
+    while start_id < max_id:
+        end_id = min(start_id + size, max_id)
+        ranges.append((start_id, end_id))
+        start_id = end_id
+
+    return ranges
+
+
+def checkpoint_stage_name(rule_version=scoring.RULE_VERSION, side_by_side=False):
+    """체크포인트 stage 이름 (side-by-side 처리는 버전별로 분리: 'process_clean@{버전}')"""
+    return f"{CHECKPOINT_STAGE}@{rule_version}" if side_by_side else CHECKPOINT_STAGE
+
+
+def shard_checkpoint_stage(start_id, end_id, base_stage=CHECKPOINT_STAGE):
+    """Shard별 체크포인트 stage 이름 (같은 --workers로 재개해야 이름이 일치)"""
+    return f"{base_stage}:{start_id}-{end_id}"
+
+
+def process_shard(shard):
+    """
+    Shard 처리 (worker 프로세스 진입점)
+
+    부모 프로세스의 연결 풀을 공유하지 않도록 shard마다 engine을 새로 생성
+
+    Args:
+        shard: {'shard_num', 'start_id', 'end_id', 'engine_type', 'incremental',
+                'checkpoint_stage', 'rule_version', 'rule_definition', 'side_by_side'}
+
+    Returns:
+        dict: shard 정보 + (total, valid, invalid, elapsed)
+    """
+    start_time = time.time()
+
+    # --threshold로 등록한 버전은 worker 프로세스 registry에도 등록 (spawn 시작 방식 대비)
+    if shard['rule_version'] not in rule_versions():
+        register_rules(shard['rule_version'], shard['rule_definition'])
+
+    shard_engine = create_db_engine()
+    db = sessionmaker(bind=shard_engine, autocommit=False, autoflush=False)()
+
+    try:
+        total, valid, invalid = process_id_range(
+            db,
+            shard['engine_type'],
+            start_id=shard['start_id'],
+            end_id=shard['end_id'],
+            label=f"Shard {shard['shard_num']} batch",
+            incremental=shard['incremental'],
+            checkpoint_stage=shard['checkpoint_stage'],
+            rule_version=shard['rule_version'],
+            side_by_side=shard['side_by_side']
+        )
     finally:
         db.close()
+        shard_engine.dispose()
+
+    return {
+        **shard,
+        'total': total,
+        'valid': valid,
+        'invalid': invalid,
+        'elapsed': time.time() - start_time,
+    }
+
+
+def process_all_records(engine_type='vectorized', workers=1, incremental=False, resume=False,
+                        rule_version=scoring.RULE_VERSION, side_by_side=False):
+    """
+    모든 raw 레코드 처리
+
+    전체 처리는 batch마다 체크포인트 저장 (증분 처리는 미처리 레코드만 조회하므로 불필요)
+
+    Args:
+        engine_type: 'vectorized' (batch 배열 연산), 'row' (row 단위 ORM),
+            'sql' (INSERT ... SELECT pushdown)
+        workers: worker 프로세스 수 (2 이상이면 id 범위 shard 병렬 처리)
+        incremental: True면 미처리/이전 버전 레코드만 처리
+        resume: True면 체크포인트 이후부터 재개 (이전 실행과 같은 workers 필요)
+        rule_version: 판정할 rule_version
+        side_by_side: True면 다른 rule_version 결과를 유지 (버전별 결과 병행 저장)
+
+    Returns:
+        tuple: (처리 행 수, 유효 행 수, 무효 행 수, 처리 시간, shard별 결과 리스트)
+    """
+    start_time = time.time()
+    shard_stats = []
+    base_stage = checkpoint_stage_name(rule_version, side_by_side)
+
+    db = SessionLocal()
+
+    try:
+        # 처리 대상 행 수
+        total_count = build_raw_query(
+            db, [RawHealthCheck.id], incremental, rule_version, side_by_side
+        ).count()
+        mode = 'pending ' if incremental else ''
+        print(f"\n📊 Processing {total_count:,} {mode}records from raw_health_check "
+              f"(rule_version {rule_version})\n")
+
+        if total_count == 0:
+            print("✅ Nothing to process (clean_risk_result is up to date)\n")
+            return 0, 0, 0, time.time() - start_time, shard_stats
+
+        if workers > 1:
+            min_id, max_id = db.query(
+                func.min(RawHealthCheck.id), func.max(RawHealthCheck.id)
+            ).one()
+            id_ranges = split_id_ranges(min_id, max_id, workers)
+            stages = [
+                shard_checkpoint_stage(start_id, end_id, base_stage)
+                for start_id, end_id in id_ranges
+            ]
+        else:
+            stages = [base_stage]
+
+        # 재개: 체크포인트가 현재 분할과 일치해야 함 (다르면 일부 구간 중복 처리)
+        if resume:
+            unknown = set(list_checkpoint_stages(db, base_stage)) - set(stages)
+            if unknown:
+                raise RuntimeError(
+                    f"Checkpoints {sorted(unknown)} do not match --workers {workers}; "
+                    f"resume with the same --workers as the interrupted run"
+                )
+
+        if workers == 1:
+            total_rows, valid_rows, invalid_rows = process_id_range(
+                db, engine_type, incremental=incremental,
+                checkpoint_stage=None if incremental else base_stage,
+                rule_version=rule_version, side_by_side=side_by_side
+            )
+
+    finally:
+        db.close()
+
+    if workers > 1:
+        shards = [
+            {
+                'shard_num': shard_num,
+                'start_id': start_id,
+                'end_id': end_id,
+                'engine_type': engine_type,
+                'incremental': incremental,
+                'checkpoint_stage': None if incremental else stage,
+                'rule_version': rule_version,
+                'rule_definition': get_rules(rule_version).definition,
+                'side_by_side': side_by_side,
+            }
+            for shard_num, ((start_id, end_id), stage)
+            in enumerate(zip(id_ranges, stages), start=1)
+        ]
+        print(f"   🔀 {len(shards)} shards × {workers} workers\n")
+
+        # fork 시 부모 연결이 worker로 복제되지 않도록 풀 정리
+        engine.dispose()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_stats = list(executor.map(process_shard, shards))
+
+        total_rows = sum(stat['total'] for stat in shard_stats)
+        valid_rows = sum(stat['valid'] for stat in shard_stats)
+        invalid_rows = sum(stat['invalid'] for stat in shard_stats)
 
     elapsed_time = time.time() - start_time
 
+    # 재개 시 체크포인트가 이미 끝에 있는 경우
+    if total_rows == 0:
+        print("\n✅ Nothing left to process (checkpoints are up to date)\n")
+        return 0, 0, 0, elapsed_time, shard_stats
+
     print(f"\n✅ Processing Complete!")
     print(f"   Total rows:   {total_rows:,}")
     print(f"   Valid rows:   {valid_rows:,} ({valid_rows/total_rows*100:.1f}%)")
@@ -286,16 +570,17 @@ def process_all_records():
     print(f"   Total time:   {elapsed_time:.2f}s")
     print(f"   Throughput:   {total_rows/elapsed_time:.0f} rows/s\n")
 
-    return total_rows, valid_rows, invalid_rows, elapsed_time
+    return total_rows, valid_rows, invalid_rows, elapsed_time, shard_stats
 
 
-def verify_results():
+def verify_results(rule_version=scoring.RULE_VERSION):
     """결과 검증 (유효한 레코드만 저장됨)"""
     db = SessionLocal()
 
     try:
         # 통계 조회 (모두 유효한 레코드)
-        total = db.query(CleanRiskResult).count()
+        results = db.query(CleanRiskResult).filter(CleanRiskResult.rule_version == rule_version)
+        total = results.count()
 
         print(f"🔍 Verification:")
         print(f"   Total valid records: {total:,} rows")
@@ -304,13 +589,13 @@ def verify_results():
         # Risk Group 분포
         print(f"📊 Risk Group Distribution:")
         for group in ['ZERO_TO_ONE_RISK_FACTOR', 'MULTIPLE_RISK_FACTORS', 'CHD_RISK_EQUIVALENT']:
-            count = db.query(CleanRiskResult).filter_by(risk_group=group).count()
+            count = results.filter_by(risk_group=group).count()
             pct = count / total * 100 if total > 0 else 0
             print(f"   {group:30s}: {count:6,} ({pct:5.1f}%)")
 
         # 샘플 데이터
         print(f"\n📋 Sample Results:")
-        samples = db.query(CleanRiskResult).limit(3).all()
+        samples = results.limit(3).all()
         for sample in samples:
             print(f"   ID {sample.id}: count={sample.risk_factor_count}, "
                   f"group={sample.risk_group}, bmi={sample.bmi}")
@@ -319,34 +604,270 @@ def verify_results():
         db.close()
 
 
+def compare_rule_versions(db, base_version, rule_version):
+    """
+    두 rule_version 판정 결과 비교 (side-by-side 처리 후 기준값 변경 영향 확인)
+
+    Args:
+        db: SQLAlchemy Session
+        base_version: 기준 버전 (예: 서비스 중인 버전)
+        rule_version: 비교할 버전
+
+    Returns:
+        dict: {
+            'distribution': {버전: {risk_group: count}},
+            'compared': 두 버전 결과가 모두 있는 레코드 수,
+            'changed': 그중 risk_group이 달라진 레코드 수
+        }
+    """
+    rows = db.query(
+        CleanRiskResult.rule_version,
+        CleanRiskResult.risk_group,
+        func.count(CleanRiskResult.id)
+    ).filter(
+        CleanRiskResult.rule_version.in_([base_version, rule_version])
+    ).group_by(
+        CleanRiskResult.rule_version, CleanRiskResult.risk_group
+    ).all()
+
+    distribution = {base_version: {}, rule_version: {}}
+    for version, group, count in rows:
+        distribution[version][group] = count
+
+    # raw 레코드별 비교 (uq_clean_raw_version 인덱스로 조인)
+    base = CleanRiskResult.__table__.alias('base')
+    candidate = CleanRiskResult.__table__.alias('candidate')
+    compared, changed = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((base.c.risk_group != candidate.c.risk_group, 1), else_=0)), 0)
+        ).select_from(
+            base.join(candidate, and_(
+                candidate.c.raw_id == base.c.raw_id,
+                candidate.c.rule_version == rule_version
+            ))
+        ).where(base.c.rule_version == base_version)
+    ).one()
+
+    return {'distribution': distribution, 'compared': compared, 'changed': changed}
+
+
+def print_comparison(comparison, base_version, rule_version):
+    """compare_rule_versions() 결과 출력"""
+    print(f"\n🔀 Side-by-side: {base_version} → {rule_version}")
+    print(f"   {'risk_group':30s} {base_version:>15s} {rule_version:>15s}")
+    for group in ['ZERO_TO_ONE_RISK_FACTOR', 'MULTIPLE_RISK_FACTORS', 'CHD_RISK_EQUIVALENT']:
+        before = comparison['distribution'][base_version].get(group, 0)
+        after = comparison['distribution'][rule_version].get(group, 0)
+        print(f"   {group:30s} {before:>15,} {after:>15,}  ({after - before:+,})")
+
+    compared = comparison['compared']
+    pct = comparison['changed'] / compared * 100 if compared > 0 else 0
+    print(f"   Changed risk_group: {comparison['changed']:,} / {compared:,} records ({pct:.1f}%)\n")
+
+
+def parse_threshold(value):
+    """
+    --threshold 값 파싱 ('flag.column=기준값')
+
+    Returns:
+        tuple: (flag, column, float)
+    """
+    name, _, threshold = value.partition('=')
+    flag, _, column = name.partition('.')
+    try:
+        return flag, column, float(threshold)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected FLAG.COLUMN=VALUE (e.g. diabetes.fasting_glucose=110), got {value!r}"
+        ) from None
+
+
+def register_candidate(rule_version, base_version, thresholds):
+    """
+    기준값만 바꾼 검토용 rule_version 등록
+
+    Args:
+        rule_version: 새 버전 이름
+        base_version: 기준 버전
+        thresholds: [(flag, column, 기준값)] (parse_threshold 결과)
+
+    Returns:
+        CompiledRules
+
+    Raises:
+        ValueError: 이미 있는 버전, 없는 버전/flag/컬럼
+    """
+    changes = {}
+    for flag, column, threshold in thresholds:
+        changes.setdefault(flag, {})[column] = threshold
+    return register_rules(rule_version, derive_definition(base_version, changes))
+
+
+def parse_args():
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description='ETL Step 2: raw → clean_risk_result')
+    parser.add_argument(
+        '--engine',
+        choices=['vectorized', 'row', 'sql'],
+        default='vectorized',
+        help='판정 엔진 (vectorized: numpy batch 연산, row: row 단위 ORM, '
+             'sql: INSERT ... SELECT로 DB 내부 판정)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='worker 프로세스 수 (id 범위 shard 병렬 처리, 기본 1)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='미처리 레코드와 이전 rule_version 레코드만 처리 (기존 결과 유지, 확인 없음)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='중단된 전체 처리를 마지막 체크포인트부터 재개 (기존 결과 유지, 같은 --workers 필요)'
+    )
+    parser.add_argument(
+        '--rule-version',
+        default=config.RULE_VERSION,
+        help=f'판정 규칙 버전 (등록된 버전: {", ".join(rule_versions())}, '
+             f'기본 RULE_VERSION={config.RULE_VERSION}, --threshold와 함께 쓰면 새 버전 이름)'
+    )
+    parser.add_argument(
+        '--threshold',
+        action='append',
+        type=parse_threshold,
+        default=[],
+        metavar='FLAG.COLUMN=VALUE',
+        help='--derive-from 버전에서 기준값만 바꾼 --rule-version을 등록 후 판정 '
+             '(반복 가능, 예: diabetes.fasting_glucose=110)'
+    )
+    parser.add_argument(
+        '--derive-from',
+        default=config.RULE_VERSION,
+        help='--threshold의 기준 버전 (기본 RULE_VERSION)'
+    )
+    parser.add_argument(
+        '--side-by-side',
+        action='store_true',
+        help='다른 rule_version 결과를 유지하고 --rule-version 결과를 함께 저장 '
+             '(전체 처리 시 해당 버전 결과만 삭제 후 재판정, 끝나면 서비스 버전과 비교)'
+    )
+    parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='전체 재처리 시 확인 없이 기존 결과 삭제'
+    )
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.resume and args.incremental:
+        parser.error('--resume is for full runs (--incremental already skips processed records)')
+
+    if args.threshold:
+        try:
+            register_candidate(args.rule_version, args.derive_from, args.threshold)
+        except ValueError as e:
+            parser.error(f'--threshold: {e}')
+    elif args.rule_version not in rule_versions():
+        parser.error(f'unknown --rule-version {args.rule_version!r} '
+                     f'(registered: {", ".join(rule_versions())}; use --threshold to derive one)')
+
+    return args
+
+
 def main():
     """메인 실행"""
+    args = parse_args()
+
     print("=" * 70)
     print("ETL Script 2: Process raw → clean_risk_result")
+    mode = 'incremental' if args.incremental else 'resume' if args.resume else 'full'
+    if args.side_by_side:
+        mode += ', side-by-side'
+    print(f"   Engine: {args.engine} | Workers: {args.workers} | Mode: {mode} | "
+          f"Rules: {args.rule_version}")
+    if args.threshold:
+        changes = ', '.join(f"{flag}.{column}={threshold:g}" for flag, column, threshold in args.threshold)
+        print(f"   Derived from {args.derive_from}: {changes}")
     print("=" * 70)
 
-    # 1. 기존 데이터 확인
+    # (raw_id, rule_version) 유일성 제약 확인 (이전 스키마 DB는 init_db()로 1회 전환)
+    if any(legacy_clean_unique_keys()):
+        print("\n❌ clean_risk_result still has the legacy UNIQUE (raw_id) key.")
+        print('   Run: python -c "from app.database import init_db; init_db()"')
+        sys.exit(1)
+
+    checkpoint_stage = checkpoint_stage_name(args.rule_version, args.side_by_side)
+
+    # 1. 기존 데이터 확인 (증분 처리/재개는 기존 결과 유지)
+    #    side-by-side: 이 버전 결과만 대상 (다른 버전 결과는 유지)
     db = SessionLocal()
-    existing_count = db.query(CleanRiskResult).count()
+    existing = db.query(CleanRiskResult)
+    if args.side_by_side:
+        existing = existing.filter(CleanRiskResult.rule_version == args.rule_version)
+    existing_count = existing.count()
+    has_checkpoint = bool(list_checkpoint_stages(db, checkpoint_stage))
     db.close()
 
-    if existing_count > 0:
+    if args.resume and not has_checkpoint:
+        print("\n❌ No checkpoint found. Run without --resume to start a full run.")
+        sys.exit(1)
+
+    if existing_count > 0 and not args.incremental and not args.resume:
         print(f"\n⚠️  Warning: {existing_count:,} rows already exist in clean_risk_result")
-        response = input("   Clear and reprocess? (y/n): ")
-        if response.lower() != 'y':
-            print("   Aborted.")
-            sys.exit(0)
+        if not args.yes:
+            response = input("   Clear and reprocess? (y/n): ")
+            if response.lower() != 'y':
+                print("   Aborted.")
+                sys.exit(0)
         # 기존 데이터 삭제
         with engine.connect() as conn:
-            conn.execute(text("TRUNCATE TABLE clean_risk_result"))
+            if args.side_by_side:
+                conn.execute(delete(CleanRiskResult.__table__).where(
+                    CleanRiskResult.rule_version == args.rule_version
+                ))
+            else:
+                conn.execute(text("TRUNCATE TABLE clean_risk_result"))
             conn.commit()
             print("   ✅ Existing data cleared")
 
+    # 새 전체 처리 → 이전 실행의 체크포인트 삭제
+    if not args.incremental and not args.resume:
+        with engine.begin() as conn:
+            clear_checkpoints(conn, checkpoint_stage)
+
     # 2. 처리 실행
-    total, valid, invalid, elapsed = process_all_records()
+    try:
+        total, valid, invalid, elapsed, shard_stats = process_all_records(
+            args.engine, args.workers, args.incremental, args.resume,
+            args.rule_version, args.side_by_side
+        )
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    # clean_risk_result 변경 → /stats 캐시 무효화
+    invalidate_api_cache(config.REDIS_URL, config.CACHE_INVALIDATE_CHUNK)
+
+    if total == 0:
+        return
 
     # 3. 검증
-    verify_results()
+    verify_results(args.rule_version)
+
+    # side-by-side: 서비스 버전과 판정 결과 비교
+    if args.side_by_side and args.rule_version != config.RULE_VERSION:
+        db = SessionLocal()
+        try:
+            comparison = compare_rule_versions(db, config.RULE_VERSION, args.rule_version)
+        finally:
+            db.close()
+        print_comparison(comparison, config.RULE_VERSION, args.rule_version)
 
     # 4. 성능 리포트
     print("\n" + "=" * 70)
@@ -357,6 +878,15 @@ def main():
     print(f"Invalid Records:  {invalid:,} ({invalid/total*100:.1f}%)")
     print(f"Elapsed Time:     {elapsed:.2f} seconds")
     print(f"Throughput:       {total/elapsed:.0f} rows/second")
+
+    # Shard별 처리량 (병렬 실행 시)
+    if shard_stats:
+        print("-" * 70)
+        for stat in shard_stats:
+            shard_throughput = stat['total'] / stat['elapsed'] if stat['elapsed'] > 0 else 0
+            print(f"Shard {stat['shard_num']:>2} (id {stat['start_id'] + 1:,}~{stat['end_id']:,}): "
+                  f"{stat['total']:,} rows | {stat['elapsed']:.2f}s | "
+                  f"{shard_throughput:.0f} rows/s")
     print("=" * 70)
 
 
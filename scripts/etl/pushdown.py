@@ -0,0 +1,96 @@
+"""
+SQL Pushdown 위험요인 판정
+
+id 범위마다 `INSERT INTO clean_risk_result ... SELECT ... FROM raw_health_check`
+한 문장으로 판정/저장 → 데이터가 Python으로 오가지 않음
+- 판정 식은 scoring.py 규칙 정의(FLAG_RULES 등)에서 생성
+- 유효성 조건은 WHERE 절 (무효 레코드는 저장하지 않음)
+"""
+
+from sqlalchemy import select, insert, delete, exists, and_, literal
+
+from app.models.health_check import RawHealthCheck, CleanRiskResult
+from app.services.rules import get_rules, older_rule_versions
+from scripts.etl import scoring
+
+
+def build_insert_select(start_id, end_id, incremental=False, rule_version=scoring.RULE_VERSION):
+    """
+    id 범위 (start_id, end_id] 판정 INSERT ... SELECT 문 생성
+
+    Args:
+        start_id: 이 값 초과부터
+        end_id: 이 값 이하까지
+        incremental: True면 rule_version 결과가 없는 레코드만
+            (이전 버전 결과가 있는 레코드는 build_delete_stale()로 먼저 삭제)
+        rule_version: 판정/저장할 rule_version
+
+    Returns:
+        Insert: 실행 시 rowcount = 저장된 (유효) 행 수
+    """
+    rules = get_rules(rule_version)
+    raw = RawHealthCheck.__table__
+    clean = CleanRiskResult.__table__
+
+    conditions = [
+        raw.c.id > start_id,
+        raw.c.id <= end_id,
+        scoring.sql_valid_condition(raw.c, rules),
+    ]
+    if incremental:
+        conditions.append(~exists().where(
+            clean.c.raw_id == raw.c.id,
+            clean.c.rule_version == rule_version,
+        ))
+
+    # BMI는 subquery에서 한 번만 계산 (× 10 → 반올림)
+    measured = select(
+        *[raw.c[name] for name in scoring.RAW_COLUMNS],
+        scoring.sql_bmi_x10(raw.c, rules).label('bmi_x10'),
+    ).where(and_(*conditions)).subquery('measured')
+
+    source = select(
+        *[measured.c[name] for name in scoring.RAW_COLUMNS],
+        scoring.sql_round_bmi(measured.c.bmi_x10).label('bmi'),
+    ).subquery('scored')
+
+    columns = {
+        'raw_id': source.c.id,
+        **scoring.sql_score_columns(source.c, rules),
+        'rule_version': literal(rule_version),
+        'invalid_flag': literal(False),
+        'inference_time_ms': literal(0),
+    }
+
+    return insert(clean).from_select(
+        list(columns),
+        select(*columns.values())
+    )
+
+
+def build_delete_stale(start_id, end_id, rule_version=scoring.RULE_VERSION):
+    """
+    id 범위 (start_id, end_id]에서 이전 rule_version 결과가 있는 레코드의 결과 삭제문 생성 (증분 처리용)
+
+    - 삭제 대상 버전: older_rule_versions(rule_version) + rule_version (재판정 결과로 교체)
+    - 나중에 등록된 버전/등록되지 않은 버전 결과는 유지
+    - MySQL은 DELETE 대상 테이블을 subquery에서 직접 참조할 수 없으므로 derived table로 감쌈
+
+    Returns:
+        Delete or None: 이전 버전이 없으면 None
+    """
+    older = older_rule_versions(rule_version)
+    if not older:
+        return None
+
+    clean = CleanRiskResult.__table__
+    superseded = select(clean.c.raw_id).where(
+        clean.c.raw_id > start_id,
+        clean.c.raw_id <= end_id,
+        clean.c.rule_version.in_(older),
+    ).subquery('superseded')
+
+    return delete(clean).where(
+        clean.c.raw_id.in_(select(superseded.c.raw_id)),
+        clean.c.rule_version.in_([*older, rule_version]),
+    )
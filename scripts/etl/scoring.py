@@ -0,0 +1,262 @@
+"""
+Vectorized 위험요인 판정 엔진
+
+판정 규칙은 app/services/rules.py (API /simulate와 같은 정의)
+- batch 전체를 numpy 배열 연산으로 판정 (CompiledRules.evaluate_batch)
+- NULL은 NaN으로 표현
+- 판정 결과는 row 단위 로직과 동일 (tests/test_etl_scoring.py 참고)
+- 같은 규칙 정의로 SQL 판정 식도 생성 (pushdown.py에서 사용)
+"""
+
+import operator
+from functools import reduce
+
+import numpy as np
+from sqlalchemy import and_, or_, case, func, literal_column
+
+from app.services.rules import DEFAULT_RULE_VERSION, OPERATORS, RISK_GROUPS as GROUP_NAMES, get_rules
+
+# 기본 적용 규칙 버전 (clean_risk_result.rule_version)
+# - 아래 함수들은 rules 인자로 다른 버전(get_rules(버전))도 판정 가능
+RULE_VERSION = DEFAULT_RULE_VERSION
+RULES = get_rules(RULE_VERSION)
+
+# 판정에 필요한 raw 컬럼 (조회 순서)
+RAW_COLUMNS = [
+    'id', 'height', 'weight', 'systolic_bp', 'diastolic_bp',
+    'fasting_glucose', 'total_cholesterol', 'triglycerides',
+    'hdl_cholesterol', 'smoking_status'
+]
+
+# 기본 버전 규칙 (참고/테스트용)
+# 필수 값 (NULL 또는 0이면 무효)
+REQUIRED_COLUMNS = list(RULES.required)
+
+# 생물학적 범위 (벗어나면 무효)
+VALID_RANGES = RULES.definition['valid_ranges']
+
+# BMI 계산 가능 범위 (벗어나면 BMI = NULL)
+BMI_RANGES = RULES.definition['bmi_ranges']
+
+# 위험요인 판정 기준: clean_risk_result flag 컬럼 → [(컬럼, 연산자, 기준값), ...] (OR 조건)
+FLAG_RULES = {
+    spec['column']: spec['any'] for spec in RULES.definition['flags'].values()
+}
+
+# risk_group 코드 → ENUM 값
+RISK_GROUPS = np.array(GROUP_NAMES)
+
+
+def rows_to_columns(rows, columns=RAW_COLUMNS):
+    """
+    DB 조회 결과(tuple 리스트) → 컬럼별 배열
+
+    Args:
+        rows: [(id, height, ...), ...] (columns 순서)
+        columns: 컬럼명 리스트
+
+    Returns:
+        dict: {컬럼명: float64 배열 (NULL → NaN)}
+    """
+    # Row 객체 → tuple 변환 후 배열화 (numpy의 Row 속성 탐색 비용 회피)
+    matrix = np.array([tuple(row) for row in rows], dtype=np.float64)
+    matrix = matrix.reshape(len(rows), len(columns))
+    return {name: matrix[:, i] for i, name in enumerate(columns)}
+
+
+def calculate_bmi(height, weight, rules=RULES):
+    """
+    BMI 계산 (배열)
+
+    Returns:
+        np.ndarray: BMI (소수 첫째 자리 반올림, 계산 불가 시 NaN)
+    """
+    return rules.calculate_bmi_batch(height, weight)
+
+
+def is_valid_data(columns, rules=RULES):
+    """
+    데이터 유효성 마스크 (생물학적 범위)
+
+    Returns:
+        np.ndarray: bool 배열 (유효하면 True)
+    """
+    return rules.is_valid_batch(columns)
+
+
+def sql_valid_condition(model, rules=RULES):
+    """
+    is_valid_data()와 동일한 유효성 조건 (SQL WHERE 절)
+
+    DB에서 무효 행을 미리 걸러 조회량을 줄일 때 사용
+
+    Args:
+        model: RawHealthCheck (또는 동일 컬럼을 가진 테이블/alias)
+        rules: 판정 규칙 (CompiledRules)
+
+    Returns:
+        ColumnElement: AND 조건
+    """
+    conditions = []
+
+    for column in rules.required:
+        col = getattr(model, column)
+        conditions.append(col.isnot(None))
+        conditions.append(col != 0)
+
+    for column, (low, high) in rules.valid_ranges:
+        conditions.append(getattr(model, column).between(low, high))
+
+    return and_(*conditions)
+
+
+def sql_bmi_x10(model, rules=RULES):
+    """
+    calculate_bmi()의 반올림 전 값 × 10 (SQL)
+
+    `* 1E0`로 DOUBLE 연산 강제 (MySQL의 DECIMAL 나눗셈은 소수 4자리에서 잘림)
+
+    Returns:
+        ColumnElement: BMI × 10 (계산 불가 시 NULL)
+    """
+    height_m = model.height * literal_column('1E0') / 100
+
+    in_range = and_(*[
+        getattr(model, column).between(low, high)
+        for column, (low, high) in rules.definition['bmi_ranges'].items()
+    ])
+    return case((in_range, model.weight / (height_m * height_m) * 10), else_=None)
+
+
+def sql_round_bmi(bmi_x10):
+    """
+    sql_bmi_x10() → BMI (소수 첫째 자리)
+
+    numpy.round와 동일하게 (BMI × 10)을 round-half-even 후 / 10
+    (SQL ROUND()는 35.25 → 35.3처럼 half-up으로 처리되어 결과가 달라짐)
+
+    Returns:
+        ColumnElement: BMI (NULL 유지)
+    """
+    floor = func.floor(bmi_x10)
+    fraction = bmi_x10 - floor
+
+    return case(
+        (bmi_x10.is_(None), None),
+        (fraction > 0.5, floor + 1),
+        (fraction < 0.5, floor),
+        else_=floor + (floor - func.floor(floor / 2) * 2),  # 짝수 쪽으로
+    ) / 10
+
+
+def sql_score_columns(source, rules=RULES):
+    """
+    score_batch()와 동일한 판정 식 (SQL SELECT 컬럼)
+
+    규칙 정의에서 생성 → Python 판정과 같은 규칙 정의 사용
+
+    Args:
+        source: raw 컬럼 + 'bmi'(sql_round_bmi())를 포함한 subquery의 컬럼 (subquery.c)
+            (BMI 식이 flag/count/group마다 반복되지 않도록 subquery에서 한 번만 계산)
+        rules: 판정 규칙 (CompiledRules)
+
+    Returns:
+        dict: {clean_risk_result 컬럼명: ColumnElement}
+    """
+    # 7개 위험요인 (NULL 비교는 ELSE 0)
+    conditions = {}
+    for name, spec in rules.definition['flags'].items():
+        conditions[spec['column']] = or_(*[
+            OPERATORS[op](getattr(source, column), threshold)
+            for column, op, threshold in spec['any']
+        ])
+
+    flags = {flag: case((condition, 1), else_=0) for flag, condition in conditions.items()}
+
+    count = reduce(operator.add, flags.values())
+
+    zero_to_one, multiple, chd_equivalent = RISK_GROUPS.tolist()
+    chd_condition = or_(*[conditions[rules.flag_columns[name]] for name in rules.chd_equivalent])
+    group = case(
+        (chd_condition, chd_equivalent),
+        (count >= rules.multiple_risk_count, multiple),
+        else_=zero_to_one,
+    )
+
+    return {
+        'bmi': source.bmi,
+        **flags,
+        'risk_factor_count': count,
+        'risk_group': group,
+    }
+
+
+def score_batch(columns, rules=RULES):
+    """
+    Batch 위험요인 판정
+
+    Args:
+        columns: rows_to_columns() 결과
+        rules: 판정 규칙 (CompiledRules)
+
+    Returns:
+        dict: {
+            'valid': bool 배열,
+            'bmi': float 배열 (NaN = NULL),
+            'flag_*': bool 배열 (7개),
+            'risk_factor_count': int 배열,
+            'risk_group': str 배열
+        }
+    """
+    scored = rules.evaluate_batch(columns)
+
+    result = {
+        'valid': rules.is_valid_batch(columns),
+        'bmi': scored['bmi'],
+    }
+    for name, values in scored['flags'].items():
+        result[rules.flag_columns[name]] = values
+
+    result['risk_factor_count'] = scored['count']
+    result['risk_group'] = scored['group']
+    return result
+
+
+def to_clean_mappings(ids, scored, inference_time_ms=0, rule_version=RULE_VERSION):
+    """
+    판정 결과 → clean_risk_result INSERT용 dict 리스트 (유효 row만)
+
+    Args:
+        ids: raw_health_check.id 배열
+        scored: score_batch() 결과
+        inference_time_ms: row당 판정 시간 (ms)
+        rule_version: 적용 규칙 버전
+
+    Returns:
+        list[dict]: INSERT executemany 파라미터 (모든 dict가 동일한 키)
+    """
+    valid = scored['valid']
+    flag_names = list(FLAG_RULES)
+
+    raw_ids = ids[valid].astype(np.int64).tolist()
+    bmis = [None if np.isnan(b) else b for b in scored['bmi'][valid].tolist()]
+    flags = [scored[name][valid].tolist() for name in flag_names]
+    counts = scored['risk_factor_count'][valid].tolist()
+    groups = scored['risk_group'][valid].tolist()
+
+    mappings = []
+    for i, raw_id in enumerate(raw_ids):
+        mapping = {
+            'raw_id': raw_id,
+            'bmi': bmis[i],
+            'risk_factor_count': counts[i],
+            'risk_group': groups[i],
+            'rule_version': rule_version,
+            'invalid_flag': False,
+            'inference_time_ms': inference_time_ms,
+        }
+        for name, values in zip(flag_names, flags):
+            mapping[name] = values[i]
+        mappings.append(mapping)
+
+    return mappings
@@ -0,0 +1,73 @@
+"""
+/stats 캐시 pre-warming
+
+API 서버(gunicorn)와 별도 프로세스 하나에서 실행
+- worker마다 실행하면 같은 계산을 worker 수만큼 반복 → 배포 단위당 1개만 실행
+- 시작 시 + CACHE_PREWARM_INTERVAL초마다 fresh 기간이 끝나 가는 항목만 재계산
+- --once: 1회 실행 후 종료 (cron / 배포 후 hook용)
+
+Usage:
+    python scripts/prewarm_cache.py
+    python scripts/prewarm_cache.py --once
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# /stats/whatif 인구 snapshot은 이 프로세스에서 사용하지 않음
+os.environ.setdefault('WHATIF_SNAPSHOT_PRELOAD', 'false')
+
+from app import create_app  # noqa: E402
+from app.cache import run_prewarm, warm_paths  # noqa: E402
+
+# 미리 채워 둘 엔드포인트
+PREWARM_PATHS = ('/stats/risk', '/stats/age')
+
+
+def parse_args(default_interval):
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description='/stats 캐시 pre-warming')
+    parser.add_argument(
+        '--interval',
+        type=int,
+        default=default_interval,
+        help=f'주기 (초, 0이면 1회, 기본 CACHE_PREWARM_INTERVAL={default_interval})'
+    )
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='1회 실행 후 종료 (--interval은 재계산 기준으로만 사용)'
+    )
+    args = parser.parse_args()
+
+    if args.interval < 0:
+        parser.error('--interval must be >= 0')
+
+    return args
+
+
+def main():
+    app = create_app()
+    args = parse_args(app.config['CACHE_PREWARM_INTERVAL'])
+
+    if not app.config['REDIS_URL']:
+        print("❌ REDIS_URL is not set; nothing to pre-warm")
+        sys.exit(1)
+
+    if args.once:
+        warmed = warm_paths(app, PREWARM_PATHS, margin=args.interval)
+        print(f"🔥 Pre-warmed {warmed}/{len(PREWARM_PATHS)} endpoints")
+        return
+
+    print(f"🔥 Pre-warming {', '.join(PREWARM_PATHS)} every {args.interval}s")
+    run_prewarm(app, PREWARM_PATHS, args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,25 @@
 """
 pytest 설정 및 공통 fixture
 
-테스트용 Flask app, client, mock data 제공
+테스트용 Flask app, client, mock data, ETL용 in-memory SQLite DB 제공
 """
 
+import os
+import random
+import threading
+from types import SimpleNamespace
+
 import pytest
-from app import create_app
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+# 앱 생성마다 인구 snapshot을 DB에서 적재하지 않도록 (whatif 테스트는 요청 시 적재)
+os.environ.setdefault('WHATIF_SNAPSHOT_PRELOAD', 'false')
+
+from app import create_app  # noqa: E402
+from app.models.health_check import Base, RawHealthCheck, CleanRiskResult  # noqa: E402
+from app.models import etl_checkpoint  # noqa: E402,F401 (Base.metadata 등록)
+from app.services import rules  # noqa: E402
 
 
 @pytest.fixture
@@ -66,3 +80,293 @@ def healthy_patient_data():
         'hdl_cholesterol': 55,
         'smoking_status': 'never'
     }
+
+
+@pytest.fixture
+def candidate_rules(monkeypatch):
+    """검토용 rule_version 등록 (공복혈당 기준 126 → 110, 테스트 후 registry 원복)"""
+    monkeypatch.setattr(rules, 'RULE_DEFINITIONS', dict(rules.RULE_DEFINITIONS))
+    monkeypatch.setattr(rules, '_COMPILED', dict(rules._COMPILED))
+
+    definition = rules.derive_definition('guideline-v1', {'diabetes': {'fasting_glucose': 110}})
+    return rules.register_rules('glucose-110', definition)
+
+
+class FakeRedis:
+    """
+    Redis 대체 (dict 기반, decode_responses=False 동작 → 값은 bytes로 저장/조회)
+
+    cache 데코레이터 동작 확인용 (실제 Redis 없이)
+    """
+
+    def __init__(self):
+        self.store = {}
+        self.sets = {}
+        self.ttls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def encode(value):
+        """Redis 저장 형식 (str/int → bytes)"""
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode('utf-8')
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = self.encode(value)
+        self.ttls[key] = ttl
+        return True
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self._lock:
+            if nx and key in self.store:
+                return None
+            self.store[key] = self.encode(value)
+            return True
+
+    def eval(self, script, numkeys, *args):
+        """app.cache.RELEASE_LOCK_SCRIPT만 지원 (토큰 일치 시 삭제)"""
+        from app.cache import RELEASE_LOCK_SCRIPT
+        assert script == RELEASE_LOCK_SCRIPT
+        key, token = args
+        with self._lock:
+            if self.store.get(key) == self.encode(token):
+                del self.store[key]
+                return 1
+            return 0
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self.store.get(key, 0)) + 1
+            self.store[key] = self.encode(value)
+            return value
+
+    def sadd(self, key, *members):
+        with self._lock:
+            members_set = self.sets.setdefault(key, set())
+            before = len(members_set)
+            members_set.update(members)
+            return len(members_set) - before
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return key in self.store or key in self.sets
+
+    def rename(self, key, new_key):
+        import redis
+        with self._lock:
+            if key in self.sets:
+                self.sets[new_key] = self.sets.pop(key)
+            elif key in self.store:
+                self.store[new_key] = self.store.pop(key)
+            else:
+                raise redis.exceptions.ResponseError('no such key')
+            return True
+
+    def sscan_iter(self, key, count=None):
+        return iter(sorted(self.sets.get(key, ())))
+
+    def scan_iter(self, match=None, count=None):
+        import fnmatch
+        return iter([key for key in list(self.store) if fnmatch.fnmatchcase(key, match or '*')])
+
+    def unlink(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.store.pop(key, None) is not None or self.sets.pop(key, None) is not None:
+                self.ttls.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.store.pop(key, None) is not None:
+                self.ttls.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def keys(self, pattern):
+        import fnmatch
+        return [key for key in self.store if fnmatch.fnmatchcase(key, pattern)]
+
+
+class FakePipeline:
+    """FakeRedis pipeline (명령을 모아 execute()에서 순서대로 실행)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """app.cache 전역 Redis 클라이언트를 FakeRedis로 교체"""
+    from app import cache
+
+    client = FakeRedis()
+    monkeypatch.setattr(cache, '_redis_client', client)
+    monkeypatch.setattr(cache, '_breaker', None)
+    return client
+
+
+# ============================================================
+# ETL 테스트 공통 (scripts.etl 모듈은 pandas 의존 → 함수 안에서 import)
+# ============================================================
+
+def make_engine():
+    """전체 테이블 (raw, clean, etl_checkpoint) in-memory SQLite engine"""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db():
+    """in-memory SQLite 세션 (raw + clean + checkpoint 테이블)"""
+    session = sessionmaker(bind=make_engine())()
+    yield session
+    session.close()
+
+
+def make_raw_rows(n, seed=42):
+    """경계값, NULL, 0을 포함한 raw 데이터 생성 (scoring.RAW_COLUMNS 순서 tuple)"""
+    rng = random.Random(seed)
+
+    def pick(choices, low, high):
+        # 경계값/NULL 위주로 섞어서 생성
+        if rng.random() < 0.3:
+            return rng.choice(choices)
+        return rng.randint(low, high)
+
+    rows = []
+    for raw_id in range(1, n + 1):
+        rows.append((
+            raw_id,
+            pick([None, 0, 135, 140, 200, 205], 130, 210),          # height
+            pick([None, 0, 25, 30, 150, 155], 25, 160),             # weight
+            pick([None, 0, 69, 70, 139, 140, 250, 251], 60, 260),   # systolic_bp
+            pick([None, 0, 39, 40, 89, 90, 150, 151], 30, 160),     # diastolic_bp
+            pick([None, 0, 49, 50, 125, 126, 400, 401], 40, 420),   # fasting_glucose
+            pick([None, 0, 99, 100, 239, 240, 400, 401], 90, 420),  # total_cholesterol
+            pick([None, 0, 199, 200], 30, 500),                     # triglycerides
+            pick([None, 0, 39, 40], 20, 100),                       # hdl_cholesterol
+            pick([None, 1, 2, 3], 1, 3),                            # smoking_status
+        ))
+    return rows
+
+
+def to_raw_object(row):
+    """make_raw_rows() tuple → RawHealthCheck 형태 객체"""
+    from scripts.etl import scoring
+
+    return SimpleNamespace(**dict(zip(scoring.RAW_COLUMNS, row)))
+
+
+def insert_raw_rows(db, rows):
+    """make_raw_rows() 결과 → raw_health_check"""
+    from scripts.etl import scoring
+
+    db.execute(insert(RawHealthCheck.__table__), [
+        {**dict(zip(scoring.RAW_COLUMNS, row)), 'gender_code': 1, 'age_group_code': 10}
+        for row in rows
+    ])
+    db.commit()
+
+
+def stored_results(db):
+    """clean_risk_result → {raw_id: 판정 결과 dict}"""
+    from scripts.etl import scoring
+
+    results = {}
+    for clean in db.query(CleanRiskResult).all():
+        results[clean.raw_id] = {
+            'bmi': float(clean.bmi) if clean.bmi is not None else None,
+            'risk_factor_count': clean.risk_factor_count,
+            'risk_group': clean.risk_group,
+            **{flag: bool(getattr(clean, flag)) for flag in scoring.FLAG_RULES},
+        }
+    return results
+
+
+def expected_results(rows):
+    """Python(vectorized) 판정 → {raw_id: 판정 결과 dict} (stored_results()와 같은 형태)"""
+    from scripts.etl import scoring
+    from scripts.etl.process_clean import process_batch
+
+    columns = ['bmi', *scoring.FLAG_RULES, 'risk_factor_count', 'risk_group']
+    mappings, _ = process_batch(rows)
+    return {
+        m['raw_id']: {column: m[column] for column in columns}
+        for m in mappings
+    }
+
+
+def make_csv_rows():
+    """NHIS 형식 CSV 행 25개 (NULL, 미사용 컬럼 포함)"""
+    rows = []
+    for i in range(25):
+        rows.append({
+            '기준년도': 2024,
+            '가입자일련번호': 1000 + i,
+            '시도코드': 11,
+            '성별코드': 1 + i % 2,
+            '연령대코드(5세단위)': 5 + i % 14,
+            '신장(5cm단위)': 150 + 5 * (i % 8),
+            '체중(5kg단위)': 50 + 5 * (i % 10),
+            '허리둘레': None if i % 7 == 0 else 80 + i,
+            '시력(좌)': 1.0,  # 적재 대상 아님
+            '수축기혈압': 110 + i,
+            '이완기혈압': 70 + i,
+            '식전혈당(공복혈당)': None if i % 5 == 0 else 90 + i,
+            '총콜레스테롤': 180 + i,
+            '트리글리세라이드': None if i % 3 == 0 else 100 + i,
+            'HDL콜레스테롤': 50,
+            'LDL콜레스테롤': 110,
+            '흡연상태': 1 + i % 3,
+        })
+    return rows
+
+
+def write_csv(path, rows):
+    """cp949 CSV 저장"""
+    import pandas as pd
+
+    pd.DataFrame(rows).to_csv(path, index=False, encoding='cp949')
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """NHIS 형식 cp949 CSV 25행"""
+    return write_csv(tmp_path / 'health_check.csv', make_csv_rows())
+
+
+def loaded_rows(engine):
+    """raw_health_check 적재 결과 (load_raw.RAW_COLUMNS, id 순서)"""
+    from scripts.etl import load_raw
+
+    columns = [getattr(RawHealthCheck, name) for name in load_raw.RAW_COLUMNS]
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(select(*columns).order_by(RawHealthCheck.id))]
@@ -1,9 +1,11 @@
 """
 API 엔드포인트 테스트
 
-GET /health, /records, /stats, POST /simulate
+GET /health, /records, /stats, POST /stats/whatif, /simulate, /simulate/batch, /simulate/stream
 """
 
+import json
+
 import pytest
 
 
@@ -110,6 +112,33 @@ class TestStatsEndpoint:
             assert 'avg_risk_factor_count' in item
             assert 'high_risk_count' in item
 
+    def test_whatif_stats(self, client, auth_headers):
+        """POST /stats/whatif - 기준값 변경 시 위험군 분포"""
+        response = client.post('/stats/whatif', headers=auth_headers, json={
+            'thresholds': {'diabetes': {'fasting_glucose': 110}}
+        })
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['rule_version'] == 'guideline-v1'
+        assert set(data['baseline']) == set(data['whatif'])
+        assert 'changed_records' in data
+        assert 'flag_counts' in data
+        assert data['changed_records'] <= data['valid_records'] <= data['total_records']
+
+    @pytest.mark.parametrize('body', [
+        {'thresholds': {'diabetes': {'fasting_glucose': '110'}}},
+        {'thresholds': {'diabetes': {'systolic_bp': 110}}},
+        {'thresholds': {'unknown_flag': {'fasting_glucose': 110}}},
+        {'thresholds': {}},
+        {'thresholds': {'diabetes': {'fasting_glucose': 110}}, 'rule_version': 'guideline-v0'},
+    ])
+    def test_whatif_invalid_thresholds(self, client, auth_headers, body):
+        """잘못된 기준값 / rule_version → 400"""
+        response = client.post('/stats/whatif', headers=auth_headers, json=body)
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Validation Error'
+
 
 class TestSimulateEndpoint:
     """Simulate 엔드포인트 테스트"""
@@ -196,6 +225,32 @@ class TestSimulateEndpoint:
         )
         assert response.status_code == 400
 
+    def test_simulate_rule_version(self, client, auth_headers, healthy_patient_data, candidate_rules):
+        """POST /simulate?rule_version= - 요청한 버전 규칙으로 판정"""
+        healthy_patient_data['fasting_glucose'] = 115
+
+        default = client.post('/simulate', json=healthy_patient_data, headers=auth_headers).get_json()
+        candidate = client.post(
+            '/simulate?rule_version=glucose-110',
+            json=healthy_patient_data,
+            headers=auth_headers
+        ).get_json()
+
+        assert default['result']['rule_version'] == 'guideline-v1'
+        assert default['result']['flags']['diabetes'] is False
+        assert candidate['result']['rule_version'] == 'glucose-110'
+        assert candidate['result']['flags']['diabetes'] is True
+
+    def test_simulate_unknown_rule_version(self, client, auth_headers, sample_patient_data):
+        """POST /simulate?rule_version= - 없는 버전 → 400"""
+        response = client.post(
+            '/simulate?rule_version=guideline-v0',
+            json=sample_patient_data,
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+        assert 'guideline-v1' in response.get_json()['details']['available']
+
     def test_simulate_invalid_smoking_status(self, client, auth_headers, sample_patient_data):
         """POST /simulate - 잘못된 smoking_status"""
         sample_patient_data['smoking_status'] = 'sometimes'
@@ -205,3 +260,145 @@ class TestSimulateEndpoint:
             headers=auth_headers
         )
         assert response.status_code == 400
+
+    def test_simulate_type_coercion(self, client, auth_headers, sample_patient_data):
+        """POST /simulate - 숫자 문자열은 변환, 숫자가 아닌 값은 400 (500 아님)"""
+        sample_patient_data['height'] = '170'
+        response = client.post('/simulate', json=sample_patient_data, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.get_json()['input']['bmi'] == 29.4
+
+        sample_patient_data['height'] = 'tall'
+        response = client.post('/simulate', json=sample_patient_data, headers=auth_headers)
+        assert response.status_code == 400
+
+        data = response.get_json()
+        assert data['details'] == {'height': 'Must be a number'}
+        assert data['errors'] == [{'field': 'height', 'code': 'type', 'message': 'Must be a number'}]
+
+    def test_simulate_memo(self, client, auth_headers, sample_patient_data):
+        """POST /simulate - 같은 입력 반복 → memo hit, 응답 동일"""
+        first = client.post('/simulate', json=sample_patient_data, headers=auth_headers)
+        second = client.post('/simulate', json=sample_patient_data, headers=auth_headers)
+
+        assert first.headers['X-Memo'] == 'MISS'
+        assert second.headers['X-Memo'] == 'HIT'
+        assert second.get_json()['result']['flags'] == first.get_json()['result']['flags']
+
+        stats = client.get('/simulate/memo', headers=auth_headers).get_json()
+        assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+class TestSimulateBatchEndpoint:
+    """일괄 계산 API 테스트"""
+
+    def test_batch_matches_single(self, client, auth_headers,
+                                  sample_patient_data, healthy_patient_data):
+        """POST /simulate/batch - 항목별 결과 = POST /simulate 결과"""
+        payloads = [sample_patient_data, healthy_patient_data]
+        response = client.post('/simulate/batch', json=payloads, headers=auth_headers)
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['summary']['total'] == 2
+        assert data['summary']['succeeded'] == 2
+        assert data['summary']['failed'] == 0
+        assert 'inference_time_ms' in data['summary']
+
+        for index, payload in enumerate(payloads):
+            single = client.post('/simulate', json=payload, headers=auth_headers).get_json()
+            item = data['results'][index]
+            assert item['index'] == index
+            assert item['input'] == single['input']
+
+            for key in ('risk_factor_count', 'risk_group', 'flags', 'explanations', 'rule_version'):
+                assert item['result'][key] == single['result'][key]
+
+    def test_batch_item_errors(self, client, auth_headers, sample_patient_data):
+        """POST /simulate/batch - 잘못된 항목만 오류, 나머지는 계산"""
+        invalid = dict(sample_patient_data, systolic_bp=300)
+        payloads = [sample_patient_data, invalid, {'age_group': 12}, 'not-an-object']
+
+        response = client.post('/simulate/batch', json=payloads, headers=auth_headers)
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['summary']['succeeded'] == 1
+        assert data['summary']['failed'] == 3
+
+        results = data['results']
+        assert 'result' in results[0]
+        assert results[1]['error'] == 'Validation Error'
+        assert 'systolic_bp' in results[1]['details']
+        assert 'gender' in results[2]['details']['missing']
+        assert results[3]['error'] == 'Validation Error'
+
+    def test_batch_limit(self, app, client, auth_headers, sample_patient_data):
+        """POST /simulate/batch - 최대 항목 수 초과 → 413"""
+        app.config['SIMULATE_BATCH_MAX_ITEMS'] = 2
+        response = client.post(
+            '/simulate/batch',
+            json=[sample_patient_data] * 3,
+            headers=auth_headers
+        )
+        assert response.status_code == 413
+        assert response.get_json()['details']['max_items'] == 2
+
+    def test_batch_requires_array(self, client, auth_headers, sample_patient_data):
+        """POST /simulate/batch - 배열이 아닌 요청 → 400"""
+        response = client.post('/simulate/batch', json=sample_patient_data, headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestSimulateStreamEndpoint:
+    """NDJSON 스트리밍 API 테스트"""
+
+    @staticmethod
+    def post_ndjson(client, headers, lines):
+        """NDJSON 요청 → 응답 줄 파싱"""
+        body = ''.join(line + '\n' for line in lines)
+        response = client.post(
+            '/simulate/stream',
+            data=body,
+            content_type='application/x-ndjson',
+            headers=headers
+        )
+        return response, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    def test_stream_micro_batches(self, app, client, auth_headers,
+                                  sample_patient_data, healthy_patient_data):
+        """POST /simulate/stream - 여러 micro-batch에 걸쳐 순서대로 결과 반환"""
+        app.config['SIMULATE_STREAM_BATCH_SIZE'] = 2
+        payloads = [sample_patient_data, healthy_patient_data] * 3
+        response, lines = self.post_ndjson(client, auth_headers, [json.dumps(p) for p in payloads])
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [line['index'] for line in lines[:-1]] == list(range(6))
+
+        batch = client.post('/simulate/batch', json=payloads, headers=auth_headers).get_json()
+        for streamed, batched in zip(lines, batch['results']):
+            assert streamed['input'] == batched['input']
+            assert streamed['result']['flags'] == batched['result']['flags']
+
+        assert lines[-1]['summary']['total'] == 6
+        assert lines[-1]['summary']['succeeded'] == 6
+
+    def test_stream_item_errors(self, client, auth_headers, sample_patient_data):
+        """POST /simulate/stream - 잘못된 줄만 오류, 빈 줄 무시"""
+        invalid = dict(sample_patient_data, gender=3)
+        response, lines = self.post_ndjson(client, auth_headers, [
+            json.dumps(sample_patient_data), '', '{not json', json.dumps(invalid)
+        ])
+
+        assert response.status_code == 200
+        assert 'result' in lines[0]
+        assert lines[1]['message'] == 'Invalid JSON'
+        assert 'gender' in lines[2]['details']
+        assert lines[-1]['summary']['total'] == 3
+        assert lines[-1]['summary']['failed'] == 2
+
+    def test_stream_requires_ndjson(self, client, auth_headers, sample_patient_data):
+        """POST /simulate/stream - NDJSON이 아닌 요청 → 415"""
+        response = client.post('/simulate/stream', json=sample_patient_data, headers=auth_headers)
+        assert response.status_code == 415
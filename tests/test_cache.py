@@ -6,9 +6,19 @@ Redis 캐싱 기능 테스트
 
 import pytest
 import json
+import threading
+import time
 import redis
 from decimal import Decimal
-from app.cache import DecimalEncoder, get_redis_client
+from app.cache import DecimalEncoder
+
+
+def redis_available():
+    """로컬 Redis 연결 가능 여부 (연결 실패 시 False)"""
+    try:
+        return redis.from_url("redis://localhost:6379/0", socket_connect_timeout=1).ping()
+    except redis.exceptions.ConnectionError:
+        return False
 
 
 class TestDecimalEncoder:
@@ -63,19 +73,13 @@ class TestCacheDecorator:
 class TestRedisConnection:
     """Redis 연결 테스트 (실제 Redis 필요)"""
 
-    @pytest.mark.skipif(
-        not redis.from_url("redis://localhost:6379/0", socket_connect_timeout=1).ping(),
-        reason="Redis not available"
-    )
+    @pytest.mark.skipif(not redis_available(), reason="Redis not available")
     def test_redis_ping(self):
         """Redis 서버 연결 확인"""
         r = redis.from_url("redis://localhost:6379/0")
         assert r.ping() == True
 
-    @pytest.mark.skipif(
-        not redis.from_url("redis://localhost:6379/0", socket_connect_timeout=1).ping(),
-        reason="Redis not available"
-    )
+    @pytest.mark.skipif(not redis_available(), reason="Redis not available")
     def test_redis_set_get(self):
         """Redis 기본 SET/GET 동작"""
         r = redis.from_url("redis://localhost:6379/0", decode_responses=True)
@@ -93,10 +97,7 @@ class TestRedisConnection:
         # 정리
         r.delete(key)
 
-    @pytest.mark.skipif(
-        not redis.from_url("redis://localhost:6379/0", socket_connect_timeout=1).ping(),
-        reason="Redis not available"
-    )
+    @pytest.mark.skipif(not redis_available(), reason="Redis not available")
     def test_redis_json_serialization(self):
         """Redis JSON 직렬화/역직렬화"""
         r = redis.from_url("redis://localhost:6379/0", decode_responses=True)
@@ -121,3 +122,542 @@ class TestRedisConnection:
 
         # 정리
         r.delete(key)
+
+
+class TestCachedResponse:
+    """캐시 저장/히트 (FakeRedis)"""
+
+    def test_miss_then_hit(self, app, client, auth_headers, fake_redis):
+        """미스 → 저장, 히트 → 저장된 JSON bytes 그대로 응답 (cached=True)"""
+        first = client.get('/stats/risk', headers=auth_headers)
+        assert first.get_json()['cached'] is False
+        assert len(fake_redis.store) == 1
+
+        second = client.get('/stats/risk', headers=auth_headers)
+        assert second.status_code == 200
+        assert second.mimetype == 'application/json'
+
+        data = second.get_json()
+        assert data['cached'] is True
+        assert {**data, 'cached': False} == first.get_json()
+        key, value = next(iter(fake_redis.store.items()))
+        etag, body = value.split(b'\n', 1)
+        assert second.get_data() == body
+
+        # L2 히트 → L1에도 Redis 값과 같은 bytes body 저장 (str 변환 없음)
+        for tier in app.extensions['cache_tiers'].values():
+            tier.l1.clear()
+        client.get('/stats/risk', headers=auth_headers)
+        l1_entry = app.extensions['cache_tiers']['get_risk_stats'].l1.get(key)
+        assert l1_entry[2] == body
+        assert isinstance(l1_entry[2], bytes)
+
+    def test_etag_not_modified(self, client, auth_headers, fake_redis):
+        """미스/히트 응답 같은 ETag, If-None-Match 일치 → 304 (body 없음)"""
+        first = client.get('/stats/age', headers=auth_headers)
+        second = client.get('/stats/age', headers=auth_headers)
+
+        etag = first.headers['ETag']
+        assert etag.startswith('W/"')
+        assert second.headers['ETag'] == etag
+
+        not_modified = client.get('/stats/age', headers={**auth_headers, 'If-None-Match': etag})
+        assert not_modified.status_code == 304
+        assert not_modified.get_data() == b''
+        assert not_modified.headers['ETag'] == etag
+
+        changed = client.get('/stats/age', headers={**auth_headers, 'If-None-Match': 'W/"stale"'})
+        assert changed.status_code == 200
+        assert changed.get_json()['cached'] is True
+
+
+class TestSingleFlight:
+    """캐시 미스 동시 요청 → 원본 함수 1회 실행"""
+
+    def add_slow_endpoint(self, app, delay=0.2):
+        """느린 집계 대신 호출 횟수를 세는 캐시 엔드포인트"""
+        from app.cache import cached
+
+        calls = []
+
+        @cached(ttl=60)
+        def slow_stats():
+            calls.append(1)
+            time.sleep(delay)
+            return {'value': len(calls)}
+
+        app.add_url_rule('/test/slow', 'slow_stats', slow_stats)
+        return calls
+
+    def request_concurrently(self, app, count):
+        """count개 요청 동시 실행 → 응답 JSON 리스트"""
+        results = [None] * count
+
+        def worker(i):
+            results[i] = app.test_client().get('/test/slow').get_json()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_miss_coalesced(self, app, fake_redis):
+        """락 보유 요청만 실행, 나머지는 저장된 결과 응답"""
+        calls = self.add_slow_endpoint(app)
+
+        results = self.request_concurrently(app, 8)
+
+        assert len(calls) == 1
+        assert all(result['value'] == 1 for result in results)
+        assert sum(result['cached'] is False for result in results) == 1
+        assert not any(key.startswith('lock:') for key in fake_redis.store)
+
+    def test_wait_timeout_computes(self, app, fake_redis):
+        """락 보유 worker가 결과를 못 채우면 대기 후 직접 실행"""
+        app.config['CACHE_LOCK_WAIT'] = 0.1
+        calls = self.add_slow_endpoint(app, delay=0)
+        fake_redis.set("lock:cache:slow_stats:guideline-v1:g0:?", 'other-worker')
+
+        result = app.test_client().get('/test/slow').get_json()
+
+        assert result == {'value': 1, 'cached': False}
+        assert fake_redis.get("lock:cache:slow_stats:guideline-v1:g0:?") == b'other-worker'
+
+
+class TestStaleWhileRevalidate:
+    """soft TTL 지난 항목 → stale 응답 + background 재계산"""
+
+    def add_counting_endpoint(self, app):
+        """호출 횟수를 응답하는 캐시 엔드포인트"""
+        from app.cache import cached
+
+        calls = []
+
+        @cached(ttl=60)
+        def counting_stats():
+            calls.append(1)
+            return {'value': len(calls)}
+
+        app.add_url_rule('/test/counting', 'counting_stats', counting_stats)
+        return calls
+
+    def expire_soft(self, app, fake_redis, key):
+        """저장된 항목의 fresh_until을 과거로 변경 (hard TTL 전, L1 사본 제거)"""
+        from app.cache import decode_entry, encode_entry
+
+        etag, _, body = decode_entry(fake_redis.store[key])
+        fake_redis.store[key] = encode_entry(etag, time.time() - 1, body)
+        for tier in app.extensions.get('cache_tiers', {}).values():
+            tier.l1.clear()
+
+    def test_stale_served_then_refreshed(self, app, fake_redis):
+        """stale 항목 즉시 응답, 재계산은 background에서 1회"""
+        calls = self.add_counting_endpoint(app)
+        client = app.test_client()
+        key = "cache:counting_stats:guideline-v1:g0:?"
+
+        assert client.get('/test/counting').get_json() == {'value': 1, 'cached': False}
+        assert fake_redis.ttls[key] == 60 + app.config['CACHE_STALE_TTL']
+
+        self.expire_soft(app, fake_redis, key)
+        stale = client.get('/test/counting').get_json()
+        assert stale == {'value': 1, 'cached': True}
+
+        deadline = time.monotonic() + 2
+        while f"lock:{key}" in fake_redis.store or len(calls) < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert len(calls) == 2
+        assert client.get('/test/counting').get_json() == {'value': 2, 'cached': True}
+
+    def test_refresh_keeps_request_context(self, app, fake_redis):
+        """background 재계산도 원래 요청의 endpoint, query, host, 헤더로 실행"""
+        from flask import request
+        from app.cache import cached
+
+        seen = []
+
+        @cached(ttl=60)
+        def context_stats():
+            seen.append((request.endpoint, request.args.get('gender'),
+                         request.host, request.headers.get('X-Trace-Id')))
+            return {'value': len(seen)}
+
+        app.add_url_rule('/test/context', 'context_stats', context_stats)
+        client = app.test_client()
+        key = "cache:context_stats:guideline-v1:g0:?gender=M"
+        get = lambda: client.get('/test/context?gender=M', base_url='http://api.example.com',
+                                 headers={'X-Trace-Id': 'abc'})
+
+        get()
+        self.expire_soft(app, fake_redis, key)
+        assert get().get_json() == {'value': 1, 'cached': True}
+
+        deadline = time.monotonic() + 2
+        while f"lock:{key}" in fake_redis.store or len(seen) < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert seen == [('context_stats', 'M', 'api.example.com', 'abc')] * 2
+
+    def test_stale_disabled(self, app, fake_redis):
+        """CACHE_STALE_TTL=0 → Redis 만료 = soft TTL"""
+        app.config['CACHE_STALE_TTL'] = 0
+        self.add_counting_endpoint(app)
+
+        app.test_client().get('/test/counting')
+        assert fake_redis.ttls["cache:counting_stats:guideline-v1:g0:?"] == 60
+
+    def test_prewarm(self, app, client, auth_headers, fake_redis):
+        """pre-warming 후 첫 요청부터 캐시 히트, fresh 항목은 재계산 생략"""
+        from app.cache import warm_paths
+
+        assert warm_paths(app, ['/stats/risk', '/stats/age']) == 2
+        assert warm_paths(app, ['/stats/risk', '/stats/age']) == 0
+        assert len(fake_redis.store) == 2
+
+        response = client.get('/stats/risk', headers=auth_headers)
+        assert response.get_json()['cached'] is True
+
+        with app.test_request_context('/stats/risk'):
+            view = app.view_functions['stats.get_risk_stats']
+            assert view.cache_warm(margin=0) is False
+            assert view.cache_warm(margin=120) is True
+
+
+class TestTwoTierCache:
+    """worker 메모리 L1 → Redis(L2)"""
+
+    def test_l1_hit_skips_redis(self, client, auth_headers, fake_redis, monkeypatch):
+        """L1 fresh 항목은 Redis 조회 없이 응답 (같은 body/ETag)"""
+        first = client.get('/stats/risk', headers=auth_headers)
+        second = client.get('/stats/risk', headers=auth_headers)
+
+        monkeypatch.setattr(fake_redis, 'get', lambda key: pytest.fail('Redis GET on L1 hit'))
+        third = client.get('/stats/risk', headers=auth_headers)
+
+        assert third.get_data() == second.get_data()
+        assert third.headers['ETag'] == first.headers['ETag']
+        assert third.get_json()['cached'] is True
+
+        stats = client.get('/stats/cache', headers=auth_headers).get_json()['get_risk_stats']
+        assert stats['l1']['hits'] == 2
+        assert stats['l2'] == {'hits': 0, 'misses': 1, 'hit_rate': 0}
+
+    def test_l1_serves_while_breaker_open(self, app, client, auth_headers, fake_redis, monkeypatch):
+        """breaker open (Redis 장애) 중에도 L1 fresh 항목 응답, generation 확인도 Redis 호출 없음"""
+        from app import cache
+
+        first = client.get('/stats/risk', headers=auth_headers)
+
+        with app.app_context():
+            breaker = cache.get_breaker()
+            for _ in range(app.config['REDIS_BREAKER_THRESHOLD']):
+                breaker.record_failure(redis.exceptions.ConnectionError('down'))
+        assert breaker.state == breaker.OPEN
+
+        # worker 보관 generation 만료 → L1 조회 키는 마지막으로 확인한 generation 사용
+        generation, _ = app.extensions['cache_generation']
+        app.extensions['cache_generation'] = (generation, 0)
+        monkeypatch.setattr(fake_redis, 'get', lambda key: pytest.fail('Redis GET while breaker open'))
+
+        response = client.get('/stats/risk', headers=auth_headers)
+
+        assert response.get_json()['cached'] is True
+        assert response.headers['ETag'] == first.headers['ETag']
+        assert breaker.stats()['short_circuited'] == 0
+
+    def test_l1_disabled(self, app, client, auth_headers, fake_redis):
+        """CACHE_L1_SIZE=0 → 매 요청 Redis 조회"""
+        app.config['CACHE_L1_SIZE'] = 0
+        for _ in range(3):
+            client.get('/stats/age', headers=auth_headers)
+
+        stats = client.get('/stats/cache', headers=auth_headers).get_json()['get_age_stats']
+        assert stats['l1']['size'] == 0
+        assert stats['l2'] == {'hits': 2, 'misses': 1, 'hit_rate': 0.667}
+
+    def test_per_endpoint_config(self, app, fake_redis):
+        """데코레이터 인자로 엔드포인트별 L1 크기 지정 (LRU 제거)"""
+        from app.cache import cached
+
+        @cached(ttl=60, l1_size=2)
+        def item_stats(item_id):
+            return {'item_id': item_id}
+
+        app.add_url_rule('/test/items/<int:item_id>', 'item_stats', item_stats)
+        client = app.test_client()
+        for item_id in (1, 2, 3):
+            client.get(f'/test/items/{item_id}')
+
+        tier = app.extensions['cache_tiers']['item_stats']
+        assert tier.l1.stats()['size'] == 2
+        assert tier.l1.stats()['maxsize'] == 2
+
+
+class TestCacheKey:
+    """정규화된 캐시 키 (인자/query 순서 무관, generation으로 무효화)"""
+
+    def test_canonical_key(self):
+        """kwargs/query 순서, 공백, 빈 값 무관하게 같은 키"""
+        from app.cache import make_cache_key
+
+        first = make_cache_key(
+            'stats.get_age_stats', 'guideline-v1', 3,
+            kwargs={'b': 2, 'a': 1}, query=[('limit', ' 10'), ('gender', '1'), ('empty', '')]
+        )
+        second = make_cache_key(
+            'stats.get_age_stats', 'guideline-v1', 3,
+            kwargs={'a': 1, 'b': 2}, query=[('gender', '1'), ('limit', '10')]
+        )
+        assert first == second == 'cache:stats.get_age_stats:guideline-v1:g3:a=1&b=2?gender=1&limit=10'
+
+    def test_no_collision(self):
+        """view 인자/query 구분, 구분자 포함 값 이스케이프"""
+        from app.cache import make_cache_key
+
+        keys = {
+            make_cache_key('e', 'v', 0, kwargs={'item_id': 1}, query=[('item_id', '2')]),
+            make_cache_key('e', 'v', 0, kwargs={'item_id': 2}, query=[('item_id', '1')]),
+            make_cache_key('e', 'v', 0, query=[('a', '1&b=2')]),
+            make_cache_key('e', 'v', 0, query=[('a', '1'), ('b', '2')]),
+            make_cache_key('e', 'v-2', 0),
+            make_cache_key('e', 'v', 1),
+        }
+        assert len(keys) == 6
+
+    def test_query_variants_cached_separately(self, app, fake_redis):
+        """query string별 캐시 항목 (파라미터 순서만 다르면 같은 항목)"""
+        from flask import request
+        from app.cache import cached
+
+        @cached(ttl=60)
+        def echo_stats():
+            return {'gender': request.args.get('gender')}
+
+        app.add_url_rule('/test/echo', 'echo_stats', echo_stats)
+        client = app.test_client()
+
+        assert client.get('/test/echo?gender=1&x=a').get_json() == {'gender': '1', 'cached': False}
+        assert client.get('/test/echo?gender=2&x=a').get_json() == {'gender': '2', 'cached': False}
+        assert client.get('/test/echo?x=a&gender=1').get_json() == {'gender': '1', 'cached': True}
+        assert len(fake_redis.store) == 2
+
+    def test_generation_bump_invalidates(self, app, client, auth_headers, fake_redis):
+        """generation 증가 → 다음 요청부터 새 키 (이전 키 삭제 없음)"""
+        from app.cache import bump_generation
+
+        client.get('/stats/risk', headers=auth_headers)
+        assert client.get('/stats/risk', headers=auth_headers).get_json()['cached'] is True
+
+        assert bump_generation(fake_redis) == 1
+        app.extensions.pop('cache_generation')  # worker 보관 generation 만료
+
+        assert client.get('/stats/risk', headers=auth_headers).get_json()['cached'] is False
+        assert sorted(key.split(':')[3] for key in fake_redis.store if key.startswith('cache:')) == ['g0', 'g1']
+
+
+class TestInvalidation:
+    """tag set / SCAN 기반 무효화 (KEYS 미사용)"""
+
+    def test_invalidate_tags(self, app, client, auth_headers, fake_redis):
+        """endpoint tag → 해당 항목만, 공통 tag('stats') → 전체"""
+        from app.cache import invalidate_tags
+
+        client.get('/stats/risk', headers=auth_headers)
+        client.get('/stats/age', headers=auth_headers)
+        assert len(fake_redis.sets['tag:stats']) == 2
+
+        with app.app_context():
+            assert invalidate_tags('stats.get_risk_stats') == 1
+        assert client.get('/stats/age', headers=auth_headers).get_json()['cached'] is True
+        assert client.get('/stats/risk', headers=auth_headers).get_json()['cached'] is False
+
+        with app.app_context():
+            assert invalidate_tags('stats', 'unknown') == 2
+        assert not [key for key in fake_redis.store if key.startswith('cache:')]
+        assert not [key for key in fake_redis.sets if 'invalidating' in key]
+        assert client.get('/stats/age', headers=auth_headers).get_json()['cached'] is False
+
+    def test_etl_invalidation(self, app, client, auth_headers, fake_redis, monkeypatch):
+        """ETL 무효화 → generation 증가 + 'stats' tag 항목 삭제"""
+        from app import cache
+        from scripts.etl.cache import invalidate_api_cache
+
+        monkeypatch.setattr(cache, 'connect_redis', lambda url: fake_redis)
+        client.get('/stats/risk', headers=auth_headers)
+        client.get('/stats/age', headers=auth_headers)
+
+        assert invalidate_api_cache('redis://test', chunk_size=1) == 1
+        assert invalidate_api_cache(None, chunk_size=1) is None
+        assert not [key for key in fake_redis.store if key.startswith('cache:')]
+        assert not [key for key in fake_redis.sets if 'invalidating' in key]
+
+    def test_unlink_chunked(self, fake_redis, monkeypatch):
+        """chunk_size개씩 UNLINK, pipeline 전송 횟수 제한"""
+        from app.cache import unlink_keys
+
+        for i in range(25):
+            fake_redis.setex(f'cache:k{i}', 60, 'v')
+        calls, executes = [], []
+        unlink, pipeline = fake_redis.unlink, fake_redis.pipeline
+        monkeypatch.setattr(fake_redis, 'unlink', lambda *keys: calls.append(keys) or unlink(*keys))
+
+        def counting_pipeline(transaction=True):
+            pipe = pipeline(transaction)
+            execute = pipe.execute
+            pipe.execute = lambda: executes.append(1) or execute()
+            return pipe
+        monkeypatch.setattr(fake_redis, 'pipeline', counting_pipeline)
+
+        assert unlink_keys(fake_redis, iter(list(fake_redis.store)), 10, chunks_per_pipeline=2) == 25
+        assert [len(keys) for keys in calls] == [10, 10, 5]
+        assert len(executes) == 2
+        assert fake_redis.store == {}
+
+    def test_clear_pattern_uses_scan(self, app, fake_redis, monkeypatch):
+        """clear_cache_pattern → SCAN + UNLINK (generation 키 유지)"""
+        from app.cache import GENERATION_KEY, clear_cache_pattern
+
+        monkeypatch.setattr(fake_redis, 'keys', lambda pattern: pytest.fail('KEYS called'))
+        fake_redis.incr(GENERATION_KEY)
+        for i in range(3):
+            fake_redis.setex(f'cache:stats.get_age_stats:v:g1:?page={i}', 60, 'v')
+        fake_redis.setex('cache:stats.get_risk_stats:v:g1:?', 60, 'v')
+
+        with app.app_context():
+            assert clear_cache_pattern('cache:stats.get_age_stats:*') == 3
+        assert sorted(fake_redis.store) == ['cache:stats.get_risk_stats:v:g1:?', GENERATION_KEY]
+
+
+class TestCircuitBreaker:
+    """Redis 장애 → breaker open (Redis 호출 생략), PING 성공 시 복구"""
+
+    def wait_settled(self, breaker):
+        """background probe 완료 대기"""
+        deadline = time.monotonic() + 2
+        while breaker.state == breaker.HALF_OPEN:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_backoff_and_recovery(self):
+        """연속 실패 → open, probe 실패마다 대기 2배 (상한), probe 성공 → closed"""
+        from app.cache import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=2, base_delay=10, max_delay=25)
+        breaker.record_failure(redis.exceptions.ConnectionError('down'))
+        assert breaker.allow() is True
+        breaker.record_failure(redis.exceptions.ConnectionError('down'))
+        assert breaker.state == breaker.OPEN
+        assert 9 < breaker.stats()['retry_in'] <= 10
+
+        probes = []
+
+        def failing_probe():
+            probes.append(1)
+            raise redis.exceptions.ConnectionError('still down')
+
+        assert breaker.allow(probe=failing_probe) is False
+        assert probes == []  # 재시도 시각 전에는 probe 없음
+
+        for expected_delay in (20, 25):
+            breaker.retry_at = 0
+            assert breaker.allow(probe=failing_probe) is False
+            self.wait_settled(breaker)
+            assert breaker.state == breaker.OPEN
+            assert expected_delay - 1 < breaker.stats()['retry_in'] <= expected_delay
+
+        breaker.retry_at = 0
+        assert breaker.allow(probe=lambda: True) is False
+        self.wait_settled(breaker)
+        assert breaker.state == breaker.CLOSED
+        assert breaker.allow() is True
+        assert breaker.stats()['trips'] == 3
+
+    def test_outage_skips_redis(self, app, client, auth_headers, fake_redis, monkeypatch):
+        """임계치 이후 요청은 Redis 호출 없이 DB 결과 응답"""
+        calls = []
+
+        def unavailable(key):
+            calls.append(key)
+            raise redis.exceptions.ConnectionError('Connection refused')
+
+        monkeypatch.setattr(fake_redis, 'get', unavailable)
+        monkeypatch.setattr(fake_redis, 'ping', lambda: unavailable('ping'))
+
+        for _ in range(5):
+            response = client.get('/stats/risk', headers=auth_headers)
+            assert response.status_code == 200
+            assert 'risk_distribution' in response.get_json()
+
+        assert len(calls) == app.config['REDIS_BREAKER_THRESHOLD']
+        health = client.get('/stats/redis', headers=auth_headers).get_json()
+        assert health['breaker']['state'] == 'open'
+        assert health['breaker']['short_circuited'] == 2
+        assert client.get('/health').get_json()['redis'] == 'open'
+
+    def test_pool_from_config(self, app, monkeypatch):
+        """thread 공유 ConnectionPool (크기/timeout 설정값, 연결은 첫 명령 시)"""
+        from app import cache
+
+        monkeypatch.setattr(cache, '_redis_client', None)
+        monkeypatch.setattr(cache, '_breaker', None)
+        app.config.update(REDIS_URL='redis://localhost:6399/0', REDIS_MAX_CONNECTIONS=7)
+
+        with app.app_context():
+            client = cache.get_redis_client()
+            assert cache.get_redis_client() is client
+            assert client.connection_pool.max_connections == 7
+            assert client.connection_pool.connection_kwargs['socket_timeout'] == 2
+            assert cache.redis_health()['pool']['created'] == 0
+
+
+class TestCacheErrors:
+    """원본 함수 예외 / Redis 오류 처리 (원본 함수 1회만 실행)"""
+
+    def add_endpoint(self, app, fail=False):
+        from app.cache import cached
+
+        calls = []
+
+        @cached(ttl=60)
+        def error_stats():
+            calls.append(1)
+            if fail:
+                raise LookupError('aggregation failed')
+            return {'value': len(calls)}
+
+        app.add_url_rule('/test/errors', 'error_stats', error_stats)
+        return calls
+
+    def test_function_error_propagates(self, app, fake_redis):
+        """원본 함수 예외 → 그대로 전달 (재실행/breaker 기록/락 잔존 없음)"""
+        from app import cache
+
+        calls = self.add_endpoint(app, fail=True)
+        with pytest.raises(LookupError):
+            app.test_client().get('/test/errors')
+
+        assert len(calls) == 1
+        assert cache._breaker.failures == 0
+        assert not [key for key in fake_redis.store if key.startswith('lock:')]
+
+    def test_store_failure_returns_computed(self, app, fake_redis, monkeypatch):
+        """원본 함수 실행 후 Redis 저장 실패 → 계산 결과 응답 (재실행 없음), breaker 기록"""
+        from app import cache
+
+        calls = self.add_endpoint(app)
+
+        def unavailable(*args, **kwargs):
+            raise redis.exceptions.ConnectionError('Connection reset')
+
+        monkeypatch.setattr(fake_redis, 'setex', unavailable)
+        response = app.test_client().get('/test/errors')
+
+        assert response.get_json() == {'value': 1}
+        assert len(calls) == 1
+        assert cache._breaker.failures == 1
+        assert not [key for key in fake_redis.store if key.startswith('lock:')]
@@ -0,0 +1,88 @@
+"""
+Keyset batch 조회 테스트
+
+iter_keyset_batches: id 순서, 누락/중복 없음, 범위 제한
+split_id_ranges: 병렬 shard 분할
+"""
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.health_check import RawHealthCheck
+from scripts.etl.batching import iter_keyset_batches
+from scripts.etl.process_clean import split_id_ranges
+
+
+@pytest.fixture
+def db(db):
+    """raw_health_check에 id 빈 구간이 있는 행을 채운 세션 (conftest db 확장)"""
+    # id 중간에 빈 구간 포함 (삭제된 행 가정)
+    ids = list(range(1, 11)) + list(range(20, 26)) + [100]
+    db.execute(insert(RawHealthCheck.__table__), [
+        {'id': i, 'gender_code': 1, 'age_group_code': 10, 'height': 170}
+        for i in reversed(ids)
+    ])
+    db.commit()
+    return db
+
+
+class TestKeysetBatches:
+    """id 범위 batch 조회"""
+
+    def test_covers_all_rows_in_order(self, db):
+        """모든 행을 id 순서로 한 번씩 조회"""
+        batches = list(iter_keyset_batches(
+            db, RawHealthCheck.id, [RawHealthCheck.id, RawHealthCheck.height], 4
+        ))
+
+        ids = [row.id for batch in batches for row in batch]
+        assert ids == sorted(ids)
+        assert len(ids) == len(set(ids)) == 17
+        assert all(len(batch) <= 4 for batch in batches)
+
+    def test_model_entity_query(self, db):
+        """모델 단위 조회도 지원"""
+        batches = list(iter_keyset_batches(db, RawHealthCheck.id, [RawHealthCheck], 5))
+
+        ids = [raw.id for batch in batches for raw in batch]
+        assert ids[0] == 1
+        assert ids[-1] == 100
+        assert len(ids) == 17
+
+    def test_id_range(self, db):
+        """start_id 초과 ~ end_id 이하만 조회"""
+        batches = iter_keyset_batches(
+            db, RawHealthCheck.id, [RawHealthCheck.id], 3, start_id=5, end_id=22
+        )
+
+        ids = [row.id for batch in batches for row in batch]
+        assert ids == [6, 7, 8, 9, 10, 20, 21, 22]
+
+    def test_empty_range(self, db):
+        """빈 범위 → batch 없음"""
+        batches = list(iter_keyset_batches(
+            db, RawHealthCheck.id, [RawHealthCheck.id], 3, start_id=100
+        ))
+        assert batches == []
+
+
+class TestSplitIdRanges:
+    """병렬 처리용 id 범위 분할"""
+
+    def test_ranges_cover_all_ids(self):
+        """분할 범위가 빈틈/중복 없이 전체 id 구간을 덮음"""
+        ranges = split_id_ranges(1, 1_000_003, 16)
+
+        assert len(ranges) == 16
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == 1_000_003
+        for (_, prev_end), (next_start, _) in zip(ranges, ranges[1:]):
+            assert prev_end == next_start
+
+    def test_more_shards_than_ids(self):
+        """id 개수보다 shard가 많으면 id 1개 단위로 분할"""
+        assert split_id_ranges(5, 7, 16) == [(4, 5), (5, 6), (6, 7)]
+
+    def test_empty_table(self):
+        """빈 테이블 → 분할 없음"""
+        assert split_id_ranges(None, None, 4) == []
@@ -0,0 +1,146 @@
+"""
+ETL 체크포인트 / --resume 테스트 (SQLite)
+
+중간 batch에서 실패 → 재개 시 누락/중복 없이 끝까지 처리되는지 확인
+"""
+
+import pytest
+
+from app.models.health_check import CleanRiskResult
+from scripts.etl import load_raw, process_clean
+from scripts.etl.checkpoint import (
+    get_checkpoint, save_checkpoint, clear_checkpoints, list_checkpoint_stages
+)
+from tests.conftest import (
+    make_engine, loaded_rows, make_raw_rows, insert_raw_rows, stored_results, expected_results
+)
+
+
+class CrashAfter:
+    """n번째 호출에서 예외 발생 (그 전까지는 원래 함수 호출)"""
+
+    def __init__(self, func, n):
+        self.func = func
+        self.n = n
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == self.n:
+            raise RuntimeError('simulated crash')
+        return self.func(*args, **kwargs)
+
+
+class TestCheckpointStore:
+    """체크포인트 저장/조회"""
+
+    def test_save_and_update(self, db):
+        """없으면 생성, 있으면 갱신"""
+        assert get_checkpoint(db, 'process_clean') is None
+
+        save_checkpoint(db, 'process_clean', last_id=10, rows_done=10)
+        save_checkpoint(db, 'process_clean', last_id=20, rows_done=20)
+        db.commit()
+
+        checkpoint = get_checkpoint(db, 'process_clean')
+        assert (checkpoint['last_id'], checkpoint['rows_done']) == (20, 20)
+
+    def test_clear_includes_shards(self, db):
+        """stage 삭제 시 shard stage도 함께 삭제 (다른 stage는 유지)"""
+        for stage in ['process_clean', 'process_clean:0-50', 'load_raw']:
+            save_checkpoint(db, stage, rows_done=1)
+
+        assert sorted(list_checkpoint_stages(db, 'process_clean')) == [
+            'process_clean', 'process_clean:0-50'
+        ]
+        assert clear_checkpoints(db, 'process_clean') == 2
+        assert list_checkpoint_stages(db, 'process_clean') == []
+        assert get_checkpoint(db, 'load_raw') is not None
+
+    def test_clear_all_versions(self, db):
+        """all_versions=True → 버전별 stage('@버전')와 그 shard stage도 삭제"""
+        stages = [
+            'process_clean', 'process_clean:0-50',
+            'process_clean@glucose-110', 'process_clean@glucose-110:0-50',
+            'load_raw',
+        ]
+        for stage in stages:
+            save_checkpoint(db, stage, rows_done=1)
+
+        assert clear_checkpoints(db, 'process_clean') == 2
+        assert sorted(list_checkpoint_stages(db, 'process_clean', all_versions=True)) == [
+            'process_clean@glucose-110', 'process_clean@glucose-110:0-50'
+        ]
+        assert clear_checkpoints(db, 'process_clean', all_versions=True) == 2
+        assert get_checkpoint(db, 'load_raw') is not None
+
+    def test_stage_name_not_wildcard(self, db):
+        """stage 이름의 '_'는 LIKE 와일드카드로 해석하지 않음"""
+        for stage in ['process_clean:0-50', 'processXclean:0-50']:
+            save_checkpoint(db, stage, rows_done=1)
+
+        assert list_checkpoint_stages(db, 'process_clean') == ['process_clean:0-50']
+        assert clear_checkpoints(db, 'process_clean') == 1
+        assert get_checkpoint(db, 'processXclean:0-50') is not None
+
+
+@pytest.mark.parametrize('engine_type', ['vectorized', 'row', 'sql'])
+class TestProcessResume:
+    """process_clean 재개"""
+
+    def test_resume_after_crash(self, db, engine_type, monkeypatch):
+        """3번째 batch에서 실패 → 재개 시 나머지만 처리"""
+        monkeypatch.setattr(process_clean, 'BATCH_SIZE', 100)
+        monkeypatch.setattr(process_clean, 'SQL_BATCH_SIZE', 100)
+
+        rows = make_raw_rows(500)
+        insert_raw_rows(db, rows)
+        stage = process_clean.CHECKPOINT_STAGE
+
+        crash = CrashAfter(process_clean.save_checkpoint, 3)
+        monkeypatch.setattr(process_clean, 'save_checkpoint', crash)
+        with pytest.raises(RuntimeError):
+            process_clean.process_id_range(db, engine_type, checkpoint_stage=stage)
+        db.rollback()
+
+        # 실패한 batch는 결과/체크포인트 모두 롤백
+        assert get_checkpoint(db, stage)['last_id'] == 200
+        assert db.query(CleanRiskResult).filter(CleanRiskResult.raw_id > 200).count() == 0
+
+        monkeypatch.setattr(process_clean, 'save_checkpoint', save_checkpoint)
+        total, _, _ = process_clean.process_id_range(db, engine_type, checkpoint_stage=stage)
+
+        assert total == 300
+        assert get_checkpoint(db, stage)['rows_done'] == 500
+        assert stored_results(db) == expected_results(rows)
+
+
+@pytest.mark.parametrize('loader', ['load_csv_to_raw', 'load_csv_bulk'])
+class TestLoadResume:
+    """load_raw 재개"""
+
+    def test_resume_after_crash(self, csv_path, loader, monkeypatch):
+        """2번째 chunk에서 실패 → 재개 시 남은 행만 적재"""
+        monkeypatch.setattr(load_raw, 'CHUNK_SIZE', 10)
+        load = getattr(load_raw, loader)
+
+        expected_engine = make_engine()
+        load(csv_path, expected_engine)
+
+        engine = make_engine()
+        crash = CrashAfter(load_raw.save_load_checkpoint, 2)
+        monkeypatch.setattr(load_raw, 'save_load_checkpoint', crash)
+        with pytest.raises(RuntimeError):
+            load(csv_path, engine)
+
+        assert len(loaded_rows(engine)) == 10
+
+        monkeypatch.setattr(load_raw, 'save_load_checkpoint', crash.func)
+        total_rows, _ = load(csv_path, engine, resume=True)
+
+        assert total_rows == 15
+        assert loaded_rows(engine) == loaded_rows(expected_engine)
+        with engine.connect() as conn:
+            assert get_checkpoint(conn, load_raw.CHECKPOINT_STAGE) == {
+                'last_chunk': 3, 'last_id': 0, 'rows_done': 25
+            }
@@ -0,0 +1,248 @@
+"""
+ETL 증분 처리 테스트
+
+process_id_range(incremental=True): 미처리 / 이전 rule_version 레코드만 재판정
+process_id_range(rule_version=..., side_by_side=True): 버전별 결과 병행 저장
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert, func
+
+from app.models.health_check import Base, RawHealthCheck, CleanRiskResult
+from scripts.etl import scoring
+from scripts.etl.process_clean import process_id_range, compare_rule_versions
+
+VALID_ROW = {
+    'gender_code': 1, 'age_group_code': 10,
+    'height': 170, 'weight': 85,
+    'systolic_bp': 150, 'diastolic_bp': 95,
+    'fasting_glucose': 100, 'total_cholesterol': 200,
+    'triglycerides': 150, 'hdl_cholesterol': 50,
+    'smoking_status': 1,
+}
+
+
+def insert_raw(db, count, **overrides):
+    """raw_health_check에 count개 행 추가"""
+    db.execute(insert(RawHealthCheck.__table__), [
+        {**VALID_ROW, **overrides} for _ in range(count)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def previous_version(monkeypatch):
+    """guideline-v1보다 먼저 등록된 이전 버전 'guideline-v0' (테스트 후 registry 원복)"""
+    from app.services import rules
+
+    definition = rules.derive_definition(scoring.RULE_VERSION, {'diabetes': {'fasting_glucose': 140}})
+    monkeypatch.setattr(rules, 'RULE_DEFINITIONS', {'guideline-v0': definition, **rules.RULE_DEFINITIONS})
+    monkeypatch.setattr(rules, '_COMPILED', {
+        'guideline-v0': rules.CompiledRules('guideline-v0', definition), **rules._COMPILED
+    })
+    return 'guideline-v0'
+
+
+@pytest.mark.parametrize('engine_type', ['vectorized', 'row'])
+class TestIncrementalProcessing:
+    """증분 처리"""
+
+    def test_only_new_rows_processed(self, db, engine_type):
+        """이미 판정된 레코드는 다시 처리하지 않음"""
+        insert_raw(db, 5)
+        assert process_id_range(db, engine_type, incremental=True) == (5, 5, 0)
+
+        # 변경 없음 → 처리 대상 없음
+        assert process_id_range(db, engine_type, incremental=True) == (0, 0, 0)
+
+        # 신규 레코드만 처리
+        insert_raw(db, 2)
+        assert process_id_range(db, engine_type, incremental=True) == (2, 2, 0)
+        assert db.query(CleanRiskResult).count() == 7
+
+    def test_invalid_rows_skipped_in_sql(self, db, engine_type):
+        """무효 레코드는 조회 단계에서 제외 (매번 재조회하지 않음)"""
+        insert_raw(db, 3)
+        insert_raw(db, 4, systolic_bp=None)
+
+        assert process_id_range(db, engine_type, incremental=True) == (3, 3, 0)
+        assert process_id_range(db, engine_type, incremental=True) == (0, 0, 0)
+
+    def test_outdated_rule_version_reprocessed(self, db, engine_type, previous_version):
+        """이전 rule_version 결과는 현재 버전으로 교체"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type, incremental=True)
+
+        stale = db.query(CleanRiskResult).order_by(CleanRiskResult.raw_id).limit(2).all()
+        for clean in stale:
+            clean.rule_version = previous_version
+            clean.risk_factor_count = 0
+        db.commit()
+
+        assert process_id_range(db, engine_type, incremental=True) == (2, 2, 0)
+
+        results = db.query(CleanRiskResult).all()
+        assert len(results) == 4
+        assert {clean.rule_version for clean in results} == {scoring.RULE_VERSION}
+        # 고혈압 + 비만 → 2개
+        assert {clean.risk_factor_count for clean in results} == {2}
+
+    def test_unregistered_version_not_stale(self, db, engine_type):
+        """older_rule_versions()에 없는 버전 결과는 이전 버전으로 취급하지 않음 (삭제/재판정 없음)"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type, incremental=True)
+        db.query(CleanRiskResult).filter(CleanRiskResult.raw_id <= 2).update(
+            {'rule_version': 'guideline-v9'}, synchronize_session=False
+        )
+        db.commit()
+
+        # 현재 버전 결과가 없는 2행만 판정, guideline-v9 결과는 유지
+        assert process_id_range(db, engine_type, incremental=True) == (2, 2, 0)
+        assert db.query(CleanRiskResult).filter_by(rule_version='guideline-v9').count() == 2
+        assert process_id_range(db, engine_type, incremental=True) == (0, 0, 0)
+
+
+@pytest.mark.parametrize('engine_type', ['vectorized', 'row', 'sql'])
+class TestSideBySideScoring:
+    """다른 rule_version 결과를 유지한 채 새 버전으로 재판정"""
+
+    def versions(self, db):
+        """{rule_version: 결과 행 수}"""
+        return dict(
+            db.query(CleanRiskResult.rule_version, func.count(CleanRiskResult.id))
+            .group_by(CleanRiskResult.rule_version).all()
+        )
+
+    def test_side_by_side_keeps_existing_version(self, db, engine_type, candidate_rules):
+        """새 버전 결과 추가 + 기존 버전 결과 유지 → 버전별 비교"""
+        insert_raw(db, 3, fasting_glucose=115)
+        insert_raw(db, 2)
+        process_id_range(db, engine_type)
+
+        assert process_id_range(
+            db, engine_type, incremental=True, rule_version='glucose-110', side_by_side=True
+        ) == (5, 5, 0)
+        assert self.versions(db) == {scoring.RULE_VERSION: 5, 'glucose-110': 5}
+
+        # 이미 판정된 버전은 다시 처리하지 않음
+        assert process_id_range(
+            db, engine_type, incremental=True, rule_version='glucose-110', side_by_side=True
+        ) == (0, 0, 0)
+
+        comparison = compare_rule_versions(db, scoring.RULE_VERSION, 'glucose-110')
+        assert comparison['compared'] == 5
+        assert comparison['changed'] == 3
+        assert comparison['distribution']['glucose-110']['CHD_RISK_EQUIVALENT'] == 3
+
+    def test_full_run_for_new_version(self, db, engine_type, candidate_rules):
+        """전체 처리도 새 버전 결과만 저장 (기존 버전과 유일성 충돌 없음)"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type)
+
+        assert process_id_range(db, engine_type, rule_version='glucose-110', side_by_side=True)[1] == 4
+        assert self.versions(db) == {scoring.RULE_VERSION: 4, 'glucose-110': 4}
+
+    def test_plain_incremental_keeps_candidate_results(self, db, engine_type, candidate_rules):
+        """검토용(나중에 등록된) 버전 결과는 서비스 버전 증분 처리에서 삭제/재판정하지 않음"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type)
+        process_id_range(db, engine_type, incremental=True, rule_version='glucose-110', side_by_side=True)
+
+        assert process_id_range(db, engine_type, incremental=True) == (0, 0, 0)
+        assert self.versions(db) == {scoring.RULE_VERSION: 4, 'glucose-110': 4}
+
+        # 후보 버전 결과만 있는 신규 레코드 → 서비스 버전 결과만 추가
+        insert_raw(db, 2)
+        process_id_range(db, engine_type, incremental=True, rule_version='glucose-110', side_by_side=True)
+        assert process_id_range(db, engine_type, incremental=True)[1] == 2
+        assert self.versions(db) == {scoring.RULE_VERSION: 6, 'glucose-110': 6}
+
+    def test_switch_replaces_older_version(self, db, engine_type, candidate_rules):
+        """나중에 등록된 버전으로 전환 (side-by-side 아님) → 이전 버전 결과만 교체"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type)
+
+        assert process_id_range(db, engine_type, incremental=True, rule_version='glucose-110')[1] == 4
+        assert self.versions(db) == {'glucose-110': 4}
+
+    def test_switch_after_side_by_side(self, db, engine_type, candidate_rules):
+        """두 버전 결과가 모두 있는 레코드 → 이전 버전 결과 삭제, 새 버전 결과는 1개만 유지"""
+        insert_raw(db, 4)
+        process_id_range(db, engine_type)
+        process_id_range(db, engine_type, incremental=True, rule_version='glucose-110', side_by_side=True)
+
+        process_id_range(db, engine_type, incremental=True, rule_version='glucose-110')
+        assert self.versions(db) == {'glucose-110': 4}
+        assert process_id_range(db, engine_type, incremental=True, rule_version='glucose-110') == (0, 0, 0)
+
+
+class TestCandidateVersionCli:
+    """process_clean.py --threshold: 검토용 버전 등록 후 판정"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_registry(self, monkeypatch):
+        """테스트 후 rule registry 원복"""
+        from app.services import rules
+        monkeypatch.setattr(rules, 'RULE_DEFINITIONS', dict(rules.RULE_DEFINITIONS))
+        monkeypatch.setattr(rules, '_COMPILED', dict(rules._COMPILED))
+
+    def parse(self, monkeypatch, *argv):
+        from scripts.etl.process_clean import parse_args
+        monkeypatch.setattr('sys.argv', ['process_clean.py', *argv])
+        return parse_args()
+
+    def test_threshold_registers_version(self, db, monkeypatch):
+        """--threshold → 기준 버전에서 기준값만 바꾼 버전 등록, 바로 판정 가능"""
+        from app.services.rules import get_rules
+
+        args = self.parse(
+            monkeypatch, '--rule-version', 'glucose-110',
+            '--threshold', 'diabetes.fasting_glucose=110', '--side-by-side'
+        )
+        rules = get_rules('glucose-110')
+        assert rules.definition['flags']['diabetes']['any'] == [('fasting_glucose', '>=', 110.0)]
+        assert args.rule_version == 'glucose-110'
+
+        insert_raw(db, 3, fasting_glucose=115)
+        process_id_range(db, 'vectorized', rule_version='glucose-110', side_by_side=True)
+        groups = db.query(CleanRiskResult.risk_group).filter(
+            CleanRiskResult.rule_version == 'glucose-110'
+        ).all()
+        assert groups == [('CHD_RISK_EQUIVALENT',)] * 3
+
+    @pytest.mark.parametrize('argv', [
+        ['--rule-version', 'guideline-v2'],  # 등록되지 않은 버전
+        ['--rule-version', 'guideline-v1', '--threshold', 'diabetes.fasting_glucose=110'],  # 기존 버전
+        ['--rule-version', 'x', '--threshold', 'diabetes.hdl_cholesterol=50'],  # 없는 컬럼
+        ['--rule-version', 'x', '--threshold', 'diabetes.fasting_glucose'],  # 형식 오류
+    ])
+    def test_invalid_arguments(self, monkeypatch, argv):
+        """잘못된 버전/기준값 → argparse 오류 (exit 2)"""
+        with pytest.raises(SystemExit) as exc:
+            self.parse(monkeypatch, *argv)
+        assert exc.value.code == 2
+
+
+class TestUniqueKeyMigration:
+    """init_db(): 이전 스키마 UNIQUE (raw_id) → (raw_id, rule_version)"""
+
+    def test_legacy_unique_index_dropped(self, tmp_path):
+        """raw_id 단독 unique 인덱스 삭제 + 버전별 인덱스 생성, 재실행 시 변경 없음"""
+        from sqlalchemy import inspect, text
+        from app.database import init_db, legacy_clean_unique_keys
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX uq_clean_raw_version"))
+            conn.execute(text("CREATE UNIQUE INDEX raw_id ON clean_risk_result (raw_id)"))
+        assert legacy_clean_unique_keys(engine) == (['raw_id'], [])
+
+        init_db(engine)
+        init_db(engine)
+
+        assert legacy_clean_unique_keys(engine) == ([], [])
+        names = {index['name'] for index in inspect(engine).get_indexes('clean_risk_result')}
+        assert {'uq_clean_raw_version', 'idx_version_group'} <= names
+        assert 'raw_id' not in names
+        assert 'raw_id' not in {index.name for index in CleanRiskResult.__table__.indexes}
@@ -0,0 +1,218 @@
+"""
+ETL CSV 적재 테스트 (SQLite)
+
+to_sql 적재와 bulk(staging TSV) 적재 결과 비교
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import select, insert, func
+from sqlalchemy.exc import IntegrityError
+
+from app.models.health_check import RawHealthCheck, CleanRiskResult
+from scripts.etl import load_raw
+from tests.conftest import make_csv_rows, write_csv, make_engine, loaded_rows
+
+
+class TestBulkLoader:
+    """staging TSV + bulk load"""
+
+    def test_bulk_matches_to_sql(self, csv_path):
+        """bulk 적재 결과 = to_sql 적재 결과"""
+        to_sql_engine = make_engine()
+        bulk_engine = make_engine()
+
+        to_sql_rows, _ = load_raw.load_csv_to_raw(csv_path, to_sql_engine)
+        bulk_rows, _ = load_raw.load_csv_bulk(csv_path, bulk_engine)
+
+        assert to_sql_rows == bulk_rows == 25
+        assert loaded_rows(bulk_engine) == loaded_rows(to_sql_engine)
+
+    def test_staging_file_format(self, csv_path, tmp_path):
+        """UTF-8 TSV, 정수 표기, NULL = \\N"""
+        staging_path = tmp_path / 'staging.tsv'
+        assert load_raw.write_staging_file(staging_path, csv_path) == 25
+
+        lines = staging_path.read_text(encoding='utf-8').splitlines()
+        first = lines[0].split('\t')
+
+        assert len(lines) == 25
+        assert len(first) == len(load_raw.RAW_COLUMNS)
+        assert first[load_raw.RAW_COLUMNS.index('waist_circumference')] == load_raw.NULL_MARKER
+        assert first[load_raw.RAW_COLUMNS.index('height')] == '150'
+
+
+    def test_mysql_checkpoint_counts_staged_rows(self, tmp_path, monkeypatch):
+        """LOAD DATA가 중복 행을 건너뛰어도 체크포인트는 staging 행 수 기준"""
+        class Result:
+            rowcount = 3  # unique index로 2행 건너뜀
+
+        class Connection:
+            def execute(self, statement, params=None):
+                return Result()
+
+        class Begin:
+            def __enter__(self):
+                return Connection()
+
+            def __exit__(self, *exc):
+                return False
+
+        class MysqlEngine:
+            class dialect:
+                name = 'mysql'
+
+            def begin(self):
+                return Begin()
+
+        saved = []
+        monkeypatch.setattr(load_raw, 'save_load_checkpoint', lambda conn, rows: saved.append(rows))
+
+        loaded = load_raw.bulk_load_staging(tmp_path / 'staging.tsv', MysqlEngine(), 10, staged_rows=5)
+
+        assert loaded == 3
+        assert saved == [15]
+
+CSV_ENGINES = [
+    'c',
+    pytest.param('pyarrow', marks=pytest.mark.skipif(
+        load_raw.pa is None, reason='pyarrow not installed'
+    )),
+]
+
+
+class TestCsvSchema:
+    """모델 기준 명시적 dtype 파싱"""
+
+    def test_schema_from_model(self):
+        """SmallInteger → Int16, String → string"""
+        assert load_raw.RAW_SCHEMA['height'] == pd.Int16Dtype()
+        assert isinstance(load_raw.RAW_SCHEMA['subscriber_id'], pd.StringDtype)
+        assert list(load_raw.RAW_SCHEMA) == load_raw.RAW_COLUMNS
+
+    @pytest.mark.parametrize('csv_engine', CSV_ENGINES)
+    def test_prepared_dtypes(self, csv_path, csv_engine):
+        """float64/object 컬럼 없음, 코드 컬럼은 category, NULL은 NA"""
+        chunk = load_raw.prepare_chunk(
+            next(load_raw.read_csv_chunks(csv_path, csv_engine=csv_engine))
+        )
+
+        assert list(chunk.columns) == load_raw.RAW_COLUMNS
+        for column in load_raw.CATEGORY_COLUMNS:
+            assert chunk[column].dtype == 'category'
+        assert chunk['height'].dtype == pd.Int16Dtype()
+        # numpy float64/object 없이 모두 nullable extension dtype
+        assert not any(isinstance(dtype, np.dtype) for dtype in chunk.dtypes)
+
+        assert chunk['waist_circumference'].isna().sum() == 4
+        assert chunk['height'].iloc[0] == 150
+
+    @pytest.mark.parametrize('csv_engine', CSV_ENGINES)
+    def test_engines_match(self, csv_path, csv_engine, monkeypatch):
+        """파서와 무관하게 같은 chunk (재개용 skip_rows, chunk 재분할 포함)"""
+        monkeypatch.setattr(load_raw, 'CHUNK_SIZE', 4)
+
+        def read(engine):
+            return [
+                load_raw.prepare_chunk(chunk).astype(object).values.tolist()
+                for chunk in load_raw.read_csv_chunks(csv_path, 3, engine)
+            ]
+
+        chunks = read(csv_engine)
+        assert [len(chunk) for chunk in chunks] == [4, 4, 4, 4, 4, 2]
+        assert chunks == read('c')
+
+    def test_int16_rounding(self):
+        """half-up 반올림, NaN → NA"""
+        values = pd.Series([169.5, -0.5, np.nan, 32767.0], name='height')
+
+        result = load_raw.to_nullable_int16(values)
+
+        assert list(result.fillna(0)) == [170, 0, 0, 32767]
+        assert list(result.isna()) == [False, False, True, False]
+
+    @pytest.mark.parametrize('value', [32767.5, 40000.0, -32769.0, 1e12])
+    def test_int16_out_of_range(self, value):
+        """int16 범위 밖 값 → wrap-around 없이 ValueError"""
+        values = pd.Series([170.0, np.nan, value], name='height')
+
+        with pytest.raises(ValueError, match='height: 1 value'):
+            load_raw.to_nullable_int16(values)
+
+
+def raw_count(engine):
+    """raw_health_check 행 수"""
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(RawHealthCheck.__table__)).scalar()
+
+
+class TestUpsertLoader:
+    """자연키(reference_year, subscriber_id) upsert 적재"""
+
+    def test_reload_is_idempotent(self, csv_path):
+        """같은 CSV 재적재 → 행 수/id 변화 없음"""
+        engine = make_engine()
+        load_raw.load_csv_to_raw(csv_path, engine, upsert=True)
+        first = loaded_rows(engine)
+        with engine.connect() as conn:
+            first_ids = conn.execute(select(RawHealthCheck.id)).scalars().all()
+
+        load_raw.load_csv_to_raw(csv_path, engine, upsert=True)
+
+        assert loaded_rows(engine) == first
+        with engine.connect() as conn:
+            assert conn.execute(select(RawHealthCheck.id)).scalars().all() == first_ids
+
+    def test_changed_and_new_rows(self, tmp_path):
+        """변경 행은 UPDATE + 판정 결과 삭제, 신규 행은 INSERT, 나머지는 유지"""
+        rows = make_csv_rows()
+        engine = make_engine()
+        load_raw.load_csv_to_raw(write_csv(tmp_path / 'v1.csv', rows), engine, upsert=True)
+
+        with engine.begin() as conn:
+            conn.execute(insert(CleanRiskResult.__table__), [
+                {'raw_id': raw_id, 'risk_group': 'ZERO_TO_ONE_RISK_FACTOR'}
+                for raw_id in range(1, 26)
+            ])
+
+        rows[0]['수축기혈압'] = 180
+        rows.append({**rows[1], '가입자일련번호': 9999})
+        chunk = load_raw.prepare_chunk(
+            next(load_raw.read_csv_chunks(write_csv(tmp_path / 'v2.csv', rows)))
+        )
+        with engine.begin() as conn:
+            counts = load_raw.upsert_chunk(conn, chunk)
+
+        assert counts == {'inserted': 1, 'updated': 1, 'unchanged': 24, 'duplicates': 0}
+        assert raw_count(engine) == 26
+        with engine.connect() as conn:
+            sbp = conn.execute(
+                select(RawHealthCheck.systolic_bp).where(RawHealthCheck.subscriber_id == '1000')
+            ).scalar()
+            clean_ids = conn.execute(select(CleanRiskResult.raw_id)).scalars().all()
+        assert sbp == 180
+        assert sorted(clean_ids) == list(range(2, 26))
+
+    def test_duplicate_keys_in_csv(self, tmp_path):
+        """CSV 안의 같은 키 → 마지막 행만 적재"""
+        rows = make_csv_rows()
+        rows.append({**rows[0], '수축기혈압': 199})
+        engine = make_engine()
+
+        load_raw.load_csv_to_raw(write_csv(tmp_path / 'dup.csv', rows), engine, upsert=True)
+
+        assert raw_count(engine) == 25
+        with engine.connect() as conn:
+            assert conn.execute(
+                select(RawHealthCheck.systolic_bp).where(RawHealthCheck.subscriber_id == '1000')
+            ).scalar() == 199
+
+    def test_unique_index(self, csv_path):
+        """자연키 중복 INSERT는 unique index가 거부"""
+        engine = make_engine()
+        load_raw.load_csv_to_raw(csv_path, engine)
+
+        assert load_raw.ensure_natural_key_index(engine)
+        with pytest.raises(IntegrityError):
+            load_raw.load_csv_to_raw(csv_path, engine)
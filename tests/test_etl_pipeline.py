@@ -0,0 +1,64 @@
+"""
+Reader / Writer 파이프라인 테스트
+
+iter_pipelined: 순서 유지, 변환 적용, 예외 전달, 조기 종료 시 reader 정리
+"""
+
+import threading
+
+import pytest
+
+from scripts.etl.pipeline import iter_pipelined
+from scripts.etl import load_raw
+from tests.conftest import make_engine, loaded_rows
+
+
+@pytest.mark.parametrize('depth', [0, 1, 3])
+class TestIterPipelined:
+    """bounded queue 파이프라인"""
+
+    def test_order_and_transform(self, depth):
+        """source 순서대로 변환 결과 반환 + 단계별 시간"""
+        results = list(iter_pipelined(range(20), lambda x: x * 10, depth))
+
+        assert [chunk for chunk, _ in results] == [x * 10 for x in range(20)]
+        assert all(set(timing) == {'read', 'transform', 'wait'} for _, timing in results)
+
+    def test_reader_error_propagates(self, depth):
+        """reader 단계 예외는 writer 쪽에서 그대로 발생 (이전 chunk는 정상 반환)"""
+        def source():
+            yield 1
+            yield 2
+            raise ValueError('bad chunk')
+
+        received = []
+        with pytest.raises(ValueError, match='bad chunk'):
+            for chunk, _ in iter_pipelined(source(), depth=depth):
+                received.append(chunk)
+
+        assert received == [1, 2]
+
+    def test_writer_stop_releases_reader(self, depth):
+        """writer가 중단되면 reader thread도 종료"""
+        chunks = iter_pipelined(iter(range(1000)), depth=depth)
+        next(chunks)
+        chunks.close()
+
+        assert not any(t.name == 'etl-reader' for t in threading.enumerate())
+
+
+class TestPipelinedLoad:
+    """load_csv_to_raw 파이프라인"""
+
+    def test_pipelined_matches_serial(self, csv_path, monkeypatch):
+        """파이프라인 적재 결과 = 순차 적재 결과 (chunk 순서 유지)"""
+        monkeypatch.setattr(load_raw, 'CHUNK_SIZE', 4)
+
+        serial_engine = make_engine()
+        pipelined_engine = make_engine()
+
+        load_raw.load_csv_to_raw(csv_path, serial_engine, pipeline_depth=0)
+        load_raw.load_csv_to_raw(csv_path, pipelined_engine, pipeline_depth=2)
+
+        assert loaded_rows(pipelined_engine) == loaded_rows(serial_engine)
+        assert len(loaded_rows(serial_engine)) == 25
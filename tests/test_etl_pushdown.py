@@ -0,0 +1,58 @@
+"""
+SQL Pushdown 판정 테스트 (SQLite)
+
+INSERT ... SELECT 판정 결과가 Python(vectorized) 판정과 동일한지 확인
+"""
+
+from app.models.health_check import CleanRiskResult
+from scripts.etl.process_clean import process_id_range
+from tests.conftest import make_raw_rows, insert_raw_rows, stored_results, expected_results
+
+
+class TestPushdownParity:
+    """SQL 판정 = Python 판정"""
+
+    def test_parity_with_python_engine(self, db):
+        """무작위 데이터 (경계값, NULL, 0 포함)"""
+        rows = make_raw_rows(3000)
+        insert_raw_rows(db, rows)
+
+        total, valid, invalid = process_id_range(db, 'sql')
+
+        expected = expected_results(rows)
+        assert (total, valid, invalid) == (len(rows), len(expected), len(rows) - len(expected))
+        assert stored_results(db) == expected
+
+    def test_bmi_rounding_parity(self, db):
+        """BMI 반올림 경계 (예: 200cm/141kg = 35.25 → 35.2) 포함 전체 신장/체중 구간"""
+        rows = []
+        for height in range(140, 201):
+            for weight in range(30, 151):
+                rows.append((len(rows) + 1, height, weight, 120, 80, 100, 200, 150, 50, 1))
+        insert_raw_rows(db, rows)
+
+        process_id_range(db, 'sql')
+
+        results = stored_results(db)
+        assert results == expected_results(rows)
+
+        tie_id = next(row[0] for row in rows if row[1:3] == (200, 141))
+        assert results[tie_id]['bmi'] == 35.2
+
+    def test_incremental(self, db):
+        """증분 처리: 신규/이전 버전 레코드만 처리"""
+        rows = make_raw_rows(500)
+        insert_raw_rows(db, rows)
+        expected = expected_results(rows)
+
+        assert process_id_range(db, 'sql', incremental=True)[1] == len(expected)
+        assert process_id_range(db, 'sql', incremental=True) == (0, 0, 0)
+
+        db.query(CleanRiskResult).filter(CleanRiskResult.raw_id <= 100).update(
+            {'rule_version': 'guideline-v0'}, synchronize_session=False
+        )
+        db.commit()
+
+        reprocessed = sum(1 for raw_id in expected if raw_id <= 100)
+        assert process_id_range(db, 'sql', incremental=True)[1] == reprocessed
+        assert stored_results(db) == expected
@@ -0,0 +1,102 @@
+"""
+ETL Vectorized 판정 엔진 테스트
+
+row 단위 로직(process_single_record)과 batch 로직(scoring.score_batch) 결과 일치 확인
+"""
+
+import numpy as np
+import pytest
+
+from scripts.etl import scoring
+from scripts.etl.process_clean import process_single_record, process_batch
+from tests.conftest import make_raw_rows, to_raw_object
+
+
+class TestVectorizedParity:
+    """row 단위 로직과 결과 일치"""
+
+    def test_parity_with_row_engine(self):
+        """무작위 batch 전체 결과 일치"""
+        rows = make_raw_rows(5000)
+
+        expected = {}
+        for row in rows:
+            clean = process_single_record(to_raw_object(row))
+            if not clean.invalid_flag:
+                expected[clean.raw_id] = clean
+
+        mappings, invalid = process_batch(rows)
+
+        assert invalid == len(rows) - len(expected)
+        assert [m['raw_id'] for m in mappings] == sorted(expected)
+
+        for mapping in mappings:
+            clean = expected[mapping['raw_id']]
+            assert mapping['bmi'] == clean.bmi
+            assert mapping['risk_factor_count'] == clean.risk_factor_count
+            assert mapping['risk_group'] == clean.risk_group
+            for flag in scoring.FLAG_RULES:
+                assert mapping[flag] == getattr(clean, flag), flag
+
+    def test_bmi_grid_parity(self):
+        """정수 신장/체중 전체 구간에서 BMI 반올림 일치"""
+        from scripts.etl.process_clean import calculate_bmi
+
+        heights, weights = np.meshgrid(np.arange(130, 211), np.arange(20, 161))
+        heights = heights.ravel().astype(np.float64)
+        weights = weights.ravel().astype(np.float64)
+
+        vectorized = scoring.calculate_bmi(heights, weights)
+
+        for h, w, bmi in zip(heights.tolist(), weights.tolist(), vectorized.tolist()):
+            expected = calculate_bmi(int(h), int(w))
+            if expected is None:
+                assert np.isnan(bmi)
+            else:
+                assert bmi == expected
+
+
+class TestScoreBatch:
+    """score_batch 결과 구조"""
+
+    def test_all_risk_factors(self):
+        """모든 위험요인 보유 → CHD_RISK_EQUIVALENT"""
+        columns = scoring.rows_to_columns([(1, 170, 85, 150, 95, 130, 250, 220, 35, 3)])
+        scored = scoring.score_batch(columns)
+
+        assert scored['valid'][0]
+        assert scored['risk_factor_count'][0] == 7
+        assert scored['risk_group'][0] == 'CHD_RISK_EQUIVALENT'
+
+    def test_null_triglycerides_is_not_flagged(self):
+        """TG NULL → flag_tg_high False (유효 데이터)"""
+        columns = scoring.rows_to_columns([(1, 170, 70, 120, 80, 100, 200, None, 50, 1)])
+        scored = scoring.score_batch(columns)
+
+        assert scored['valid'][0]
+        assert not scored['flag_tg_high'][0]
+        assert scored['risk_group'][0] == 'ZERO_TO_ONE_RISK_FACTOR'
+
+    @pytest.mark.parametrize('row', [
+        (1, None, 70, 120, 80, 100, 200, 150, 50, 1),   # 신장 NULL
+        (1, 170, 70, 0, 80, 100, 200, 150, 50, 1),      # 수축기혈압 0
+        (1, 170, 70, 260, 80, 100, 200, 150, 50, 1),    # 수축기혈압 범위 초과
+        (1, 170, 70, 120, 80, 100, 200, 150, None, 1),  # HDL NULL
+    ])
+    def test_invalid_rows(self, row):
+        """필수 값 누락/범위 초과 → 무효"""
+        scored = scoring.score_batch(scoring.rows_to_columns([row]))
+        assert not scored['valid'][0]
+
+    def test_invalid_rows_not_mapped(self):
+        """무효 row는 INSERT 대상에서 제외"""
+        rows = [
+            (1, 170, 70, 120, 80, 100, 200, 150, 50, 1),
+            (2, None, 70, 120, 80, 100, 200, 150, 50, 1),
+        ]
+        columns = scoring.rows_to_columns(rows)
+        mappings = scoring.to_clean_mappings(columns['id'], scoring.score_batch(columns))
+
+        assert [m['raw_id'] for m in mappings] == [1]
+        assert mappings[0]['rule_version'] == 'guideline-v1'
+        assert mappings[0]['invalid_flag'] is False
@@ -0,0 +1,139 @@
+"""
+인구 what-if snapshot 테스트 (SQLite)
+
+app/services/population.py의 snapshot 재판정 결과가
+같은 규칙으로 ETL(vectorized)을 실행한 결과와 일치하는지 확인
+"""
+
+import time
+from collections import Counter
+
+import pytest
+
+from app.services import population
+from app.services.population import load_snapshot
+from app.services.rules import RISK_GROUPS, get_rules
+from scripts.etl.process_clean import process_batch
+from tests.conftest import make_raw_rows, insert_raw_rows
+
+RULES = get_rules('guideline-v1')
+
+
+def etl_distribution(rows, rules):
+    """ETL vectorized 판정 → {위험군: 레코드 수}"""
+    mappings, _ = process_batch(rows, rules)
+    counts = Counter(m['risk_group'] for m in mappings)
+    return {group: counts[group] for group in RISK_GROUPS}
+
+
+def counts_of(distribution):
+    """group_distribution 결과 → {위험군: 레코드 수}"""
+    return {group: item['count'] for group, item in distribution.items()}
+
+
+class TestWhatIfParity:
+    """snapshot what-if = ETL 재실행 결과"""
+
+    def test_matches_etl(self, db, candidate_rules):
+        """기준 버전 / 기준값 변경 버전 모두 ETL 분포와 동일 (경계값, NULL, 0 포함)"""
+        rows = make_raw_rows(3000)
+        insert_raw_rows(db, rows)
+
+        snapshot = load_snapshot(db, chunk_size=700)
+        result = snapshot.whatif(RULES, candidate_rules)
+
+        assert result['total_records'] == len(rows)
+        assert result['valid_records'] == len(process_batch(rows)[0])
+        assert counts_of(result['baseline']) == etl_distribution(rows, RULES)
+        assert counts_of(result['whatif']) == etl_distribution(rows, candidate_rules)
+
+        base = {m['raw_id']: m['risk_group'] for m in process_batch(rows)[0]}
+        candidate = {m['raw_id']: m['risk_group'] for m in process_batch(rows, candidate_rules)[0]}
+        assert result['changed_records'] == sum(base[i] != candidate[i] for i in base)
+        assert result['flag_counts']['diabetes'] == sum(
+            m['flag_diabetes'] for m in process_batch(rows, candidate_rules)[0]
+        )
+
+    def test_same_thresholds_no_change(self, db):
+        """기준값 그대로 → 분포 동일, 변경 0"""
+        insert_raw_rows(db, make_raw_rows(500))
+
+        result = load_snapshot(db).whatif(RULES, RULES)
+        assert result['whatif'] == result['baseline']
+        assert result['changed_records'] == 0
+
+    def test_empty_table(self, db):
+        """raw 데이터 없음 → 0건 분포"""
+        result = load_snapshot(db).whatif(RULES, RULES)
+        assert result['total_records'] == 0
+        assert result['baseline'][RISK_GROUPS[0]] == {'count': 0, 'percentage': 0}
+
+
+class TestSnapshotCache:
+    """프로세스 전역 snapshot 재사용 / 만료"""
+
+    @pytest.fixture(autouse=True)
+    def fake_loader(self, monkeypatch):
+        """DB 대신 빈 snapshot 적재 (적재 횟수 기록)"""
+        loads = []
+
+        def load(db):
+            loads.append(db)
+            return population.PopulationSnapshot(
+                {column: [] for column in population.SNAPSHOT_COLUMNS}
+            )
+
+        monkeypatch.setattr(population, 'load_snapshot', load)
+        monkeypatch.setattr(population, '_snapshot', None)
+        monkeypatch.setattr(population, '_loader', None)
+        return loads
+
+    def test_reuse_until_expired(self, fake_loader, monkeypatch):
+        """max_age 안에서는 재사용, 지나면 이전 snapshot 응답 + background 재적재"""
+        first = population.get_snapshot(max_age=60)
+        assert population.get_snapshot(max_age=60) is first
+        assert len(fake_loader) == 1
+
+        monkeypatch.setattr(first, 'loaded_at', first.loaded_at - 61)
+        assert population.get_snapshot(max_age=60) is first
+        population._loader.join()  # get_snapshot()이 시작한 재적재
+
+        assert len(fake_loader) == 2
+        assert population.get_snapshot(max_age=60) is not first
+
+    def test_concurrent_first_load(self, fake_loader, monkeypatch):
+        """첫 적재 중 동시 요청은 같은 적재 결과를 기다림 (적재 1회)"""
+        import threading
+
+        load = population.load_snapshot
+        monkeypatch.setattr(population, 'load_snapshot', lambda db: time.sleep(0.1) or load(db))
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(population.get_snapshot(max_age=60)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(fake_loader) == 1
+        assert len(results) == 4 and all(result is results[0] for result in results)
+
+    def test_load_failure(self, fake_loader, monkeypatch):
+        """첫 적재 실패 → RuntimeError, 재적재 실패 → 이전 snapshot 유지"""
+        def broken(db):
+            raise OSError('db down')
+
+        monkeypatch.setattr(population, 'load_snapshot', broken)
+        with pytest.raises(RuntimeError):
+            population.get_snapshot(max_age=60)
+
+        snapshot = population.PopulationSnapshot(
+            {column: [] for column in population.SNAPSHOT_COLUMNS}, loaded_at=0
+        )
+        monkeypatch.setattr(population, '_snapshot', snapshot)
+        assert population.get_snapshot(max_age=60) is snapshot
+        population._loader.join()
+        assert population._snapshot is snapshot
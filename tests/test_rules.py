@@ -0,0 +1,142 @@
+"""
+판정 규칙 모듈 테스트
+
+app/services/rules.py의 scalar(evaluate) / 배열(evaluate_batch) 판정과
+API(/simulate), ETL(row, vectorized) 경로의 결과 일치 확인
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.blueprints.simulate import SMOKING_CODES, calculate_risk_factors
+from app.services import rules
+from scripts.etl import scoring
+from scripts.etl.process_clean import process_single_record
+from tests.conftest import make_raw_rows, to_raw_object
+
+RULES = rules.get_rules('guideline-v1')
+
+
+def to_columns(values_list):
+    """입력 dict 리스트 → 컬럼별 float64 배열 (None → NaN)"""
+    return {
+        column: np.array(
+            [np.nan if values[column] is None else values[column] for values in values_list],
+            dtype=np.float64
+        )
+        for column in RULES.input_columns
+    }
+
+
+class TestScalarBatchParity:
+    """evaluate() = evaluate_batch()"""
+
+    def test_random_rows(self):
+        """경계값, NULL, 0, 소수 BMI 포함"""
+        rng = random.Random(7)
+        values_list = []
+        for row in make_raw_rows(5000):
+            values = dict(zip(scoring.RAW_COLUMNS, row))
+            if rng.random() < 0.3:
+                values['height'] = rng.uniform(140, 200)
+                values['weight'] = rng.uniform(30, 150)
+            values_list.append(values)
+
+        batch = RULES.evaluate_batch(to_columns(values_list))
+        valid = RULES.is_valid_batch(to_columns(values_list))
+
+        for i, values in enumerate(values_list):
+            expected = RULES.evaluate(values)
+            bmi = batch['bmi'][i]
+
+            assert (None if np.isnan(bmi) else bmi) == expected['bmi']
+            assert {name: bool(flags[i]) for name, flags in batch['flags'].items()} == expected['flags']
+            assert batch['count'][i] == expected['count']
+            assert batch['group'][i] == expected['group']
+            assert valid[i] == RULES.is_valid(values)
+
+    def test_bmi_half_even_rounding(self):
+        """BMI × 10이 정확히 .5인 경우 짝수 쪽으로 (200cm/141kg = 35.25 → 35.2)"""
+        assert RULES.calculate_bmi(200, 141) == 35.2
+        assert RULES.calculate_bmi_batch(np.array([200.0]), np.array([141.0]))[0] == 35.2
+
+
+class TestApiEtlParity:
+    """API와 ETL row 엔진이 같은 입력에 같은 판정"""
+
+    def test_same_flags(self):
+        """유효한 raw 레코드 → /simulate 입력으로 변환해도 결과 동일"""
+        smoking_names = {code: name for name, code in SMOKING_CODES.items()}
+
+        for row in make_raw_rows(3000):
+            raw = to_raw_object(row)
+            clean = process_single_record(raw)
+            if clean.invalid_flag or raw.triglycerides is None or raw.smoking_status is None:
+                continue
+
+            api = calculate_risk_factors({
+                **{column: getattr(raw, column) for column in RULES.input_columns},
+                'smoking_status': smoking_names[raw.smoking_status],
+            })
+
+            assert api['bmi'] == clean.bmi
+            assert api['count'] == clean.risk_factor_count
+            assert api['group'] == clean.risk_group
+            for name, column in RULES.flag_columns.items():
+                assert api['flags'][name] == getattr(clean, column), name
+
+    def test_missing_triglycerides_not_flagged(self):
+        """TG NULL → 고중성지방 아님 (scalar/배열 동일)"""
+        values = {
+            'height': 170, 'weight': 70, 'systolic_bp': 120, 'diastolic_bp': 80,
+            'fasting_glucose': 100, 'total_cholesterol': 200, 'triglycerides': None,
+            'hdl_cholesterol': 50, 'smoking_status': 1,
+        }
+        assert RULES.is_valid(values)
+        assert not RULES.evaluate(values)['flags']['high_triglycerides']
+        assert not RULES.evaluate_batch(to_columns([values]))['flags']['high_triglycerides'][0]
+
+
+class TestRuleRegistry:
+    """rule_version 조회/등록"""
+
+    def test_unknown_version(self):
+        """정의되지 않은 버전 → ValueError"""
+        with pytest.raises(ValueError):
+            rules.get_rules('guideline-v0')
+
+    def test_flag_columns_match_model(self):
+        """flag 컬럼명 = clean_risk_result 컬럼"""
+        from app.models.health_check import CleanRiskResult
+
+        for column in RULES.flag_columns.values():
+            assert column in CleanRiskResult.__table__.columns
+
+    def test_register_derived_version(self, candidate_rules):
+        """기준값만 바꾼 버전 등록 → 기존 버전과 나란히 조회"""
+        values = {
+            'height': 170, 'weight': 70, 'systolic_bp': 120, 'diastolic_bp': 80,
+            'fasting_glucose': 115, 'total_cholesterol': 200, 'triglycerides': 150,
+            'hdl_cholesterol': 50, 'smoking_status': 1,
+        }
+
+        assert 'glucose-110' in rules.rule_versions()
+        assert rules.get_rules('glucose-110') is candidate_rules
+        assert candidate_rules.evaluate(values)['group'] == 'CHD_RISK_EQUIVALENT'
+        assert RULES.evaluate(values)['group'] == 'ZERO_TO_ONE_RISK_FACTOR'
+
+    def test_register_rejects_existing_version(self, candidate_rules):
+        """이미 있는 버전은 덮어쓰지 않음"""
+        with pytest.raises(ValueError):
+            rules.register_rules('guideline-v1', candidate_rules.definition)
+
+    @pytest.mark.parametrize('thresholds', [
+        {'unknown_flag': {'fasting_glucose': 110}},
+        {'diabetes': {'systolic_bp': 110}},
+    ])
+    def test_derive_rejects_unknown_rule(self, thresholds):
+        """없는 flag/컬럼 기준값 변경 → ValueError"""
+        with pytest.raises(ValueError):
+            rules.derive_definition('guideline-v1', thresholds)
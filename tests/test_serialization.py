@@ -0,0 +1,88 @@
+"""
+JSON 직렬화 테스트
+
+app/serialization.py (orjson / stdlib fallback) 타입 변환 및 Flask 응답 연동
+"""
+
+import importlib
+import json
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app import serialization
+
+SAMPLE = {
+    'decimal': Decimal('29.4'),
+    'created_at': datetime(2026, 2, 17, 9, 30, 15, 123456),
+    'aware': datetime(2026, 2, 17, 9, 30, tzinfo=timezone.utc),
+    'day': date(2026, 2, 17),
+    'count': np.int16(7),
+    'ratio': np.float64(0.25),
+    'flags': np.array([True, False]),
+    'text': '90세 초과',
+    'nested': [{'value': Decimal('1.5')}, None],
+}
+
+EXPECTED = {
+    'decimal': 29.4,
+    'created_at': '2026-02-17T09:30:15.123456',
+    'aware': '2026-02-17T09:30:00+00:00',
+    'day': '2026-02-17',
+    'count': 7,
+    'ratio': 0.25,
+    'flags': [True, False],
+    'text': '90세 초과',
+    'nested': [{'value': 1.5}, None],
+}
+
+
+@pytest.fixture
+def stdlib_serialization(monkeypatch):
+    """orjson 없는 환경 (stdlib json fallback 모듈)"""
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    module = importlib.reload(serialization)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(serialization)
+
+
+class TestDumps:
+    """Decimal, datetime, numpy 기본 지원"""
+
+    def test_types(self):
+        body = serialization.dumps(SAMPLE)
+        assert isinstance(body, bytes)
+        assert json.loads(body) == EXPECTED
+
+    def test_stdlib_fallback_same_output(self, stdlib_serialization):
+        """orjson 미설치 시 stdlib json, 같은 결과"""
+        assert stdlib_serialization.BACKEND == 'json'
+        assert json.loads(stdlib_serialization.dumps(SAMPLE)) == EXPECTED
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            serialization.dumps({'value': object()})
+
+
+class TestFlaskProvider:
+    """jsonify / get_json이 같은 serializer 사용"""
+
+    def test_jsonify_decimal_datetime(self, app):
+        from flask import jsonify
+
+        with app.app_context():
+            response = jsonify(SAMPLE)
+
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data()) == EXPECTED
+
+    def test_invalid_json_body(self, client, auth_headers):
+        """파싱 실패 → 400"""
+        response = client.post(
+            '/simulate', data='{"height": ', headers={**auth_headers, 'Content-Type': 'application/json'}
+        )
+        assert response.status_code == 400
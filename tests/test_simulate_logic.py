@@ -1,11 +1,17 @@
 """
 위험요인 계산 로직 테스트
 
-BMI, 위험요인 플래그, 위험군 분류 테스트
+BMI, 위험요인 플래그, 위험군 분류, 판정 memo 테스트
 """
 
+import random
+
 import pytest
-from app.blueprints.simulate import calculate_bmi, calculate_risk_factors
+from app.blueprints.simulate import (
+    calculate_bmi, calculate_risk_factors, calculate_risk_factors_batch,
+    calculate_risk_factors_memo
+)
+from app.services.memo import LRUMemo
 
 
 class TestBMICalculation:
@@ -237,3 +243,92 @@ class TestRiskFactorCalculation:
         assert len(result['explanations']) >= 2
         assert any('Hypertension' in exp for exp in result['explanations'])
         assert any('Obesity' in exp for exp in result['explanations'])
+
+
+class TestBatchCalculation:
+    """일괄 계산 = 단건 계산"""
+
+    def test_batch_matches_scalar(self):
+        """무작위 입력 (경계값, 소수 포함) 전체 결과 동일"""
+        rng = random.Random(42)
+        items = []
+        for _ in range(2000):
+            items.append({
+                'height': rng.choice([140, 200, 139.5, rng.uniform(140, 200)]),
+                'weight': rng.choice([30, 150, 141, rng.uniform(30, 150)]),
+                'systolic_bp': rng.choice([139, 140, rng.randint(70, 250)]),
+                'diastolic_bp': rng.choice([89, 90, rng.randint(40, 150)]),
+                'fasting_glucose': rng.choice([125, 126, rng.randint(50, 400)]),
+                'total_cholesterol': rng.choice([239, 240, rng.randint(100, 400)]),
+                'triglycerides': rng.choice([199, 200, rng.randint(30, 500)]),
+                'hdl_cholesterol': rng.choice([39, 40, rng.randint(20, 100)]),
+                'smoking_status': rng.choice(['never', 'former', 'current']),
+            })
+
+        assert calculate_risk_factors_batch(items) == [
+            calculate_risk_factors(item) for item in items
+        ]
+
+    def test_empty_batch(self):
+        """빈 입력"""
+        assert calculate_risk_factors_batch([]) == []
+
+
+class TestScoreMemo:
+    """판정 memo (LRU + TTL)"""
+
+    def test_repeat_input_hits(self, sample_patient_data):
+        """같은 입력 → 두 번째부터 hit, 결과 동일"""
+        memo = LRUMemo(maxsize=10)
+
+        first, hit = calculate_risk_factors_memo(sample_patient_data, memo)
+        assert not hit
+        second, hit = calculate_risk_factors_memo(dict(sample_patient_data, age_group=5), memo)
+        assert hit
+        assert second == first == calculate_risk_factors(sample_patient_data)
+        assert (memo.hits, memo.misses) == (1, 1)
+
+    def test_value_type_in_key(self, sample_patient_data):
+        """152와 152.0은 설명 문구가 달라 다른 키"""
+        memo = LRUMemo(maxsize=10)
+        calculate_risk_factors_memo(sample_patient_data, memo)
+
+        result, hit = calculate_risk_factors_memo(dict(sample_patient_data, systolic_bp=152.0), memo)
+        assert not hit
+        assert 'Hypertension: SBP≥140 or DBP≥90 (152.0/96)' in result['explanations']
+
+    def test_lru_eviction(self):
+        """maxsize 초과 → 가장 오래 사용하지 않은 항목 제거"""
+        memo = LRUMemo(maxsize=2)
+        memo.set('a', 1)
+        memo.set('b', 2)
+        memo.get('a')
+        memo.set('c', 3)
+
+        assert memo.get('b') is None
+        assert memo.get('a') == 1
+        assert memo.get('c') == 3
+        assert memo.stats()['size'] == 2
+
+    def test_ttl_expiry(self, monkeypatch):
+        """ttl 지난 항목 → miss"""
+        import app.services.memo as memo_module
+
+        now = [1000.0]
+        monkeypatch.setattr(memo_module.time, 'monotonic', lambda: now[0])
+        memo = LRUMemo(maxsize=2, ttl=60)
+        memo.set('a', 1)
+
+        now[0] += 59
+        assert memo.get('a') == 1
+        now[0] += 2
+        assert memo.get('a') is None
+        assert memo.stats()['size'] == 0
+
+    def test_disabled(self, sample_patient_data):
+        """maxsize 0 → 저장하지 않고 매번 계산"""
+        memo = LRUMemo(maxsize=0)
+        calculate_risk_factors_memo(sample_patient_data, memo)
+
+        assert calculate_risk_factors_memo(sample_patient_data, memo)[1] is False
+        assert memo.stats()['size'] == 0
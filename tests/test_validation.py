@@ -0,0 +1,118 @@
+"""
+/simulate 입력 검증 테스트
+
+app/services/validation.py의 타입 변환, 범위 검사, 구조화된 오류와
+단일(validate) / 배치(validate_many) 결과 일치 확인
+"""
+
+import random
+
+import pytest
+
+from app.services.rules import get_rules
+from app.services.validation import get_validator, input_ranges
+
+RULES = get_rules('guideline-v1')
+VALIDATOR = get_validator(RULES)
+
+
+def codes(invalid):
+    """오류 응답 → {필드: code}"""
+    return {item['field']: item['code'] for item in invalid['errors']}
+
+
+class TestValidate:
+    """단일 입력 검증"""
+
+    def test_ranges_shared_with_rules(self):
+        """생물학적 범위/BMI 범위는 판정 규칙 정의에서"""
+        ranges = input_ranges(RULES)
+        assert ranges['systolic_bp'] == dict(RULES.valid_ranges)['systolic_bp']
+        assert ranges['height'] == (RULES.height_min, RULES.height_max)
+        assert ranges['age_group'] == (5, 18)
+
+    def test_numeric_string_coerced(self, sample_patient_data):
+        """숫자 문자열 → 숫자, 흡연 상태 대소문자/공백 정규화"""
+        data = dict(sample_patient_data, height=' 170 ', fasting_glucose='131.5', smoking_status='Current ')
+
+        values, invalid = VALIDATOR.validate(data)
+        assert invalid is None
+        assert values['height'] == 170 and isinstance(values['height'], int)
+        assert values['fasting_glucose'] == 131.5
+        assert values['smoking_status'] == 'current'
+
+    @pytest.mark.parametrize('value', ['abc', True, None, [170], {'cm': 170}])
+    def test_type_error(self, sample_patient_data, value):
+        """숫자로 변환할 수 없는 값 → type 오류 (500 아님)"""
+        _, invalid = VALIDATOR.validate(dict(sample_patient_data, height=value))
+
+        assert invalid['message'] == 'Invalid input data'
+        assert invalid['details'] == {'height': 'Must be a number'}
+        assert codes(invalid) == {'height': 'type'}
+
+    def test_structured_errors(self, sample_patient_data):
+        """필드별 오류 코드 (range, choice)"""
+        data = dict(sample_patient_data, systolic_bp=300, age_group=float('nan'), smoking_status=3)
+
+        _, invalid = VALIDATOR.validate(data)
+        assert codes(invalid) == {'age_group': 'range', 'systolic_bp': 'range', 'smoking_status': 'choice'}
+        assert invalid['details']['systolic_bp'] == 'Must be between 70 and 250'
+
+    def test_missing_fields(self):
+        """필수 필드 누락 → missing 목록"""
+        _, invalid = VALIDATOR.validate({'age_group': 12})
+
+        assert invalid['message'] == 'Missing required fields'
+        assert 'gender' in invalid['details']['missing']
+        assert codes(invalid)['gender'] == 'missing'
+
+    def test_not_object(self):
+        """객체가 아닌 body"""
+        _, invalid = VALIDATOR.validate([1, 2])
+        assert codes(invalid) == {None: 'body'}
+
+
+class TestValidateMany:
+    """배치 검증 (컬럼 단위) = 단일 검증"""
+
+    def test_matches_single(self, sample_patient_data):
+        """정상/문자열/범위 초과/타입 오류/누락 섞인 입력"""
+        rng = random.Random(3)
+        choices = {
+            'height': [170, 139, '165', 'tall', 170.5, 10 ** 400],
+            'systolic_bp': [120, 251, '140', None, True],
+            'smoking_status': ['never', 'CURRENT', 'sometimes', 1],
+            'age_group': [5, 18, 19, '12'],
+        }
+        items = []
+        for _ in range(500):
+            item = dict(sample_patient_data)
+            for field, values in choices.items():
+                item[field] = rng.choice(values)
+            if rng.random() < 0.05:
+                del item['gender']
+            if rng.random() < 0.02:
+                item = 'not an object'
+            items.append(item)
+
+        valid, values_list, columns, invalid = VALIDATOR.validate_many(items)
+
+        expected_valid = []
+        for position, item in enumerate(items):
+            values, error = VALIDATOR.validate(item)
+            if error:
+                assert invalid[position] == error
+            else:
+                expected_valid.append(values)
+        assert values_list == expected_valid
+        assert len(valid) + len(invalid) == len(items)
+        assert columns['height'].tolist() == [float(values['height']) for values in expected_valid]
+
+    def test_all_valid_fast_path(self, sample_patient_data):
+        """모두 숫자 → 입력 dict 그대로, 오류 없음"""
+        items = [sample_patient_data] * 3
+
+        valid, values_list, columns, invalid = VALIDATOR.validate_many(items)
+        assert (valid, invalid) == ([0, 1, 2], {})
+        assert values_list[0] is sample_patient_data
+        assert columns['smoking_status'].tolist() == [3.0] * 3